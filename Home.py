@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
+from vns import render
+from vns.analyzers import HOME_LABELS, HOME_VARIANT, analyze_vns, with_codes
+from vns.store import LIVE_MAX_AGE, get_ohlc
 import urllib.parse
 from datetime import datetime, timedelta
 
@@ -89,117 +91,14 @@ with st.sidebar:
     run_btn = st.button("🚀 Run Analysis", type="primary", use_container_width=True)
 
 # --- DATA FETCHING (FIXED) ---
-@st.cache_data(ttl=300)
+# No st.cache_data: start/end carry the clock's seconds, so its keys never repeat.
 def fetch_data(symbol, start, end):
     try:
-        yf_symbol = f"{symbol}.NS"
         req_start = start - timedelta(days=60)
-        
-        # FIX: Added auto_adjust=False to prevent data structure changes and suppress warnings
-        df = yf.download(yf_symbol, start=req_start, end=end + timedelta(days=1), progress=False, auto_adjust=False)
-        
-        if df.empty: return None
-        
-        # Flatten MultiIndex (This fixes the 'Data Error' caused by recent YFinance updates)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-            
-        df = df.reset_index()
-        
-        # Rename standard columns
-        df = df.rename(columns={'Date': 'Date', 'Open': 'Open', 'High': 'High', 'Low': 'Low', 'Close': 'Close'})
-        
-        # Ensure Types
-        df['Date'] = pd.to_datetime(df['Date'])
-        for c in ['Open', 'High', 'Low', 'Close']: 
-            df[c] = df[c].astype(float)
-            
-        return df.sort_values('Date').reset_index(drop=True)
+        # Sliced from the widest range the store holds in memory; only bars past it are downloaded
+        return get_ohlc(symbol, req_start, end, max_age=LIVE_MAX_AGE)
     except: return None
 
-# --- NEW VNS LOGIC ---
-def analyze_vns(df):
-    df['BU'], df['BE'], df['Type'] = "", "", ""
-    trend = "Neutral"
-    
-    last_peak = df.iloc[0]['High']
-    last_trough = df.iloc[0]['Low']
-    reaction_support = df.iloc[0]['Low']
-    reaction_resist = df.iloc[0]['High']
-    
-    last_peak_idx = 0
-    last_trough_idx = 0
-    
-    for i in range(1, len(df)):
-        curr = df.iloc[i]
-        c_high, c_low = curr['High'], curr['Low']
-        d_str = curr['Date'].strftime('%d-%b').upper()
-        
-        # TEJI (Up)
-        if trend == "Teji":
-            if c_high > last_peak:
-                # Continuation (Dark Green)
-                df.at[i, 'BU'] = f"BU(T) {d_str}\n{c_high:.2f}"
-                df.at[i, 'Type'] = "bull_dark"
-                
-                swing_df = df.iloc[last_peak_idx:i+1]
-                reaction_support = swing_df['Low'].min()
-                
-                # Reaction (Light Green)
-                df.at[i, 'BE'] = f"R (Teji)\n{reaction_support:.2f}"
-                if df.at[i, 'Type'] == "": df.at[i, 'Type'] = "bull_light" # Only set if not already set
-                
-                last_peak = c_high; last_peak_idx = i
-                
-            elif c_low < reaction_support:
-                # Reversal: Atak (Light Red)
-                df.at[i, 'BU'] = f"ATAK (Top)\n{last_peak:.2f}"
-                
-                trend = "Mandi"
-                df.at[i, 'BE'] = f"BE(M) {d_str}\n{c_low:.2f}"
-                df.at[i, 'Type'] = "bear_dark" # Breakdown
-                
-                last_trough = c_low; last_trough_idx = i
-                reaction_resist = c_high
-
-        # MANDI (Down)
-        elif trend == "Mandi":
-            if c_low < last_trough:
-                # Continuation (Dark Red)
-                df.at[i, 'BE'] = f"BE(M) {d_str}\n{c_low:.2f}"
-                df.at[i, 'Type'] = "bear_dark"
-                
-                swing_df = df.iloc[last_trough_idx:i+1]
-                reaction_resist = swing_df['High'].max()
-                
-                # Reaction (Light Red)
-                df.at[i, 'BU'] = f"R (Mandi)\n{reaction_resist:.2f}"
-                if df.at[i, 'Type'] == "": df.at[i, 'Type'] = "bear_light"
-                
-                last_trough = c_low; last_trough_idx = i
-                
-            elif c_high > reaction_resist:
-                # Reversal: Atak (Light Green)
-                df.at[i, 'BE'] = f"ATAK (Bot)\n{last_trough:.2f}"
-                
-                trend = "Teji"
-                df.at[i, 'BU'] = f"BU(T) {d_str}\n{c_high:.2f}"
-                df.at[i, 'Type'] = "bull_dark" # Breakout
-                
-                last_peak = c_high; last_peak_idx = i
-                reaction_support = c_low
-
-        # NEUTRAL
-        else:
-            if c_high > last_peak:
-                trend = "Teji"; df.at[i, 'BU'] = "Start Teji"; df.at[i, 'Type']="bull_dark"
-                last_peak=c_high; last_peak_idx=i; reaction_support=df.iloc[i-1]['Low']
-            elif c_low < last_trough:
-                trend = "Mandi"; df.at[i, 'BE'] = "Start Mandi"; df.at[i, 'Type']="bear_dark"
-                last_trough=c_low; last_trough_idx=i; reaction_resist=df.iloc[i-1]['High']
-            
-    return df, trend, reaction_resist, reaction_support
-
 # --- RENDER ---
 st.title(f"📊 VNS Theory: {selected_stock}")
 st.markdown(f"Analysis: **{st.session_state.start_date.strftime('%d-%b-%Y')}** to **{st.session_state.end_date.strftime('%d-%b-%Y')}**")
@@ -228,32 +127,12 @@ if run_btn:
             st.divider()
             
             # TABLE
-            disp = df[['Date', 'Open', 'High', 'Low', 'Close', 'BU', 'BE', 'Type']].copy()
-            disp.columns = ['Date', 'Open', 'High', 'Low', 'Close', 'BU (Teji/Resist)', 'BE (Mandi/Support)', 'Type']
-            
-            # COLOR LOGIC
-            def color_cells(row):
-                styles = ['background-color: white; color: black; white-space: pre-wrap;'] * len(row)
-                t = row['Type']
-                
-                # Check BU Column (Index 5)
-                if "BU(T)" in str(row[5]): styles[5] = 'background-color: #228B22; color: white; font-weight: bold; white-space: pre-wrap;' # Dark Green
-                elif "ATAK (Top)" in str(row[5]): styles[5] = 'background-color: #FFC0CB; color: black; font-weight: bold; white-space: pre-wrap;' # Light Red
-                elif "R(" in str(row[5]): styles[5] = 'background-color: #FFC0CB; color: black; white-space: pre-wrap;' # Light Red
-                
-                # Check BE Column (Index 6)
-                if "BE(M)" in str(row[6]): styles[6] = 'background-color: #8B0000; color: white; font-weight: bold; white-space: pre-wrap;' # Dark Red
-                elif "ATAK (Bot)" in str(row[6]): styles[6] = 'background-color: #90EE90; color: black; font-weight: bold; white-space: pre-wrap;' # Light Green
-                elif "R(" in str(row[6]): styles[6] = 'background-color: #90EE90; color: black; white-space: pre-wrap;' # Light Green
-                
-                return styles
-
+            # Colours come from the bars' event codes in one pass; the styled table is reused while the bars are unchanged
+            key = ("home", selected_stock, st.session_state.start_date.date(), st.session_state.end_date.date(), len(df_full), df_full['Date'].iloc[-1], df_full['Close'].iloc[-1])
+            build = lambda: with_codes(df_full, HOME_VARIANT, HOME_LABELS).loc[mask, ['Date', 'Open', 'High', 'Low', 'Close', 'BU', 'BE', 'Type', 'BU_code', 'BE_code']]
             st.dataframe(
-                disp.style.apply(color_cells, axis=1).format({
-                    "Date": lambda t: t.strftime("%d-%b-%Y"),
-                    "Open": "{:.2f}", "High": "{:.2f}", "Low": "{:.2f}", "Close": "{:.2f}"
-                }),
-                column_config={"Type": None, "BU (Teji/Resist)": st.column_config.TextColumn(width="medium"), "BE (Mandi/Support)": st.column_config.TextColumn(width="medium")},
+                render.table(key, build, render.HOME_PALETTE),
+                column_config={"Type": None, "BU": st.column_config.TextColumn("BU (Teji/Resist)", width="medium"), "BE": st.column_config.TextColumn("BE (Mandi/Support)", width="medium")},
                 use_container_width=True, height=800
             )
         else: st.error("⚠️ Data Error (YF Fetch Failed).")
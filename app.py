@@ -3,7 +3,9 @@ import pandas as pd
 import requests
 import urllib.parse
 from datetime import datetime, timedelta
-import yfinance as yf
+from vns import render
+from vns.analyzers import SWING_LABELS, SWING_VARIANT, with_codes, analyze_vns_swing as analyze_vns
+from vns.store import LIVE_MAX_AGE, get_ohlc
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="VNS Pro Dashboard", page_icon="📈", layout="wide")
@@ -54,148 +56,13 @@ with st.sidebar:
     run_btn = st.button("🚀 Run Analysis", type="primary", use_container_width=True)
 
 # --- FETCH DATA ---
-@st.cache_data(ttl=300)
+# Uncached on purpose: the store keeps this symbol's widest range in memory and slices it
 def fetch_data(symbol, start, end):
     try:
-        yf_symbol = f"{symbol}.NS"
         req_start = start - timedelta(days=90) # Buffer to find context
-        df = yf.download(yf_symbol, start=req_start, end=end + timedelta(days=1), progress=False, auto_adjust=False)
-        if df.empty: return None
-        if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
-        df = df.reset_index()
-        df = df.rename(columns={'Date': 'Date', 'Open': 'Open', 'High': 'High', 'Low': 'Low', 'Close': 'Close'})
-        df['Date'] = pd.to_datetime(df['Date'])
-        return df.sort_values('Date').reset_index(drop=True)
+        return get_ohlc(symbol, req_start, end, max_age=LIVE_MAX_AGE)
     except: return None
 
-# --- VNS LOGIC (SWING CONFIRMATION) ---
-def analyze_vns(df):
-    df['BU'], df['BE'], df['Type'] = "", "", ""
-    trend = "Neutral" # Teji, Mandi
-    
-    # State Memory
-    last_major_high = df.iloc[0]['High']
-    last_major_low = df.iloc[0]['Low']
-    
-    reaction_low = df.iloc[0]['Low']
-    reaction_high = df.iloc[0]['High']
-    
-    # Range Indices
-    last_bottom_idx = 0
-    last_top_idx = 0
-    
-    for i in range(1, len(df)):
-        curr = df.iloc[i]
-        prev = df.iloc[i-1]
-        
-        c_h, c_l, c_c = curr['High'], curr['Low'], curr['Close']
-        p_h, p_l = prev['High'], prev['Low']
-        d_str = curr['Date'].strftime('%d-%b').upper()
-        
-        # --- 1. CONFIRM A TOP (BU) ---
-        # Trigger: Low is broken (c_l < p_l)
-        if c_l < p_l:
-            # We have a confirmed local top. Now we check WHAT kind of top it is.
-            
-            # Find the highest high since the last confirmed bottom
-            # Range: last_bottom_idx to i-1
-            search_start = last_bottom_idx
-            if search_start >= i: search_start = i-1 # Safety
-            
-            swing_df = df.iloc[search_start : i]
-            if not swing_df.empty:
-                peak_idx = swing_df['High'].idxmax()
-                peak_val = df.at[peak_idx, 'High']
-                
-                # Logic to label this peak
-                if trend == "Teji":
-                    if peak_val >= last_major_high:
-                        # Higher High -> Continuation
-                        df.at[peak_idx, 'BU'] = f"BU(T) {d_str}\n{peak_val:.2f}"
-                        df.at[peak_idx, 'Type'] = "bull_dark"
-                        last_major_high = peak_val
-                        last_top_idx = peak_idx
-                    else:
-                        # Lower High -> Atak
-                        df.at[peak_idx, 'BU'] = f"ATAK (Top) {d_str}\n{peak_val:.2f}"
-                        df.at[peak_idx, 'Type'] = "bear_light"
-                        last_top_idx = peak_idx
-                        
-                elif trend == "Mandi":
-                    # In Mandi, a top is a Reaction High
-                    df.at[peak_idx, 'BU'] = f"R(Mandi) {d_str}\n{peak_val:.2f}"
-                    df.at[peak_idx, 'Type'] = "bear_light"
-                    reaction_high = peak_val
-                    last_top_idx = peak_idx
-                    
-                else: # Neutral
-                    if peak_val > last_major_high:
-                        trend = "Teji"
-                        df.at[peak_idx, 'BU'] = f"Start Teji\n{peak_val:.2f}"
-                        df.at[peak_idx, 'Type'] = "bull_dark"
-                        last_major_high = peak_val
-                        last_top_idx = peak_idx
-
-        # --- 2. CONFIRM A BOTTOM (BE) ---
-        # Trigger: High is crossed (c_h > p_h)
-        if c_h > p_h:
-            # We have a confirmed local bottom.
-            
-            # Find lowest low since last confirmed top
-            search_start = last_top_idx
-            if search_start >= i: search_start = i-1
-            
-            swing_df = df.iloc[search_start : i]
-            if not swing_df.empty:
-                trough_idx = swing_df['Low'].idxmin()
-                trough_val = df.at[trough_idx, 'Low']
-                
-                if trend == "Mandi":
-                    if trough_val <= last_major_low:
-                        # Lower Low -> Continuation
-                        df.at[trough_idx, 'BE'] = f"BE(M) {d_str}\n{trough_val:.2f}"
-                        df.at[trough_idx, 'Type'] = "bear_dark"
-                        last_major_low = trough_val
-                        last_bottom_idx = trough_idx
-                    else:
-                        # Higher Low -> Atak
-                        df.at[trough_idx, 'BE'] = f"ATAK (Bot) {d_str}\n{trough_val:.2f}"
-                        df.at[trough_idx, 'Type'] = "bull_light"
-                        last_bottom_idx = trough_idx
-                
-                elif trend == "Teji":
-                    # In Teji, a bottom is a Reaction Low
-                    df.at[trough_idx, 'BE'] = f"R(Teji) {d_str}\n{trough_val:.2f}"
-                    df.at[trough_idx, 'Type'] = "bull_light"
-                    reaction_low = trough_val
-                    last_bottom_idx = trough_idx
-                    
-                else: # Neutral
-                    if trough_val < last_major_low:
-                        trend = "Mandi"
-                        df.at[trough_idx, 'BE'] = f"Start Mandi\n{trough_val:.2f}"
-                        df.at[trough_idx, 'Type'] = "bear_dark"
-                        last_major_low = trough_val
-                        last_bottom_idx = trough_idx
-
-        # --- 3. TREND SWITCHING (Immediate on Cross) ---
-        if trend == "Teji" and c_c < reaction_low:
-            trend = "Mandi"
-            # We can mark the breakdown row if desired
-            # df.at[i, 'BE'] = f"BREAKDOWN\n{c_c:.2f}"
-            last_major_low = c_l # Start tracking new trend from here
-            
-        if trend == "Mandi" and c_c > reaction_high:
-            trend = "Teji"
-            # df.at[i, 'BU'] = f"BREAKOUT\n{c_c:.2f}"
-            last_major_high = c_h
-
-    # Active Levels for Header
-    fin_res = reaction_high if trend == "Mandi" else "-"
-    fin_sup = reaction_low if trend == "Teji" else "-"
-    
-    return df, trend, fin_res, fin_sup
-
 # --- RENDER ---
 st.title(f"📊 VNS Theory: {selected_stock}")
 st.markdown(f"Analysis: **{st.session_state.start_date.strftime('%d-%b-%Y')}** to **{st.session_state.end_date.strftime('%d-%b-%Y')}**")
@@ -221,26 +88,12 @@ if run_btn:
             
             st.divider()
             
-            disp = df[['Date', 'Open', 'High', 'Low', 'Close', 'BU', 'BE', 'Type']].copy()
-            disp.columns = ['Date', 'Open', 'High', 'Low', 'Close', 'BU (Teji/Resist)', 'BE (Mandi/Support)', 'Type']
-            
-            def color_cells(row):
-                styles = ['background-color: white; color: black; white-space: pre-wrap;'] * len(row)
-                bu_txt = str(row['BU (Teji/Resist)'])
-                be_txt = str(row['BE (Mandi/Support)'])
-                
-                if "BU(T)" in bu_txt or "Start Teji" in bu_txt: styles[5] = 'background-color: #228B22; color: white; font-weight: bold; white-space: pre-wrap;'
-                elif "R(" in bu_txt: styles[5] = 'background-color: #f8d7da; color: #721c24; font-weight: bold; white-space: pre-wrap;'
-                elif "ATAK" in bu_txt: styles[5] = 'background-color: #f8d7da; color: #721c24; font-weight: bold; white-space: pre-wrap;'
-                
-                if "BE(M)" in be_txt or "Start Mandi" in be_txt: styles[6] = 'background-color: #8B0000; color: white; font-weight: bold; white-space: pre-wrap;'
-                elif "R(" in be_txt: styles[6] = 'background-color: #d4edda; color: #155724; font-weight: bold; white-space: pre-wrap;'
-                elif "ATAK" in be_txt: styles[6] = 'background-color: #d4edda; color: #155724; font-weight: bold; white-space: pre-wrap;'
-                return styles
-
+            # Colours come from the bars' event codes in one pass; the styled table is reused while the bars are unchanged
+            key = ("app", selected_stock, st.session_state.start_date.date(), st.session_state.end_date.date(), len(df_full), df_full['Date'].iloc[-1], df_full['Close'].iloc[-1])
+            build = lambda: with_codes(df_full, SWING_VARIANT, SWING_LABELS).loc[mask, ['Date', 'Open', 'High', 'Low', 'Close', 'BU', 'BE', 'Type', 'BU_code', 'BE_code']]
             st.dataframe(
-                disp.style.apply(color_cells, axis=1).format({"Date": lambda t: t.strftime("%d-%b-%Y"), "Open": "{:.2f}", "High": "{:.2f}", "Low": "{:.2f}", "Close": "{:.2f}"}),
-                column_config={"Type": None, "BU (Teji/Resist)": st.column_config.TextColumn(width="medium"), "BE (Mandi/Support)": st.column_config.TextColumn(width="medium")},
+                render.table(key, build, render.SWING_PALETTE),
+                column_config={"Type": None, "BU": st.column_config.TextColumn("BU (Teji/Resist)", width="medium"), "BE": st.column_config.TextColumn("BE (Mandi/Support)", width="medium")},
                 use_container_width=True, height=800
             )
         else: st.error("⚠️ Data Error.")
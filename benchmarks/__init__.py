@@ -0,0 +1 @@
+"""Offline benchmarks for the VNS engine (run from the repo root with ``python -m benchmarks.<name>``)."""
@@ -0,0 +1,36 @@
+"""Reaction-level tracking cost on a long one-way trend.
+
+Each new Teji high used to re-slice the whole swing to find the reaction low,
+so a trending series cost O(n^2).  With running extremes the time per bar
+should stay flat as the series grows::
+
+    python -m benchmarks.bench_trend_scaling
+"""
+import time
+
+import vns
+from benchmarks.synthetic import trending_ohlc
+
+SIZES = (625, 1250, 2500, 5000)
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    print(f"{'bars':>6} {'ms':>9} {'us/bar':>8}")
+    per_bar = []
+    for n in SIZES:
+        high, low = vns.ohlc_arrays(trending_ohlc(n))
+        t = best_of(lambda: vns.analyze_reaction(high, low))
+        per_bar.append(t / n)
+        print(f"{n:>6} {t * 1e3:>9.3f} {t / n * 1e6:>8.3f}")
+    print(f"us/bar ratio {SIZES[-1]} vs {SIZES[0]} bars: {per_bar[-1] / per_bar[0]:.2f} (1.0 = linear)")
+
+
+if __name__ == "__main__":
+    main()
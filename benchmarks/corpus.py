@@ -0,0 +1,94 @@
+"""Locally stored OHLC corpus for the differential harness.
+
+One ``<SYMBOL>.csv`` per series under ``benchmarks/data/`` with
+Date/Open/High/Low/Close columns, so the harness never touches the network.
+Refresh it from Yahoo when online::
+
+    python -m benchmarks.corpus --record RELIANCE TCS HDFCBANK --start 2021-01-01
+
+The bundled ``SYN_*`` series are seeded regime-switching walks rounded to the
+NSE 0.05 tick (so equal highs/lows and inside bars occur as in real data);
+regenerate them with ``--synthesize``.
+"""
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "data")
+COLUMNS = ["Date", "Open", "High", "Low", "Close"]
+TICK = 0.05
+
+# name: (bars, seed, start price, volatility scale)
+SYNTHETIC = {
+    "SYN_LARGECAP": (750, 11, 2450.0, 0.7),
+    "SYN_MIDCAP": (750, 23, 612.0, 1.0),
+    "SYN_PENNY": (750, 37, 18.4, 1.5),
+    "SYN_BANK": (750, 41, 1580.0, 0.9),
+    "SYN_VOLATILE": (750, 53, 340.0, 2.5),
+    "SYN_SHORT": (40, 67, 125.0, 1.0),
+    "SYN_TINY": (3, 71, 99.0, 1.0),
+}
+
+
+def load_corpus(directory=CORPUS_DIR):
+    """``{symbol: df}`` for every CSV in ``directory``, sorted by symbol."""
+    frames = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.csv"))):
+        df = pd.read_csv(path, parse_dates=["Date"])
+        frames[os.path.splitext(os.path.basename(path))[0]] = df[COLUMNS]
+    return frames
+
+
+def synthetic_series(n, seed, start_price, vol_scale=1.0):
+    """Daily bars whose drift and volatility switch every few weeks, on the 0.05 tick."""
+    rng = np.random.default_rng(seed)
+    regime = np.repeat(rng.normal(0, 0.003, n // 20 + 1), 20)[:n]
+    vol = vol_scale * np.repeat(rng.uniform(0.008, 0.03, n // 20 + 1), 20)[:n]
+    close = start_price * np.exp(np.cumsum(rng.normal(regime, vol)))
+    gap = np.where(rng.random(n) < 0.03, rng.normal(0, 2 * vol), 0.0)   # occasional overnight gaps
+    open_ = np.r_[start_price, close[:-1]] * np.exp(gap)
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2)))
+    tick = lambda a: np.round(a / TICK) * TICK
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2021-01-01", periods=n),
+        "Open": tick(open_), "High": tick(high), "Low": tick(low), "Close": tick(close),
+    })
+
+
+def synthesize(directory=CORPUS_DIR):
+    os.makedirs(directory, exist_ok=True)
+    for name, (n, seed, price, vol) in SYNTHETIC.items():
+        synthetic_series(n, seed, price, vol).to_csv(os.path.join(directory, f"{name}.csv"), index=False, float_format="%.2f")
+
+
+def record(symbols, start, end=None, directory=CORPUS_DIR):
+    """Download NSE daily bars from Yahoo into the corpus (needs network)."""
+    import yfinance as yf
+    os.makedirs(directory, exist_ok=True)
+    for sym in symbols:
+        df = yf.download(f"{sym}.NS", start=start, end=end, progress=False, auto_adjust=False)
+        if df.empty: print(f"{sym}: no data"); continue
+        if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
+        df = df.reset_index()[COLUMNS]
+        df.to_csv(os.path.join(directory, f"{sym}.csv"), index=False, float_format="%.2f")
+        print(f"{sym}: {len(df)} bars")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--record", nargs="+", metavar="SYMBOL", help="NSE symbols to download from Yahoo")
+    ap.add_argument("--start", default="2021-01-01")
+    ap.add_argument("--end")
+    ap.add_argument("--synthesize", action="store_true", help="rewrite the bundled SYN_* series")
+    args = ap.parse_args()
+    if args.synthesize: synthesize()
+    if args.record: record(args.record, args.start, args.end)
+    if not (args.synthesize or args.record): ap.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Differential harness: reference pandas analyzers vs the shared engine.
+
+Runs every page analyzer on the local corpus (``benchmarks/data``) twice, once
+as originally written (:mod:`benchmarks.reference`) and once through
+:mod:`vns.analyzers`.  Outputs must match exactly: labels, colour types,
+signals, trend and levels.  For each variant it reports throughput in bars/s
+and tracemalloc peak memory::
+
+    python -m benchmarks.differential
+    python -m benchmarks.differential --case scanner --repeat 5
+
+Exits non-zero on the first mismatch, so it can gate an engine swap.
+"""
+import argparse
+import math
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import vns
+from vns import analyzers
+from benchmarks import reference
+from benchmarks.corpus import load_corpus
+
+
+@dataclass(frozen=True)
+class Case:
+    variant: str
+    reference: object
+    optimized: object
+    columns: tuple = ("Date", "Open", "High", "Low", "Close")
+
+
+CASES = {
+    "home": Case(analyzers.HOME_VARIANT, reference.analyze_vns, analyzers.analyze_vns),
+    "app": Case(analyzers.SWING_VARIANT, reference.analyze_vns_swing, analyzers.analyze_vns_swing),
+    "scanner": Case(analyzers.SCANNER_VARIANT, reference.analyze_vns_full, analyzers.analyze_vns_full),
+    "classifier": Case(analyzers.CLASSIFIER_VARIANT, reference.classify_stock, analyzers.classify_stock),
+    "new_logic": Case(analyzers.RETRO_VARIANT, reference.analyze_new_logic, analyzers.analyze_new_logic),
+    "chatgpttest": Case(analyzers.PIVOT_VARIANT, reference.compute_vns_signals, analyzers.compute_vns_signals, ("Date", "High", "Low")),
+}
+
+
+def same(a, b):
+    """Exact structural equality; NaN equals NaN, NumPy and Python scalars compare by value."""
+    if isinstance(a, pd.DataFrame):
+        if not isinstance(b, pd.DataFrame) or list(a.columns) != list(b.columns) or len(a) != len(b): return False
+        return all(same(a[c].tolist(), b[c].tolist()) for c in a.columns)
+    if isinstance(a, (list, tuple)):
+        return isinstance(b, (list, tuple)) and len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, (float, np.floating)) and isinstance(b, (float, np.floating)) and math.isnan(a) and math.isnan(b): return True
+    return bool(a == b)
+
+
+def _seconds(fn, df, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        vns.clear_variant_cache()
+        inp = df.copy()
+        t0 = time.perf_counter(); fn(inp); best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak(fn, df):
+    vns.clear_variant_cache()
+    inp = df.copy()
+    tracemalloc.start()
+    try: fn(inp); return tracemalloc.get_traced_memory()[1]
+    finally: tracemalloc.stop()
+
+
+def run_case(name, case, corpus, repeat=1):
+    """Compare one analyzer over the corpus; returns a report row (raises AssertionError on mismatch)."""
+    bars = ref_s = opt_s = 0.0; ref_peak = opt_peak = 0
+    for sym, full in corpus.items():
+        df = full[list(case.columns)]
+        vns.clear_variant_cache()
+        inp = df.copy()
+        t0 = time.perf_counter(); want = case.reference(inp); ref_s += time.perf_counter() - t0   # too slow to repeat
+        got = case.optimized(df.copy())
+        if not same(want, got): raise AssertionError(f"{name} ({case.variant}): output differs on {sym}")
+        bars += len(df)
+        opt_s += _seconds(case.optimized, df, repeat)
+        ref_peak = max(ref_peak, _peak(case.reference, df)); opt_peak = max(opt_peak, _peak(case.optimized, df))
+    return {"case": name, "variant": case.variant, "symbols": len(corpus), "bars": int(bars),
+            "ref_bars_per_s": bars / ref_s, "opt_bars_per_s": bars / opt_s, "speedup": ref_s / opt_s,
+            "ref_peak_kib": ref_peak / 1024, "opt_peak_kib": opt_peak / 1024}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--case", action="append", choices=sorted(CASES), help="limit to these cases (repeatable)")
+    ap.add_argument("--repeat", type=int, default=3, help="best-of repeats for the optimized timing")
+    args = ap.parse_args(argv)
+
+    corpus = load_corpus()
+    if not corpus: sys.exit("empty corpus: run `python -m benchmarks.corpus --synthesize` or `--record`")
+    missing = set(vns.variant_names()) - {c.variant for c in CASES.values()}
+    if missing: print(f"warning: no case covers variant(s) {', '.join(sorted(missing))}")
+
+    print(f"corpus: {len(corpus)} series, {sum(map(len, corpus.values()))} bars")
+    print(f"{'case':<12} {'variant':<21} {'ref bars/s':>11} {'opt bars/s':>11} {'speedup':>8} {'ref KiB':>9} {'opt KiB':>9}")
+    for name in args.case or CASES:
+        try: r = run_case(name, CASES[name], corpus, args.repeat)
+        except AssertionError as e: print(f"MISMATCH {e}"); return 1
+        print(f"{r['case']:<12} {r['variant']:<21} {r['ref_bars_per_s']:>11,.0f} {r['opt_bars_per_s']:>11,.0f} "
+              f"{r['speedup']:>7.1f}x {r['ref_peak_kib']:>9,.0f} {r['opt_peak_kib']:>9,.0f}")
+    print("all outputs identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,658 @@
+"""Reference (original pandas) analyzers, frozen as the pages first shipped them.
+
+These are the row-by-row ``df.iloc`` loops the dashboard ran before the
+shared engine existed.  They are slow on purpose and must not be "fixed":
+the differential harness checks every optimized analyzer in
+:mod:`vns.analyzers` against them.  The only change is in
+``classify_stock``, whose original return referenced undefined names; it
+returns the reaction levels, as the page does now.
+"""
+import pandas as pd
+
+
+# --- Home.py ---
+def analyze_vns(df):
+    df['BU'], df['BE'], df['Type'] = "", "", ""
+    trend = "Neutral"
+
+    last_peak = df.iloc[0]['High']
+    last_trough = df.iloc[0]['Low']
+    reaction_support = df.iloc[0]['Low']
+    reaction_resist = df.iloc[0]['High']
+
+    last_peak_idx = 0
+    last_trough_idx = 0
+
+    for i in range(1, len(df)):
+        curr = df.iloc[i]
+        c_high, c_low = curr['High'], curr['Low']
+        d_str = curr['Date'].strftime('%d-%b').upper()
+
+        # TEJI (Up)
+        if trend == "Teji":
+            if c_high > last_peak:
+                # Continuation (Dark Green)
+                df.at[i, 'BU'] = f"BU(T) {d_str}\n{c_high:.2f}"
+                df.at[i, 'Type'] = "bull_dark"
+
+                swing_df = df.iloc[last_peak_idx:i+1]
+                reaction_support = swing_df['Low'].min()
+
+                # Reaction (Light Green)
+                df.at[i, 'BE'] = f"R (Teji)\n{reaction_support:.2f}"
+                if df.at[i, 'Type'] == "": df.at[i, 'Type'] = "bull_light" # Only set if not already set
+
+                last_peak = c_high; last_peak_idx = i
+
+            elif c_low < reaction_support:
+                # Reversal: Atak (Light Red)
+                df.at[i, 'BU'] = f"ATAK (Top)\n{last_peak:.2f}"
+
+                trend = "Mandi"
+                df.at[i, 'BE'] = f"BE(M) {d_str}\n{c_low:.2f}"
+                df.at[i, 'Type'] = "bear_dark" # Breakdown
+
+                last_trough = c_low; last_trough_idx = i
+                reaction_resist = c_high
+
+        # MANDI (Down)
+        elif trend == "Mandi":
+            if c_low < last_trough:
+                # Continuation (Dark Red)
+                df.at[i, 'BE'] = f"BE(M) {d_str}\n{c_low:.2f}"
+                df.at[i, 'Type'] = "bear_dark"
+
+                swing_df = df.iloc[last_trough_idx:i+1]
+                reaction_resist = swing_df['High'].max()
+
+                # Reaction (Light Red)
+                df.at[i, 'BU'] = f"R (Mandi)\n{reaction_resist:.2f}"
+                if df.at[i, 'Type'] == "": df.at[i, 'Type'] = "bear_light"
+
+                last_trough = c_low; last_trough_idx = i
+
+            elif c_high > reaction_resist:
+                # Reversal: Atak (Light Green)
+                df.at[i, 'BE'] = f"ATAK (Bot)\n{last_trough:.2f}"
+
+                trend = "Teji"
+                df.at[i, 'BU'] = f"BU(T) {d_str}\n{c_high:.2f}"
+                df.at[i, 'Type'] = "bull_dark" # Breakout
+
+                last_peak = c_high; last_peak_idx = i
+                reaction_support = c_low
+
+        # NEUTRAL
+        else:
+            if c_high > last_peak:
+                trend = "Teji"; df.at[i, 'BU'] = "Start Teji"; df.at[i, 'Type']="bull_dark"
+                last_peak=c_high; last_peak_idx=i; reaction_support=df.iloc[i-1]['Low']
+            elif c_low < last_trough:
+                trend = "Mandi"; df.at[i, 'BE'] = "Start Mandi"; df.at[i, 'Type']="bear_dark"
+                last_trough=c_low; last_trough_idx=i; reaction_resist=df.iloc[i-1]['High']
+
+    return df, trend, reaction_resist, reaction_support
+
+
+# --- app.py ---
+def analyze_vns_swing(df):
+    df['BU'], df['BE'], df['Type'] = "", "", ""
+    trend = "Neutral" # Teji, Mandi
+
+    # State Memory
+    last_major_high = df.iloc[0]['High']
+    last_major_low = df.iloc[0]['Low']
+
+    reaction_low = df.iloc[0]['Low']
+    reaction_high = df.iloc[0]['High']
+
+    # Range Indices
+    last_bottom_idx = 0
+    last_top_idx = 0
+
+    for i in range(1, len(df)):
+        curr = df.iloc[i]
+        prev = df.iloc[i-1]
+
+        c_h, c_l, c_c = curr['High'], curr['Low'], curr['Close']
+        p_h, p_l = prev['High'], prev['Low']
+        d_str = curr['Date'].strftime('%d-%b').upper()
+
+        # --- 1. CONFIRM A TOP (BU) ---
+        # Trigger: Low is broken (c_l < p_l)
+        if c_l < p_l:
+            # We have a confirmed local top. Now we check WHAT kind of top it is.
+
+            # Find the highest high since the last confirmed bottom
+            # Range: last_bottom_idx to i-1
+            search_start = last_bottom_idx
+            if search_start >= i: search_start = i-1 # Safety
+
+            swing_df = df.iloc[search_start : i]
+            if not swing_df.empty:
+                peak_idx = swing_df['High'].idxmax()
+                peak_val = df.at[peak_idx, 'High']
+
+                # Logic to label this peak
+                if trend == "Teji":
+                    if peak_val >= last_major_high:
+                        # Higher High -> Continuation
+                        df.at[peak_idx, 'BU'] = f"BU(T) {d_str}\n{peak_val:.2f}"
+                        df.at[peak_idx, 'Type'] = "bull_dark"
+                        last_major_high = peak_val
+                        last_top_idx = peak_idx
+                    else:
+                        # Lower High -> Atak
+                        df.at[peak_idx, 'BU'] = f"ATAK (Top) {d_str}\n{peak_val:.2f}"
+                        df.at[peak_idx, 'Type'] = "bear_light"
+                        last_top_idx = peak_idx
+
+                elif trend == "Mandi":
+                    # In Mandi, a top is a Reaction High
+                    df.at[peak_idx, 'BU'] = f"R(Mandi) {d_str}\n{peak_val:.2f}"
+                    df.at[peak_idx, 'Type'] = "bear_light"
+                    reaction_high = peak_val
+                    last_top_idx = peak_idx
+
+                else: # Neutral
+                    if peak_val > last_major_high:
+                        trend = "Teji"
+                        df.at[peak_idx, 'BU'] = f"Start Teji\n{peak_val:.2f}"
+                        df.at[peak_idx, 'Type'] = "bull_dark"
+                        last_major_high = peak_val
+                        last_top_idx = peak_idx
+
+        # --- 2. CONFIRM A BOTTOM (BE) ---
+        # Trigger: High is crossed (c_h > p_h)
+        if c_h > p_h:
+            # We have a confirmed local bottom.
+
+            # Find lowest low since last confirmed top
+            search_start = last_top_idx
+            if search_start >= i: search_start = i-1
+
+            swing_df = df.iloc[search_start : i]
+            if not swing_df.empty:
+                trough_idx = swing_df['Low'].idxmin()
+                trough_val = df.at[trough_idx, 'Low']
+
+                if trend == "Mandi":
+                    if trough_val <= last_major_low:
+                        # Lower Low -> Continuation
+                        df.at[trough_idx, 'BE'] = f"BE(M) {d_str}\n{trough_val:.2f}"
+                        df.at[trough_idx, 'Type'] = "bear_dark"
+                        last_major_low = trough_val
+                        last_bottom_idx = trough_idx
+                    else:
+                        # Higher Low -> Atak
+                        df.at[trough_idx, 'BE'] = f"ATAK (Bot) {d_str}\n{trough_val:.2f}"
+                        df.at[trough_idx, 'Type'] = "bull_light"
+                        last_bottom_idx = trough_idx
+
+                elif trend == "Teji":
+                    # In Teji, a bottom is a Reaction Low
+                    df.at[trough_idx, 'BE'] = f"R(Teji) {d_str}\n{trough_val:.2f}"
+                    df.at[trough_idx, 'Type'] = "bull_light"
+                    reaction_low = trough_val
+                    last_bottom_idx = trough_idx
+
+                else: # Neutral
+                    if trough_val < last_major_low:
+                        trend = "Mandi"
+                        df.at[trough_idx, 'BE'] = f"Start Mandi\n{trough_val:.2f}"
+                        df.at[trough_idx, 'Type'] = "bear_dark"
+                        last_major_low = trough_val
+                        last_bottom_idx = trough_idx
+
+        # --- 3. TREND SWITCHING (Immediate on Cross) ---
+        if trend == "Teji" and c_c < reaction_low:
+            trend = "Mandi"
+            # We can mark the breakdown row if desired
+            # df.at[i, 'BE'] = f"BREAKDOWN\n{c_c:.2f}"
+            last_major_low = c_l # Start tracking new trend from here
+
+        if trend == "Mandi" and c_c > reaction_high:
+            trend = "Teji"
+            # df.at[i, 'BU'] = f"BREAKOUT\n{c_c:.2f}"
+            last_major_high = c_h
+
+    # Active Levels for Header
+    fin_res = reaction_high if trend == "Mandi" else "-"
+    fin_sup = reaction_low if trend == "Teji" else "-"
+
+    return df, trend, fin_res, fin_sup
+
+
+# --- Scanner ---
+def analyze_vns_full(df):
+    results = []
+    trend = "Neutral"
+    last_peak = df.iloc[0]['High']; last_trough = df.iloc[0]['Low']
+    reaction_support = df.iloc[0]['Low']; reaction_resist = df.iloc[0]['High']
+    last_peak_idx = 0; last_trough_idx = 0
+
+    for i in range(1, len(df)):
+        curr = df.iloc[i]; c_h, c_l = curr['High'], curr['Low']
+        bu, be, signal, signal_type = None, None, "", ""
+
+        if trend == "Teji":
+            if c_h > last_peak:
+                bu = f"T (Teji) {c_h:.2f}"; signal_type="bull_dark"; signal="New High"
+                swing_df = df.iloc[last_peak_idx:i+1]; reaction_support = swing_df['Low'].min()
+                be = f"R (Sup) {reaction_support:.2f}"
+                last_peak = c_h; last_peak_idx = i
+            elif c_l < reaction_support:
+                bu = f"ATAK (Top) {last_peak:.2f}"; be = f"M (Mandi) {c_l:.2f}"; signal_type="bear_dark"; signal="Reversal"
+                trend = "Mandi"; last_trough = c_l; last_trough_idx = i; reaction_resist = c_h
+        elif trend == "Mandi":
+            if c_l < last_trough:
+                be = f"M (Mandi) {c_l:.2f}"; signal_type="bear_dark"; signal="New Low"
+                swing_df = df.iloc[last_trough_idx:i+1]; reaction_resist = swing_df['High'].max()
+                bu = f"R (Resist) {reaction_resist:.2f}"
+                last_trough = c_l; last_trough_idx = i
+            elif c_h > reaction_resist:
+                be = f"ATAK (Bot) {last_trough:.2f}"; bu = f"T (Teji) {c_h:.2f}"; signal_type="bull_dark"; signal="Reversal"
+                trend = "Teji"; last_peak = c_h; last_peak_idx = i; reaction_support = c_l
+        else:
+            if c_h > last_peak: trend="Teji"; bu="Start Teji"; signal_type="bull_dark"; last_peak=c_h; last_peak_idx=i
+            elif c_l < last_trough: trend="Mandi"; be="Start Mandi"; signal_type="bear_dark"; last_trough=c_l; last_trough_idx=i
+
+        color_type = ""
+        if "T (Teji)" in str(bu) or "Start Teji" in str(bu): color_type = "bull_dark"
+        elif "M (Mandi)" in str(be) or "Start Mandi" in str(be): color_type = "bear_dark"
+        elif "ATAK (Top)" in str(bu): color_type = "bear_light"
+        elif "ATAK (Bot)" in str(be): color_type = "bull_light"
+        elif "R (Sup)" in str(be): color_type = "bull_light"
+        elif "R (Resist)" in str(bu): color_type = "bear_light"
+
+        results.append({
+            'Date': curr['Date'].strftime('%d-%b-%Y'), 'Open': curr['Open'], 'High': curr['High'], 'Low': curr['Low'], 'Close': curr['Close'],
+            'BU': bu, 'BE': be, 'Signal': signal, 'Type': color_type
+        })
+    return trend, reaction_resist, reaction_support, df.iloc[-1]['Close'], results
+
+
+# --- Advanced Classifier ---
+def classify_stock(df):
+    trend = "Neutral"; last_peak = df.iloc[0]['High']; last_trough = df.iloc[0]['Low']
+    reaction_support = df.iloc[0]['Low']; reaction_resist = df.iloc[0]['High']
+    last_peak_idx=0; last_trough_idx=0
+    signal_desc = "Neutral"; category = "Neutral"; history_records = []
+
+    for i in range(1, len(df)):
+        curr = df.iloc[i]; c_h, c_l = curr['High'], curr['Low']
+        bu, be, signal, signal_type = None, None, "", ""
+
+        # VNS Logic (Same as Home.py)
+        if trend == "Teji":
+            if c_h > last_peak:
+                bu = f"T (Teji)\n{c_h:.2f}"; signal_type="bull_dark"; signal="New High"
+                swing = df.iloc[last_peak_idx:i+1]; reaction_support = swing['Low'].min()
+                be = f"R (Sup)\n{reaction_support:.2f}"
+                last_peak = c_h; last_peak_idx = i
+            elif c_l < reaction_support:
+                bu = f"ATAK (Top)\n{last_peak:.2f}"; be = f"M (Mandi)\n{c_l:.2f}"; signal_type="bear_dark"; signal="Reversal"
+                trend = "Mandi"; last_trough = c_l; last_trough_idx = i; reaction_resist = c_h
+
+        elif trend == "Mandi":
+            if c_l < last_trough:
+                be = f"M (Mandi)\n{c_l:.2f}"; signal_type="bear_dark"; signal="New Low"
+                swing = df.iloc[last_trough_idx:i+1]; reaction_resist = swing['High'].max()
+                bu = f"R (Resist)\n{reaction_resist:.2f}"
+                last_trough = c_l; last_trough_idx = i
+            elif c_h > reaction_resist:
+                be = f"ATAK (Bot)\n{last_trough:.2f}"; bu = f"T (Teji)\n{c_h:.2f}"; signal_type="bull_dark"; signal="Reversal"
+                trend = "Teji"; last_peak = c_h; last_peak_idx = i; reaction_support = c_l
+        else:
+            if c_h > last_peak: trend="Teji"; bu="Start Teji"; signal_type="bull_dark"; last_peak=c_h; last_peak_idx=i
+            elif c_l < last_trough: trend="Mandi"; be="Start Mandi"; signal_type="bear_dark"; last_trough=c_l; last_trough_idx=i
+
+        # Note: We don't store "Type" here for coloring whole rows anymore,
+        # we will color cells individually in the display function.
+
+        history_records.append({
+            'Date': curr['Date'].strftime('%d-%b-%Y'), 'Open': curr['Open'], 'High': curr['High'],
+            'Low': curr['Low'], 'Close': curr['Close'], 'BU': bu, 'BE': be, 'Signal': signal
+        })
+
+        if i == len(df) - 1:
+            signal_desc = signal
+            if "Reversal" in signal and trend == "Teji": category = "Highly Bullish"
+            elif "Reversal" in signal and trend == "Mandi": category = "Highly Bearish"
+            elif trend == "Teji": category = "Bullish"
+            elif trend == "Mandi": category = "Bearish"
+
+            if "ATAK (Top)" in str(bu): category = "Atak (Teji Side)"
+            if "ATAK (Bot)" in str(be): category = "Atak (Mandi Side)"
+
+    last_row = df.iloc[-1]
+    pct_change = ((last_row['Close'] - df.iloc[-2]['Close']) / df.iloc[-2]['Close']) * 100
+
+    return category, signal_desc, last_row['Close'], pct_change, history_records, reaction_resist, reaction_support, trend
+
+
+# --- New Logic Test ---
+def analyze_new_logic(df):
+    df['BU'], df['BE'], df['Type'] = "", "", ""
+    trend = "Neutral"
+
+    last_peak = df.iloc[0]['High']
+    last_trough = df.iloc[0]['Low']
+
+    # We track the "active" reaction point index
+    reaction_low_idx = 0
+    reaction_high_idx = 0
+
+    # Track the peak/trough index to define range
+    last_peak_idx = 0
+    last_trough_idx = 0
+
+    for i in range(1, len(df)):
+        curr = df.iloc[i]
+        c_h, c_l = curr['High'], curr['Low']
+        d_str = curr['Date'].strftime('%d-%b').upper()
+
+        # --- TEJI (UPTREND) ---
+        if trend == "Teji":
+            if c_h > last_peak:
+                # 1. New High -> Continue Teji
+                df.at[i, 'BU'] = f"BU(T) {d_str}\n{c_h:.2f}"; df.at[i, 'Type'] = "bull_dark"
+                last_peak = c_h
+                last_peak_idx = i
+
+                # Reset reaction tracking for new leg
+                reaction_low_idx = i
+
+            else:
+                # Track Lowest Low since peak
+                if c_l < df.at[reaction_low_idx, 'Low']:
+                    reaction_low_idx = i
+
+                # Check for Breakdown of that Reaction Low
+                reaction_val = df.at[reaction_low_idx, 'Low']
+
+                if c_l < reaction_val:
+                    # BREAKDOWN CONFIRMED
+
+                    # 1. Mark the Reaction Low Row (Retroactively)
+                    r_date = df.at[reaction_low_idx, 'Date'].strftime('%d-%b')
+                    df.at[reaction_low_idx, 'BE'] = f"R(Teji) {r_date}\n{reaction_val:.2f}"
+                    df.at[reaction_low_idx, 'Type'] = "bull_light"
+
+                    # 2. Find Atak (Highest point between Reaction Low and Today)
+                    if i > reaction_low_idx:
+                        interim = df.iloc[reaction_low_idx+1 : i]
+                        if not interim.empty:
+                            atak_idx = interim['High'].idxmax()
+                            atak_val = df.at[atak_idx, 'High']
+                            a_date = df.at[atak_idx, 'Date'].strftime('%d-%b')
+
+                            df.at[atak_idx, 'BU'] = f"ATAK (Top) {a_date}\n{atak_val:.2f}"
+                            df.at[atak_idx, 'Type'] = "bear_light"
+
+                    # 3. Mark Today as Mandi Start
+                    df.at[i, 'BE'] = f"BE(M) {d_str}\n{c_l:.2f}"; df.at[i, 'Type'] = "bear_dark"
+
+                    trend = "Mandi"
+                    last_trough = c_l; last_trough_idx = i
+                    reaction_high_idx = i # Start tracking reaction high
+
+        # --- MANDI (DOWNTREND) ---
+        elif trend == "Mandi":
+            if c_l < last_trough:
+                # 1. New Low -> Continue Mandi
+                df.at[i, 'BE'] = f"BE(M) {d_str}\n{c_l:.2f}"; df.at[i, 'Type'] = "bear_dark"
+                last_trough = c_l
+                last_trough_idx = i
+
+                # Reset reaction tracking
+                reaction_high_idx = i
+
+            else:
+                # Track Highest High since trough
+                if c_h > df.at[reaction_high_idx, 'High']:
+                    reaction_high_idx = i
+
+                # Check for Breakout of that Reaction High
+                reaction_val = df.at[reaction_high_idx, 'High']
+
+                if c_h > reaction_val:
+                    # BREAKOUT CONFIRMED
+
+                    # 1. Mark Reaction High Row (Retroactively)
+                    r_date = df.at[reaction_high_idx, 'Date'].strftime('%d-%b')
+                    df.at[reaction_high_idx, 'BU'] = f"R(Mandi) {r_date}\n{reaction_val:.2f}"
+                    df.at[reaction_high_idx, 'Type'] = "bear_light"
+
+                    # 2. Find Atak (Lowest point between Reaction High and Today)
+                    if i > reaction_high_idx:
+                        interim = df.iloc[reaction_high_idx+1 : i]
+                        if not interim.empty:
+                            atak_idx = interim['Low'].idxmin()
+                            atak_val = df.at[atak_idx, 'Low']
+                            a_date = df.at[atak_idx, 'Date'].strftime('%d-%b')
+
+                            df.at[atak_idx, 'BE'] = f"ATAK (Bot) {a_date}\n{atak_val:.2f}"
+                            df.at[atak_idx, 'Type'] = "bull_light"
+
+                    # 3. Mark Today as Teji Start
+                    df.at[i, 'BU'] = f"BU(T) {d_str}\n{c_h:.2f}"; df.at[i, 'Type'] = "bull_dark"
+
+                    trend = "Teji"
+                    last_peak = c_h; last_peak_idx = i
+                    reaction_low_idx = i
+
+        # --- NEUTRAL ---
+        else:
+            if c_h > last_peak:
+                trend = "Teji"; df.at[i, 'BU'] = "Start Teji"; df.at[i, 'Type']="bull_dark"
+                last_peak=c_h; last_peak_idx=i; reaction_low_idx=i
+            elif c_l < last_trough:
+                trend = "Mandi"; df.at[i, 'BE'] = "Start Mandi"; df.at[i, 'Type']="bear_dark"
+                last_trough=c_l; last_trough_idx=i; reaction_high_idx=i
+
+    return df
+
+
+# --- chatgpttest ---
+def compute_vns_signals(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply VNS Teji/Mandi/Atak/Reaction/Breakout/Breakdown logic
+    based ONLY on High & Low.
+    """
+
+    # --- Defensive: empty or None ---
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    df = df.copy()
+
+    # ---------- FIND DATE COLUMN SAFELY ----------
+    date_col = None
+
+    # First: look for a column literally named 'Date' or 'date'
+    for col in df.columns:
+        if str(col).lower() == "date":
+            date_col = col
+            break
+
+    # Second: look for any datetime-like column
+    if date_col is None:
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                date_col = col
+                break
+
+    # Third: if index is datetime, reset and use index column
+    if date_col is None:
+        if isinstance(df.index, pd.DatetimeIndex):
+            df = df.reset_index()
+            date_col = df.columns[0]
+
+    # If still nothing, give up gracefully
+    if date_col is None:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    # Rename chosen date column to 'Date' for internal use
+    if date_col != "Date":
+        df = df.rename(columns={date_col: "Date"})
+
+    # ---------- Clean Date / High / Low ----------
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df = df.dropna(subset=["Date"])
+    if df.empty:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    if "High" not in df.columns or "Low" not in df.columns:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    df["High"] = pd.to_numeric(df["High"], errors="coerce")
+    df["Low"] = pd.to_numeric(df["Low"], errors="coerce")
+    df = df.dropna(subset=["High", "Low"])
+    if df.empty or len(df) < 2:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    df = df.sort_values("Date").reset_index(drop=True)
+
+    # ---------- VNS State ----------
+    last_teji_high = None
+    last_mandi_low = None
+    signals = []
+
+    # ---------- 1st pass: Teji / Mandi / Atak / Reaction ----------
+    for i in range(1, len(df)):
+        y = df.iloc[i - 1]
+        t = df.iloc[i]
+
+        y_high = float(y["High"])
+        y_low = float(y["Low"])
+        t_high = float(t["High"])
+        t_low = float(t["Low"])
+
+        # A) Today's low breaks yesterday's low → yesterday's high = pivot high
+        if t_low < y_low:
+            pivot_price = y_high
+            pivot_date = y["Date"]
+
+            if last_teji_high is None:
+                signal_type = "Teji (BU)"
+                info = "First Teji: low break after this high."
+                last_teji_high = pivot_price
+            else:
+                if pivot_price > last_teji_high:
+                    signal_type = "Teji (BU)"
+                    info = "New higher Teji high."
+                    last_teji_high = pivot_price
+                elif pivot_price < last_teji_high:
+                    signal_type = "Atak (Double Top)"
+                    info = f"Lower high vs previous Teji {last_teji_high:.2f}."
+                else:
+                    signal_type = "Reaction"
+                    info = "Low break equal to previous Teji high."
+
+            signals.append(
+                {"Date": pivot_date, "Price": pivot_price, "Type": signal_type, "Info": info}
+            )
+
+        # B) Today's high breaks yesterday's high → yesterday's low = pivot low
+        if t_high > y_high:
+            pivot_price = y_low
+            pivot_date = y["Date"]
+
+            if last_mandi_low is None:
+                signal_type = "Mandi (BE)"
+                info = "First Mandi: high break after this low."
+                last_mandi_low = pivot_price
+            else:
+                if pivot_price < last_mandi_low:
+                    signal_type = "Mandi (BE)"
+                    info = "New lower Mandi low."
+                    last_mandi_low = pivot_price
+                elif pivot_price > last_mandi_low:
+                    signal_type = "Atak (Double Bottom)"
+                    info = f"Higher low vs previous Mandi {last_mandi_low:.2f}."
+                else:
+                    signal_type = "Reaction"
+                    info = "High break equal to previous Mandi low."
+
+            signals.append(
+                {"Date": pivot_date, "Price": pivot_price, "Type": signal_type, "Info": info}
+            )
+
+    if not signals:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    sig_df = pd.DataFrame(signals)
+
+    # ---------- Clean signals / sort ----------
+    if "Date" not in sig_df.columns:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    sig_df["Date"] = pd.to_datetime(sig_df["Date"], errors="coerce")
+    sig_df = sig_df.dropna(subset=["Date"])
+    if sig_df.empty:
+        return sig_df
+
+    sig_df = sig_df.sort_values("Date").reset_index(drop=True)
+
+    # ---------- 2nd pass: Breakout / Breakdown ----------
+    extra_rows = []
+    last_teji_idx = None
+    last_mandi_idx = None
+
+    for i, row in sig_df.iterrows():
+        stype = str(row["Type"])
+
+        if stype.startswith("Teji"):
+            last_teji_idx = i
+        if stype.startswith("Mandi"):
+            last_mandi_idx = i
+
+        if last_teji_idx is not None and last_mandi_idx is not None:
+            teji_date = sig_df.loc[last_teji_idx, "Date"]
+            mandi_date = sig_df.loc[last_mandi_idx, "Date"]
+
+            # Teji older → Mandi newer → Breakout above Teji
+            if teji_date < mandi_date:
+                teji_price = sig_df.loc[last_teji_idx, "Price"]
+                post = df[df["Date"] > mandi_date]
+                crossed = post[post["High"] >= teji_price]
+                if not crossed.empty:
+                    brk_row = crossed.iloc[0]
+                    extra_rows.append(
+                        {
+                            "Date": brk_row["Date"],
+                            "Price": teji_price,
+                            "Type": "Breakout",
+                            "Info": f"Price High crossed Teji level {teji_price:.2f} after Mandi.",
+                        }
+                    )
+                    last_teji_idx = None
+                    last_mandi_idx = None
+
+            # Mandi older → Teji newer → Breakdown below Mandi
+            elif mandi_date < teji_date:
+                mandi_price = sig_df.loc[last_mandi_idx, "Price"]
+                post = df[df["Date"] > teji_date]
+                crossed = post[post["Low"] <= mandi_price]
+                if not crossed.empty:
+                    brk_row = crossed.iloc[0]
+                    extra_rows.append(
+                        {
+                            "Date": brk_row["Date"],
+                            "Price": mandi_price,
+                            "Type": "Breakdown",
+                            "Info": f"Price Low broke Mandi level {mandi_price:.2f} after Teji.",
+                        }
+                    )
+                    last_teji_idx = None
+                    last_mandi_idx = None
+
+    if extra_rows:
+        extra_df = pd.DataFrame(extra_rows)
+        extra_df["Date"] = pd.to_datetime(extra_df["Date"], errors="coerce")
+        sig_df = pd.concat([sig_df, extra_df], ignore_index=True)
+        sig_df = sig_df.dropna(subset=["Date"])
+        sig_df = sig_df.sort_values("Date").reset_index(drop=True)
+
+    return sig_df
@@ -0,0 +1,95 @@
+"""Check that a scan resumed from checkpoints matches a from-scratch scan exactly.
+
+Writes a seeded synthetic universe as replay files and scans every preset
+window cold, checkpoints wiped.  Then, once per ``--shift`` (days the windows
+started earlier on the previous scan; 0 = same windows):
+
+1. a scan of the shifted windows with the last ``--new`` bars held back
+   (``end``) writes the checkpoints, as yesterday's scan would;
+2. a warm scan of today's windows over every bar resumes where it can.
+
+Rows (summary fields and fingerprints) and every stored history (bars and
+engine events) of each warm scan must equal the cold scan's::
+
+    python -m benchmarks.resume_check
+    python -m benchmarks.resume_check --symbols 500 --regime gappy --new 1 --shift 0 1 7
+
+Exits non-zero on the first difference.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Checkpoints and the store go to a scratch data directory; set before vns reads its config
+os.environ.setdefault("VNS_DATA_DIR", tempfile.mkdtemp(prefix="vns-bench-"))
+
+import pandas as pd
+
+import vns
+from vns.config import CHECKPOINT_DIR, DATA_DIR
+from vns.scans import duration_windows
+from vns.store import IST, BAR_FINAL
+from benchmarks.synthetic import REGIMES
+from benchmarks.throughput import LAST_BAR, write_replay
+
+
+def same_rows(a, b):
+    """Whether two payloads' rows match: summary fields by value, histories by bars and events."""
+    if [r["Symbol"] for r in a] != [r["Symbol"] for r in b]: return False
+    for x, y in zip(a, b):
+        if {k: v for k, v in x.items() if k != "History"} != {k: v for k, v in y.items() if k != "History"}: return False
+        hx, hy = x.get("History"), y.get("History")
+        if (hx is None) != (hy is None): return False
+        if hx is not None and not (hx["bars"].equals(hy["bars"]) and np.array_equal(hx["events"], hy["events"])): return False
+    return True
+
+
+def diff_rows(a, b):
+    """First symbol whose rows differ, for the error message."""
+    for x, y in zip(a, b):
+        if not same_rows([x], [y]): return x["Symbol"]
+    return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--symbols", type=int, default=200)
+    ap.add_argument("--bars", type=int, default=400)
+    ap.add_argument("--regime", choices=sorted(REGIMES), default="trending")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--new", type=int, default=5, help="bars the warm scan adds after the checkpoints")
+    ap.add_argument("--shift", type=int, nargs="+", default=[0, 3], help="days the checkpointing scan's windows started earlier")
+    args = ap.parse_args(argv)
+
+    now = datetime.combine(LAST_BAR.date(), BAR_FINAL, IST) + timedelta(hours=2)
+    windows = duration_windows(now.replace(tzinfo=None))
+    held = pd.bdate_range(end=LAST_BAR, periods=args.new + 1)[0]
+    symbols = write_replay(os.path.join(DATA_DIR, "replay"), args.regime, args.symbols, args.bars, args.seed)
+    vns.set_provider(vns.ReplayProvider(os.path.join(DATA_DIR, "replay")))
+    scan = lambda windows, **fetch: vns.scan_windows(windows, symbols=symbols, processes=1, now=now, rate=1e6, **fetch)
+    print(f"{len(symbols)} symbols ({args.regime}), windows {', '.join(windows)}, {args.new} new bars")
+    try:
+        shutil.rmtree(CHECKPOINT_DIR, ignore_errors=True)
+        cold = scan(windows)
+        for shift in args.shift:
+            shutil.rmtree(CHECKPOINT_DIR, ignore_errors=True)
+            scan({label: start - timedelta(days=shift) for label, start in windows.items()}, end=held)
+            warm = scan(windows)
+            for label in windows:
+                a, b = warm[label]["stocks"], cold[label]["stocks"]
+                if not same_rows(a, b):
+                    print(f"MISMATCH shift {shift}d, {label}: warm and cold scans differ on {diff_rows(a, b) or 'the symbol list'}"); return 1
+            print(f"shift {shift:>2}d: {sum(len(w['stocks']) for w in warm.values())} rows identical")
+    finally:
+        if DATA_DIR.startswith(tempfile.gettempdir()): shutil.rmtree(DATA_DIR, ignore_errors=True)
+    print("warm and cold scans identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Scan analysis speed-up from the process pool, on a large synthetic universe.
+
+Writes a seeded synthetic universe as replay files, warms the store with one
+fetch, then times :func:`vns.scan_windows` over every preset duration with
+1 .. N analysis processes.  Checkpoints are wiped before each run, so every
+run analyses every bar; downloads are already stored, so the timings are the
+analysis alone::
+
+    python -m benchmarks.scan_processes
+    python -m benchmarks.scan_processes --symbols 5000 --bars 600 --processes 1 2 4 8 16
+
+Each run's rows are checked against the single-process run.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Checkpoints and the store go to a scratch data directory; set before vns reads its config
+os.environ.setdefault("VNS_DATA_DIR", tempfile.mkdtemp(prefix="vns-bench-"))
+
+import vns
+from vns.config import CHECKPOINT_DIR, DATA_DIR
+from vns.parallel import get_pool, shutdown_pool
+from vns.scans import duration_windows
+from vns.store import IST, BAR_FINAL
+from benchmarks.resume_check import same_rows
+from benchmarks.synthetic import REGIMES
+from benchmarks.throughput import LAST_BAR, write_replay
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--symbols", type=int, default=2000)
+    ap.add_argument("--bars", type=int, default=400)
+    ap.add_argument("--regime", choices=sorted(REGIMES), default="mean_reverting")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = ap.parse_args(argv)
+
+    now = datetime.combine(LAST_BAR.date(), BAR_FINAL, IST) + timedelta(hours=2)
+    windows = duration_windows(now.replace(tzinfo=None))
+    symbols = write_replay(os.path.join(DATA_DIR, "replay"), args.regime, args.symbols, args.bars, args.seed)
+    vns.set_provider(vns.ReplayProvider(os.path.join(DATA_DIR, "replay")))
+    vns.fetch_universe(symbols, LAST_BAR - timedelta(days=400), now=now, rate=1e6)
+    print(f"{len(symbols)} symbols x {args.bars} bars ({args.regime}), windows {', '.join(windows)}, {os.cpu_count()} CPUs")
+    print(f"{'processes':>9} {'seconds':>8} {'symbols/s':>10} {'speedup':>8}")
+    base = base_rows = None
+    try:
+        for p in args.processes:
+            shutil.rmtree(CHECKPOINT_DIR, ignore_errors=True)
+            if p > 1: list(get_pool(p).map(time.sleep, [0.2] * p))     # start the workers outside the timing
+            t0 = time.perf_counter()
+            out = vns.scan_windows(windows, symbols=symbols, processes=p, now=now, rate=1e6)
+            s = time.perf_counter() - t0
+            rows = {label: payload["stocks"] for label, payload in out.items()}
+            if base_rows is None: base, base_rows = s, rows
+            elif not all(same_rows(rows[label], base_rows[label]) for label in base_rows): raise RuntimeError(f"{p} processes gave different rows than {args.processes[0]}")
+            print(f"{p:>9} {s:>8.2f} {len(symbols) / s:>10.1f} {base / s:>7.1f}x", flush=True)
+    finally:
+        shutdown_pool()
+        if DATA_DIR.startswith(tempfile.gettempdir()): shutil.rmtree(DATA_DIR, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Scaling benchmark suite for the page analyzers.
+
+Times ``analyze_vns``, ``analyze_vns_full``, ``classify_stock`` and
+``compute_vns_signals`` on seeded synthetic data (:mod:`benchmarks.synthetic`),
+with no network access.  Two sweeps run per market regime:
+
+* bars: one symbol of 100 .. 100,000 bars;
+* symbols: a universe of 1 .. 10,000 symbols of ``--universe-bars`` bars each,
+  run the way the pages do (batch engine pass for Scanner/Classifier).
+
+Results go to a JSON file tagged with the commit, so two runs can be diffed::
+
+    python -m benchmarks.suite --quick
+    python -m benchmarks.suite --out base.json          # on the old commit
+    python -m benchmarks.suite --compare base.json      # on the new one; exit 1 on regressions
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import vns
+from vns import analyzers
+from benchmarks.synthetic import REGIMES, synthetic_ohlc, synthetic_universe
+
+BARS = (100, 1_000, 10_000, 100_000)
+SYMBOLS = (1, 10, 100, 1_000, 10_000)
+QUICK_BARS = (100, 1_000, 10_000)
+QUICK_SYMBOLS = (1, 10, 100)
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+# --- ANALYZERS ---
+# Each runner analyses a {symbol: df} universe the way its page does.
+def _each(fn):
+    return lambda frames: [fn(df.copy()) for df in frames.values()]
+
+
+def _batched(fn, variant):
+    def run(frames):
+        res = vns.run_variant_batch(variant, frames, seed_reaction=False)
+        return [fn(df, res[sym]) for sym, df in frames.items()]
+    return run
+
+
+ANALYZERS = {
+    "analyze_vns": _each(analyzers.analyze_vns),
+    "analyze_vns_full": _batched(analyzers.analyze_vns_full, analyzers.SCANNER_VARIANT),
+    "classify_stock": _batched(analyzers.classify_stock, analyzers.CLASSIFIER_VARIANT),
+    "compute_vns_signals": _each(analyzers.compute_vns_signals),
+}
+
+
+def _time(run, frames, total_bars):
+    # Small inputs get a best-of, the big ones a single run.
+    best = float("inf")
+    for _ in range(max(1, min(5, 50_000 // max(total_bars, 1)))):
+        vns.clear_variant_cache()
+        t0 = time.perf_counter(); run(frames); best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _row(analyzer, regime, sweep, bars, symbols, seconds):
+    total = bars * symbols
+    return {"analyzer": analyzer, "regime": regime, "sweep": sweep, "bars": bars, "symbols": symbols,
+            "seconds": seconds, "bars_per_s": total / seconds if seconds else None}
+
+
+def run_suite(analyzer_names, regimes, bar_sizes, symbol_counts, universe_bars=250, seed=0, log=print):
+    rows = []
+    for regime in regimes:
+        for n in bar_sizes:
+            frames = {"SYN": synthetic_ohlc(regime, n, seed)}
+            for name in analyzer_names:
+                rows.append(_row(name, regime, "bars", n, 1, _time(ANALYZERS[name], frames, n))); log(rows[-1])
+        for k in symbol_counts:
+            frames = synthetic_universe(regime, k, universe_bars, seed)
+            for name in analyzer_names:
+                rows.append(_row(name, regime, "symbols", universe_bars, k, _time(ANALYZERS[name], frames, k * universe_bars))); log(rows[-1])
+    return rows
+
+
+# --- RESULTS ---
+def _commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                               cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): return "unknown"
+
+
+def metadata(seed, universe_bars):
+    return {"commit": _commit(), "engine_version": vns.ENGINE_VERSION, "seed": seed, "universe_bars": universe_bars,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpu)"}
+
+
+def _cell(r):
+    return r["analyzer"], r["regime"], r["sweep"], r["bars"], r["symbols"]
+
+
+def compare(base, rows, tolerance):
+    """Print cells slower than ``tolerance`` x the baseline; returns how many regressed."""
+    old = {_cell(r): r["seconds"] for r in base["results"]}
+    slower = 0
+    for r in rows:
+        prev = old.get(_cell(r))
+        if not prev: continue
+        ratio = r["seconds"] / prev
+        if ratio > tolerance:
+            slower += 1
+            print(f"REGRESSION {r['analyzer']} {r['regime']} {r['sweep']} bars={r['bars']} symbols={r['symbols']}: "
+                  f"{prev:.4f}s -> {r['seconds']:.4f}s ({ratio:.2f}x)")
+    print(f"{slower} regression(s) vs {base['meta']['commit']} (tolerance {tolerance:.2f}x)")
+    return slower
+
+
+def _log(r):
+    print(f"{r['analyzer']:<20} {r['regime']:<15} {r['sweep']:<8} bars={r['bars']:<7} symbols={r['symbols']:<6} "
+          f"{r['seconds']:>9.4f}s {r['bars_per_s']:>12,.0f} bars/s", flush=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--quick", action="store_true", help=f"bars {QUICK_BARS}, symbols {QUICK_SYMBOLS}")
+    ap.add_argument("--bars", type=int, nargs="+", help=f"series lengths (default {BARS})")
+    ap.add_argument("--symbols", type=int, nargs="+", help=f"universe sizes (default {SYMBOLS})")
+    ap.add_argument("--universe-bars", type=int, default=250, help="bars per symbol in the symbol sweep")
+    ap.add_argument("--regime", action="append", choices=sorted(REGIMES), help="limit to these regimes (repeatable)")
+    ap.add_argument("--analyzer", action="append", choices=sorted(ANALYZERS), help="limit to these analyzers (repeatable)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="results file (default benchmarks/results/suite-<commit>.json)")
+    ap.add_argument("--compare", metavar="BASE_JSON", help="flag cells slower than the baseline file")
+    ap.add_argument("--tolerance", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = ap.parse_args(argv)
+
+    bar_sizes = args.bars or (QUICK_BARS if args.quick else BARS)
+    symbol_counts = args.symbols or (QUICK_SYMBOLS if args.quick else SYMBOLS)
+    meta = metadata(args.seed, args.universe_bars)
+    rows = run_suite(args.analyzer or list(ANALYZERS), args.regime or list(REGIMES), bar_sizes, symbol_counts,
+                     args.universe_bars, args.seed, log=_log)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"suite-{meta['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f: json.dump({"meta": meta, "results": rows}, f, indent=1)
+    print(f"wrote {len(rows)} results to {out}")
+
+    if args.compare:
+        with open(args.compare) as f: base = json.load(f)
+        return 1 if compare(base, rows, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Seeded synthetic OHLC series for benchmarks.
+
+Every generator is deterministic in ``(n, seed)`` and returns a daily frame
+with Date/Open/High/Low/Close columns, the shape the pages get from Yahoo.
+:data:`REGIMES` names the market shapes the scaling suite sweeps over.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# Far enough back that 100k business days still fit in pandas' Timestamp range.
+_EPOCH = "1850-01-01"
+
+
+def _frame(open_, high, low, close, dates=None):
+    if dates is None: dates = pd.bdate_range(_EPOCH, periods=len(close))
+    return pd.DataFrame({'Date': dates, 'Open': open_, 'High': high, 'Low': low, 'Close': close})
+
+
+def _wicks(rng, open_, close, vol):
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2, len(close))))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2, len(close))))
+    return high, low
+
+
+def trending_ohlc(n, seed=0, drift=0.002, vol=0.01, start_price=100.0):
+    """Daily OHLC frame with a steady drift, i.e. one long Teji (or Mandi) swing."""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(drift, vol, n)))
+    open_ = np.r_[start_price, close[:-1]]
+    return _frame(open_, *_wicks(rng, open_, close, vol), close)
+
+
+def mean_reverting_ohlc(n, seed=0, theta=0.08, vol=0.015, start_price=100.0):
+    """Log price pulled back to ``start_price`` (Ornstein-Uhlenbeck): constant Teji/Mandi flips."""
+    rng = np.random.default_rng(seed)
+    shocks = rng.normal(0, vol, n).tolist()
+    x, path = 0.0, []
+    for e in shocks:
+        x += -theta * x + e; path.append(x)
+    close = start_price * np.exp(np.array(path))
+    open_ = np.r_[start_price, close[:-1]]
+    return _frame(open_, *_wicks(rng, open_, close, vol), close)
+
+
+def gappy_ohlc(n, seed=0, gap_prob=0.15, gap_vol=0.04, missing=0.05, vol=0.01, start_price=100.0):
+    """Frequent overnight gaps (open far from the prior close) and missing sessions."""
+    rng = np.random.default_rng(seed)
+    m = int(n / (1 - missing)) + 1
+    close = start_price * np.exp(np.cumsum(rng.normal(0, vol, m) + np.where(rng.random(m) < gap_prob, rng.normal(0, gap_vol, m), 0)))
+    open_ = np.r_[start_price, close[:-1]] * np.exp(np.where(rng.random(m) < gap_prob, rng.normal(0, gap_vol, m), 0))
+    high, low = _wicks(rng, open_, close, vol)
+    keep = np.sort(rng.choice(m, n, replace=False))      # suspensions / holidays drop whole days
+    dates = pd.bdate_range(_EPOCH, periods=m)[keep]
+    return _frame(open_[keep], high[keep], low[keep], close[keep], dates)
+
+
+def inside_bar_ohlc(n, seed=0, inside_prob=0.6, vol=0.01, start_price=100.0):
+    """Most bars sit inside the previous bar's range, so neither high nor low breaks."""
+    rng = np.random.default_rng(seed)
+    inside = (rng.random(n) < inside_prob).tolist()
+    u = rng.random((n, 3)).tolist(); moves = rng.normal(0, vol, n).tolist(); wick = np.abs(rng.normal(0, vol, n)).tolist()
+    o, h, l, c = [], [], [], []
+    ph, pl, pc = start_price * (1 + vol), start_price * (1 - vol), start_price
+    for i in range(n):
+        if inside[i] and i:
+            span = ph - pl
+            lo = pl + span * 0.5 * u[i][0]; hi = ph - span * 0.5 * u[i][1]
+            op = lo + (hi - lo) * u[i][2]; cl = lo + (hi - lo) * (1 - u[i][2])
+        else:
+            op = pc; cl = pc * math.exp(moves[i])
+            hi = max(op, cl) * (1 + wick[i]); lo = min(op, cl) * (1 - wick[i])
+        o.append(op); h.append(hi); l.append(lo); c.append(cl)
+        ph, pl, pc = hi, lo, cl
+    return _frame(np.array(o), np.array(h), np.array(l), np.array(c))
+
+
+REGIMES = {
+    "trending": trending_ohlc,
+    "mean_reverting": mean_reverting_ohlc,
+    "gappy": gappy_ohlc,
+    "inside_bar": inside_bar_ohlc,
+}
+
+
+def synthetic_ohlc(regime, n, seed=0, **params):
+    """``REGIMES[regime](n, seed, **params)``."""
+    return REGIMES[regime](n, seed=seed, **params)
+
+
+def synthetic_universe(regime, symbols, n, seed=0):
+    """``{symbol: df}`` of ``symbols`` independent series, seeded ``seed .. seed + symbols - 1``."""
+    return {f"SYN{i:05d}": synthetic_ohlc(regime, n, seed + i) for i in range(symbols)}
@@ -0,0 +1,85 @@
+"""Scan fetch throughput against a replayed market, no network needed.
+
+Writes a seeded synthetic universe (:mod:`benchmarks.synthetic`) as replay
+files, then runs :func:`vns.fetch_universe` into an empty store through a
+:class:`vns.LatencyProvider`, once per worker count.  Each run is timed cold
+(every symbol downloaded) and warm (same-day rescan, served by the store)::
+
+    python -m benchmarks.throughput
+    python -m benchmarks.throughput --symbols 500 --latency 0.3 --per-ticker 0.05 --workers 1 4 16
+
+Same seed, latency and clock give the same requests on every machine, so
+runs on two commits compare fetch concurrency and caching directly.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import vns
+from vns.store import IST, BAR_FINAL
+from benchmarks.synthetic import REGIMES, synthetic_universe
+
+# Replayed bars end here; the scan runs that evening, so the store sees them as final.
+LAST_BAR = pd.Timestamp("2024-06-28")
+
+
+def write_replay(directory, regime, symbols, bars, seed=0):
+    """``synthetic_universe`` as ``<SYMBOL>.parquet`` replay files ending on ``LAST_BAR``; returns the symbols."""
+    os.makedirs(directory, exist_ok=True)
+    universe = synthetic_universe(regime, symbols, bars, seed)
+    for sym, df in universe.items():
+        df.assign(Date=pd.bdate_range(end=LAST_BAR, periods=len(df))).to_parquet(os.path.join(directory, f"{sym}.parquet"), index=False)
+    return list(universe)
+
+
+def run(symbols, provider, workers, batch_size, rate, start, now):
+    """Cold and warm ``fetch_universe`` into a fresh store: ``(cold_s, warm_s, requests)``."""
+    with tempfile.TemporaryDirectory() as store_dir:
+        t0 = time.perf_counter()
+        cold = vns.fetch_universe(symbols, start, batch_size=batch_size, directory=store_dir, download_many=provider.download_many,
+                                  now=now, workers=workers, rate=rate)
+        cold_s = time.perf_counter() - t0
+        if cold.failed: raise RuntimeError(f"{len(cold.failed)} symbols failed, e.g. {next(iter(cold.failed.items()))}")
+        t0 = time.perf_counter()
+        warm = vns.fetch_universe(symbols, start, batch_size=batch_size, directory=store_dir, download_many=provider.download_many,
+                                  now=now + timedelta(minutes=30), workers=workers, rate=rate)
+        warm_s = time.perf_counter() - t0
+        return cold_s, warm_s, cold.requests + warm.requests
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--symbols", type=int, default=200)
+    ap.add_argument("--bars", type=int, default=500)
+    ap.add_argument("--regime", choices=sorted(REGIMES), default="trending")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--latency", type=float, default=0.2, help="seconds per provider request")
+    ap.add_argument("--per-ticker", type=float, default=0.02, help="extra seconds per ticker in a request")
+    ap.add_argument("--jitter", type=float, default=0.1, help="seeded extra delay, up to this many seconds")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--batch-size", type=int, default=vns.BATCH_SIZE)
+    ap.add_argument("--rate", type=float, default=1e6, help="token-bucket limit (default: effectively none)")
+    args = ap.parse_args(argv)
+
+    now = datetime.combine(LAST_BAR.date(), BAR_FINAL, IST) + timedelta(hours=2)
+    start = LAST_BAR - pd.offsets.BDay(args.bars - 1)
+    with tempfile.TemporaryDirectory() as replay_dir:
+        symbols = write_replay(replay_dir, args.regime, args.symbols, args.bars, args.seed)
+        provider = vns.LatencyProvider(vns.ReplayProvider(replay_dir), args.latency, args.per_ticker, args.jitter, args.seed)
+        print(f"{len(symbols)} symbols x {args.bars} bars, {provider!r}, batch {args.batch_size}")
+        print(f"{'workers':>7} {'cold s':>8} {'symbols/s':>10} {'speedup':>8} {'warm s':>8} {'requests':>9}")
+        base = None
+        for w in args.workers:
+            cold_s, warm_s, requests = run(symbols, provider, w, args.batch_size, args.rate, start, now)
+            base = base or cold_s
+            print(f"{w:>7} {cold_s:>8.2f} {len(symbols) / cold_s:>10.1f} {base / cold_s:>7.1f}x {warm_s:>8.3f} {requests:>9}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
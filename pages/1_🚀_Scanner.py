@@ -1,11 +1,11 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
+import vns
+from vns import render
+from vns.analyzers import history_frame
 import urllib.parse
 import time
-import json
 import os
-from datetime import datetime, timedelta
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="Pro F&O Scanner", page_icon="🔭", layout="wide")
@@ -35,45 +35,12 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- CONFIG ---
-SCAN_FILE = "daily_scan_results.json" 
-FNO_STOCKS = [
-    "360ONE", "ABB", "APLAPOLLO", "AUBANK", "ADANIENSOL", "ADANIENT", "ADANIGREEN", "ADANIPORTS", 
-    "ABCAPITAL", "ALKEM", "AMBER", "AMBUJACEM", "ANGELONE", "APOLLOHOSP", "ASHOKLEY", "ASIANPAINT", 
-    "ASTRAL", "AUROPHARMA", "DMART", "AXISBANK", "BSE", "BAJAJ-AUTO", "BAJFINANCE", "BAJAJFINSV", 
-    "BANDHANBNK", "BANKBARODA", "BANKINDIA", "BDL", "BEL", "BHARATFORG", "BHEL", "BPCL", 
-    "BHARTIARTL", "BIOCON", "BLUESTARCO", "BOSCHLTD", "BRITANNIA", "CGPOWER", "CANBK", "CDSL", 
-    "CHOLAFIN", "CIPLA", "COALINDIA", "COFORGE", "COLPAL", "CAMS", "CONCOR", "CROMPTON", 
-    "CUMMINSIND", "CYIENT", "DLF", "DABUR", "DALBHARAT", "DELHIVERY", "DIVISLAB", "DIXON", 
-    "DRREDDY", "EICHERMOT", "EXIDEIND", "NYKAA", "FORTIS", "GAIL", "GMRAIRPORT", "GLENMARK", 
-    "GODREJCP", "GODREJPROP", "GRASIM", "HCLTECH", "HDFCAMC", "HDFCBANK", "HDFCLIFE", "HFCL", 
-    "HAVELLS", "HEROMOTOCO", "HINDALCO", "HAL", "HINDPETRO", "HINDUNILVR", "HINDZINC", "POWERINDIA", 
-    "HUDCO", "ICICIBANK", "ICICIGI", "ICICIPRULI", "IDFCFIRSTB", "IIFL", "ITC", "INDIANB", "IEX", 
-    "IOC", "IRCTC", "IRFC", "IREDA", "INDUSTOWER", "INDUSINDBK", "NAUKRI", "INFY", "INOXWIND", 
-    "INDIGO", "JINDALSTEL", "JSWENERGY", "JSWSTEEL", "JIOFIN", "JUBLFOOD", "KEI", "KPITTECH", 
-    "KALYANKJIL", "KAYNES", "KFINTECH", "KOTAKBANK", "LTF", "LICHSGFIN", "LTIM", "LT", "LAURUSLABS", 
-    "LICI", "LODHA", "LUPIN", "M&M", "MANAPPURAM", "MANKIND", "MARICO", "MARUTI", "MFSL", 
-    "MAXHEALTH", "MAZDOCK", "MPHASIS", "MCX", "MUTHOOTFIN", "NBCC", "NCC", "NHPC", "NMDC", 
-    "NTPC", "NATIONALUM", "NESTLEIND", "NUVAMA", "OBEROIRLTY", "ONGC", "OIL", "PAYTM", "OFSS", 
-    "POLICYBZR", "PGEL", "PIIND", "PNBHOUSING", "PAGEIND", "PATANJALI", "PERSISTENT", "PETRONET", 
-    "PIDILITIND", "PPLPHARMA", "POLYCAB", "PFC", "POWERGRID", "PRESTIGE", "PNB", "RBLBANK", 
-    "RECLTD", "RVNL", "RELIANCE", "SBICARD", "SBILIFE", "SHREECEM", "SRF", "SAMMAANCAP", 
-    "MOTHERSON", "SHRIRAMFIN", "SIEMENS", "SOLARINDS", "SONACOMS", "SBIN", "SAIL", "SUNPHARMA", 
-    "SUPREMEIND", "SUZLON", "SYNGENE", "TATACONSUM", "TITAGARH", "TVSMOTOR", "TCS", "TATAELXSI", 
-    "TATAPOWER", "TATASTEEL", "TATATECH", "TECHM", "FEDERALBNK", "INDHOTEL", "PHOENIXLTD", 
-    "TITAN", "TORNTPHARM", "TORNTPOWER", "TRENT", "TIINDIA", "UNOMINDA", "UPL", "ULTRACEMCO", 
-    "UNIONBANK", "UNITDSPR", "VBL", "VEDL", "IDEA", "VOLTAS", "WIPRO", "YESBANK", "ZYDUSLIFE"
-]
-FNO_STOCKS = sorted(list(set(FNO_STOCKS)))
-
-if 'scan_start_date' not in st.session_state: st.session_state.scan_start_date = datetime.now() - timedelta(days=30)
+# Scans run in the background scheduler (vns.scheduler); this page only reads their latest snapshot
+vns.start_scheduler()
 if 'scan_duration_label' not in st.session_state: st.session_state.scan_duration_label = "1M"
 
 def update_scan_settings():
-    sel = st.session_state.duration_select
-    st.session_state.scan_duration_label = sel
-    now = datetime.now()
-    days = {"1M":30, "2M":60, "3M":90, "6M":180, "1Y":365}
-    if sel in days: st.session_state.scan_start_date = now - timedelta(days=days[sel])
+    st.session_state.scan_duration_label = st.session_state.duration_select
 
 with st.sidebar:
     st.header("⚙️ Scanner Settings")
@@ -83,104 +50,43 @@ with st.sidebar:
     view_min = c1.number_input("Min", 1000, value=1000)
     view_max = c2.number_input("Max", 0, value=100000)
     st.divider()
-    scan_delay = st.slider("Delay (sec)", 0.0, 1.0, 0.1)
+    batch_size = st.slider("Download batch", 5, 100, vns.BATCH_SIZE, step=5, help="Tickers per Yahoo request; each batch is analysed as soon as it lands")
+    c1, c2 = st.columns(2)
+    workers = c1.number_input("Workers", 1, 16, vns.WORKERS, help="Batches downloading at once")
+    rate = c2.number_input("Req/s", 1.0, 100.0, vns.RATE, step=1.0, help="Token-bucket limit on Yahoo requests; halves while Yahoo throttles")
+    processes = st.number_input("Analysis processes", 1, os.cpu_count() or 1, min(max(1, vns.SCAN_PROCESSES), os.cpu_count() or 1), help="Worker processes analysing landed batches; 1 analyses in the scan thread")
+    fetch_live = st.empty()
+    st.divider()
+    board_mode = st.radio("Board", ["Cards", "Table"], horizontal=True, help="Cards: a page of cards per column. Table: one selectable table per column; pick a row for details")
+    c1, c2 = st.columns(2)
+    sort_by = c1.selectbox("Sort by", list(vns.SORTS))
+    descending = c2.toggle("Descending", value=False)
     force_scan = st.button("🔄 Force Refresh", type="primary", use_container_width=True)
 
-# --- CORE ---
-def fetch_stock_data(symbol, start_date):
-    try:
-        yf_symbol = f"{symbol}.NS"
-        req_start = start_date - timedelta(days=30)
-        df = yf.download(yf_symbol, start=req_start, progress=False, auto_adjust=False)
-        if df.empty: return None
-        if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
-        df = df.reset_index()
-        df = df.rename(columns={'Date': 'Date', 'Open': 'Open', 'High': 'High', 'Low': 'Low', 'Close': 'Close'})
-        df['Date'] = pd.to_datetime(df['Date'])
-        return df.sort_values('Date').reset_index(drop=True)
-    except: return None
-
-def analyze_vns_full(df):
-    results = []
-    trend = "Neutral"
-    last_peak = df.iloc[0]['High']; last_trough = df.iloc[0]['Low']
-    reaction_support = df.iloc[0]['Low']; reaction_resist = df.iloc[0]['High']
-    last_peak_idx = 0; last_trough_idx = 0
-    
-    for i in range(1, len(df)):
-        curr = df.iloc[i]; c_h, c_l = curr['High'], curr['Low']
-        bu, be, signal, signal_type = None, None, "", ""
-        
-        if trend == "Teji":
-            if c_h > last_peak:
-                bu = f"T (Teji) {c_h:.2f}"; signal_type="bull_dark"; signal="New High"
-                swing_df = df.iloc[last_peak_idx:i+1]; reaction_support = swing_df['Low'].min()
-                be = f"R (Sup) {reaction_support:.2f}"
-                last_peak = c_h; last_peak_idx = i
-            elif c_l < reaction_support:
-                bu = f"ATAK (Top) {last_peak:.2f}"; be = f"M (Mandi) {c_l:.2f}"; signal_type="bear_dark"; signal="Reversal"
-                trend = "Mandi"; last_trough = c_l; last_trough_idx = i; reaction_resist = c_h
-        elif trend == "Mandi":
-            if c_l < last_trough:
-                be = f"M (Mandi) {c_l:.2f}"; signal_type="bear_dark"; signal="New Low"
-                swing_df = df.iloc[last_trough_idx:i+1]; reaction_resist = swing_df['High'].max()
-                bu = f"R (Resist) {reaction_resist:.2f}"
-                last_trough = c_l; last_trough_idx = i
-            elif c_h > reaction_resist:
-                be = f"ATAK (Bot) {last_trough:.2f}"; bu = f"T (Teji) {c_h:.2f}"; signal_type="bull_dark"; signal="Reversal"
-                trend = "Teji"; last_peak = c_h; last_peak_idx = i; reaction_support = c_l
-        else:
-            if c_h > last_peak: trend="Teji"; bu="Start Teji"; signal_type="bull_dark"; last_peak=c_h; last_peak_idx=i
-            elif c_l < last_trough: trend="Mandi"; be="Start Mandi"; signal_type="bear_dark"; last_trough=c_l; last_trough_idx=i
-        
-        color_type = ""
-        if "T (Teji)" in str(bu) or "Start Teji" in str(bu): color_type = "bull_dark"
-        elif "M (Mandi)" in str(be) or "Start Mandi" in str(be): color_type = "bear_dark"
-        elif "ATAK (Top)" in str(bu): color_type = "bear_light"
-        elif "ATAK (Bot)" in str(be): color_type = "bull_light"
-        elif "R (Sup)" in str(be): color_type = "bull_light"
-        elif "R (Resist)" in str(bu): color_type = "bear_light"
-
-        results.append({
-            'Date': curr['Date'].strftime('%d-%b-%Y'), 'Open': curr['Open'], 'High': curr['High'], 'Low': curr['Low'], 'Close': curr['Close'],
-            'BU': bu, 'BE': be, 'Signal': signal, 'Type': color_type
-        })
-    return trend, reaction_resist, reaction_support, df.iloc[-1]['Close'], results
-
-def run_full_scan():
-    results = []; bar = st.progress(0); status = st.empty()
-    start_date = st.session_state.scan_start_date; dur = st.session_state.scan_duration_label
-    for i, stock in enumerate(FNO_STOCKS):
-        status.caption(f"Scanning {stock}...")
-        df = fetch_stock_data(stock, start_date)
-        if df is not None:
-            trend, res, sup, close, hist = analyze_vns_full(df)
-            results.append({ "Symbol": stock, "Trend": trend, "Close": close, "BU": res, "BE": sup, "History": hist })
-        bar.progress((i+1)/len(FNO_STOCKS)); time.sleep(scan_delay)
-    bar.empty(); status.empty()
-    save = { "date": datetime.now().strftime("%Y-%m-%d"), "last_updated": datetime.now().strftime("%H:%M:%S"), "duration_label": dur, "stocks": results }
-    with open(SCAN_FILE, 'w') as f: json.dump(save, f)
-    return save
-
-def check_scan():
-    now = datetime.now(); today = now.strftime("%Y-%m-%d")
-    if not os.path.exists(SCAN_FILE): return True, "Init"
-    try:
-        with open(SCAN_FILE, 'r') as f: data = json.load(f)
-        if data.get("date") != today and now.hour >= 18: return True, "Daily"
-        return False, data
-    except: return True, "Error"
-
-do_scan, payload = check_scan()
-if force_scan: st.toast("Scanning..."); current_data = run_full_scan(); st.rerun()
-elif do_scan: st.info("Auto-Scanning..."); current_data = run_full_scan(); st.rerun()
-else: current_data = payload
+# --- SNAPSHOT ---
+dur = st.session_state.scan_duration_label; job = ("universe", dur)
+if force_scan: vns.request_scan(*job, batch_size=batch_size, workers=workers, rate=rate, processes=processes); st.toast("Refresh queued, the board updates when it finishes")
+sched = vns.scan_status(); running = sched.get("running")
+busy = bool(running) and running["kind"] == job[0] and job[1] in running.get("labels", [running["label"]])
+failed_scan = sched.get("errors", {}).get(f"universe/{dur}")
+queued = job in vns.pending_requests()
+current_data = vns.read_snapshot(*job)    # after the status: a scan that finished since then has its snapshot here
+if current_data is None and not (busy or queued or failed_scan): vns.request_scan(*job); queued = True
+if busy:
+    fetch_live.caption(running["fetch"])
+    st.progress(running["done"] / running["total"] if running["total"] else 0.0, text=f"Background {dur} scan: {running['done']}/{running['total']} stocks")
+elif failed_scan:
+    with st.expander("⚠️ Last background scan failed"): st.code(failed_scan)
+if current_data is None: st.info(f"The first {dur} scan is running in the background; this page refreshes when it is done.")
 
 # --- DISPLAY ---
 if current_data:
-    st.caption(f"Last Scanned: {current_data['date']} {current_data['last_updated']}")
-    all_s = current_data['stocks']; 
-    filtered = [s for s in all_s if view_min_price <= s['Close'] <= view_max_price]
+    st.caption(f"Last Scanned: {current_data['date']} {current_data['last_updated']}" + (f" · {current_data['recomputed']} recomputed, {current_data['reused']} reused" if 'reused' in current_data else ""))
+    if current_data.get('failed'):
+        with st.expander(f"⚠️ {len(current_data['failed'])} symbols failed to download"):
+            st.write(dict(current_data['failed']))
+    all_s = vns.scanner_stocks(current_data)
+    filtered = [s for s in all_s if view_min <= s['Close'] <= view_max]
     bulls = [s for s in filtered if s['Trend'] == "Teji"]
     bears = [s for s in filtered if s['Trend'] == "Mandi"]
     neut = [s for s in filtered if s['Trend'] == "Neutral"]
@@ -191,18 +97,10 @@ if current_data:
         c1,c2,c3 = st.columns(3)
         c1.metric("Trend", s['Trend']); c2.metric("Resistance", f"{s['BU']:.2f}"); c3.metric("Support", f"{s['BE']:.2f}")
         st.divider()
-        h = pd.DataFrame(s['History'])
-        def color(row):
-            t = row['Type']
-            if t=='bull_dark': return ['background-color: #228B22; color: white; font-weight: bold']*len(row)
-            if t=='bear_dark': return ['background-color: #8B0000; color: white; font-weight: bold']*len(row)
-            if t=='bull_light': return ['background-color: #90EE90; color: black; font-weight: bold']*len(row)
-            if t=='bear_light': return ['background-color: #FFC0CB; color: black; font-weight: bold']*len(row)
-            return ['']*len(row)
-            
-        # Removing format here avoids "value error" on text columns
+        # Built from the stored history on first open; the fingerprint changes whenever the symbol's bars do
+        build = lambda: history_frame(*vns.read_history(*job, s['Symbol']))   # label text built here, for this stock only
         st.dataframe(
-            h.style.apply(color, axis=1).format({"Open": "{:.2f}", "High": "{:.2f}", "Low": "{:.2f}", "Close": "{:.2f}"}),
+            render.table(("scanner", *job, s['Symbol'], s.get('Fingerprint', current_data['date'] + current_data['last_updated'])), build, render.SCANNER_PALETTE),
             column_config={
                 "Type": None,
                 "BU": st.column_config.TextColumn("BU (Resist)", width="medium"),
@@ -211,9 +109,24 @@ if current_data:
             use_container_width=True, height=400
         )
 
-    def render(lst, title, col):
+    def turn_page(key, page): st.session_state[key] = page
+
+    # Sorted and paged here: a rerun draws one page of cards per column (or one table), not the whole universe
+    def board_column(lst, title, col):
         st.markdown(f"<div style='background:{col}; padding:8px; border-radius:5px; color:white; text-align:center; font-weight:bold;'>{title} ({len(lst)})</div>", unsafe_allow_html=True)
-        for s in lst:
+        if board_mode == "Table":
+            rows = vns.sort_rows(lst, sort_by, descending)
+            key = f"table_{title}_{sort_by}_{descending}"
+            ev = st.dataframe(pd.DataFrame(rows, columns=["Symbol", "Close", "BU", "BE"]), key=key, on_select="rerun", selection_mode="single-row", hide_index=True, use_container_width=True,
+                              column_config={"Close": st.column_config.NumberColumn(format="%.2f"), "BU": st.column_config.NumberColumn("Res", format="%.2f"), "BE": st.column_config.NumberColumn("Sup", format="%.2f")})
+            picked = rows[ev.selection.rows[0]]['Symbol'] if ev.selection.rows else None
+            if picked != st.session_state.get(f"{key}_shown"):   # a kept selection doesn't reopen the dialog on every rerun
+                st.session_state[f"{key}_shown"] = picked
+                if picked: show(rows[ev.selection.rows[0]])
+            return
+        pk = f"page_{title}"
+        pg = vns.board_page(lst, sort_by, descending, st.session_state.get(pk, 0))
+        for s in pg.rows:
             with st.container():
                 st.markdown(f"""
                 <div class="stock-card">
@@ -227,8 +140,22 @@ if current_data:
                 </div>
                 """, unsafe_allow_html=True)
                 if st.button("View", key=s['Symbol'], use_container_width=True): show(s)
-
-    c1, c2, c3 = st.columns(3)
-    with c1: render(bulls, "TEJI (BULL)", "#28a745")
-    with c2: render(bears, "MANDI (BEAR)", "#dc3545")
-    with c3: render(neut, "NEUTRAL", "#6c757d")
+        if pg.pages > 1:
+            p1, p2, p3 = st.columns([1, 2, 1])
+            p1.button("◀", key=f"{pk}_prev", disabled=pg.page == 0, on_click=turn_page, args=(pk, pg.page - 1), use_container_width=True)
+            p2.caption(f"Page {pg.page + 1} / {pg.pages}")
+            p3.button("▶", key=f"{pk}_next", disabled=pg.page == pg.pages - 1, on_click=turn_page, args=(pk, pg.page + 1), use_container_width=True)
+
+    # A fragment: "View", page turns and table picks rerun only the board (and the dialog is a fragment of its
+    # own), with the columns from the last full run -- the snapshot is not re-read or re-filtered for them
+    @st.fragment
+    def board(bulls, bears, neut):
+        c1, c2, c3 = st.columns(3)
+        with c1: board_column(bulls, "TEJI (BULL)", "#28a745")
+        with c2: board_column(bears, "MANDI (BEAR)", "#dc3545")
+        with c3: board_column(neut, "NEUTRAL", "#6c757d")
+
+    board(bulls, bears, neut)
+
+# Keep polling while a scan this page is waiting on runs in the background
+if busy or queued: time.sleep(2); st.rerun()
@@ -3,9 +3,10 @@ import pandas as pd
 import requests
 import urllib.parse
 import time
-import json
-import os
-import yfinance as yf
+import vns
+from vns import render
+from vns.analyzers import classifier_history
+from vns.universe import SECTOR_MAP
 from datetime import datetime, timedelta
 
 # --- PAGE CONFIG ---
@@ -85,26 +86,8 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- CONFIGURATION ---
-CLASS_FILE = "daily_classification_results.json" 
-
-# --- SECTOR MAPPING ---
-SECTOR_MAP = {
-    "NIFTY": "Index", "BANKNIFTY": "Index",
-    "RELIANCE": "Energy", "ONGC": "Energy", "COALINDIA": "Energy", "NTPC": "Energy", "POWERGRID": "Energy", "TATAPOWER": "Energy", "ADANIGREEN": "Energy", "ADANIENSOL": "Energy", "IOC": "Energy", "BPCL": "Energy", "GAIL": "Energy", "PETRONET": "Energy", "OIL": "Energy",
-    "HDFCBANK": "Banking", "ICICIBANK": "Banking", "SBIN": "Banking", "AXISBANK": "Banking", "KOTAKBANK": "Banking", "INDUSINDBK": "Banking", "AUBANK": "Banking", "BANDHANBNK": "Banking", "BANKBARODA": "Banking", "FEDERALBNK": "Banking", "IDFCFIRSTB": "Banking", "PNB": "Banking", "RBLBANK": "Banking", "CANBK": "Banking",
-    "TCS": "IT", "INFY": "IT", "HCLTECH": "IT", "WIPRO": "IT", "TECHM": "IT", "LTIM": "IT", "PERSISTENT": "IT", "COFORGE": "IT", "MPHASIS": "IT", "LTTS": "IT", "TATAELXSI": "IT",
-    "MARUTI": "Auto", "TATAMOTORS": "Auto", "M&M": "Auto", "BAJAJ-AUTO": "Auto", "EICHERMOT": "Auto", "HEROMOTOCO": "Auto", "TVSMOTOR": "Auto", "ASHOKLEY": "Auto", "BHARATFORG": "Auto", "BALKRISIND": "Auto", "MRF": "Auto", "BOSCHLTD": "Auto", "MOTHERSON": "Auto",
-    "SUNPHARMA": "Pharma", "DRREDDY": "Pharma", "CIPLA": "Pharma", "DIVISLAB": "Pharma", "APOLLOHOSP": "Pharma", "LUPIN": "Pharma", "AUROPHARMA": "Pharma", "ALKEM": "Pharma", "BIOCON": "Pharma", "TORNTPHARM": "Pharma", "ZYDUSLIFE": "Pharma", "SYNGENE": "Pharma", "LAURUSLABS": "Pharma", "GLENMARK": "Pharma", "GRANULES": "Pharma",
-    "ITC": "FMCG", "HINDUNILVR": "FMCG", "NESTLEIND": "FMCG", "BRITANNIA": "FMCG", "TATACONSUM": "FMCG", "MARICO": "FMCG", "DABUR": "FMCG", "COLPAL": "FMCG", "GODREJCP": "FMCG", "UBL": "FMCG", "VBL": "FMCG",
-    "BAJFINANCE": "Finance", "BAJAJFINSV": "Finance", "CHOLAFIN": "Finance", "SHRIRAMFIN": "Finance", "MUTHOOTFIN": "Finance", "SBICARD": "Finance", "HDFCLIFE": "Finance", "SBILIFE": "Finance", "ICICIPRULI": "Finance", "ICICIGI": "Finance", "PFC": "Finance", "RECLTD": "Finance", "ABCAPITAL": "Finance", "LICHSGFIN": "Finance", "M&MFIN": "Finance", "MANAPPURAM": "Finance",
-    "TATASTEEL": "Metal", "HINDALCO": "Metal", "JSWSTEEL": "Metal", "VEDL": "Metal", "SAIL": "Metal", "NMDC": "Metal", "NATIONALUM": "Metal", "JINDALSTEL": "Metal",
-    "ULTRACEMCO": "Cement", "GRASIM": "Cement", "AMBUJACEM": "Cement", "ACC": "Cement", "SHREECEM": "Cement", "DALBHARAT": "Cement", "RAMCOCEM": "Cement",
-    "LT": "Infra", "ADANIENT": "Infra", "ADANIPORTS": "Infra", "DLF": "Realty", "GODREJPROP": "Realty", "OBEROIRLTY": "Realty", "HAL": "Defence", "BEL": "Defence", "BDL": "Defence", "INDIGO": "Aviation",
-    "TITAN": "Consumer", "ASIANPAINT": "Consumer", "BERGEPAINT": "Consumer", "HAVELLS": "Consumer", "VOLTAS": "Consumer", "TRENT": "Consumer", "PIDILITIND": "Consumer", "PAGEIND": "Consumer", "JIOFIN": "Finance", "BHARTIARTL": "Telecom", "IDEA": "Telecom", "INDHOTEL": "Hospitality"
-}
-
-FNO_STOCKS_LIST = list(SECTOR_MAP.keys())
-FNO_STOCKS_LIST.sort()
+# Scans run in the background scheduler (vns.scheduler); this page only reads their latest snapshot
+vns.start_scheduler()
 
 # --- SESSION STATE ---
 if 'class_start_date' not in st.session_state:
@@ -148,122 +131,34 @@ with st.sidebar:
     
     category_filter = st.selectbox("Category", ["All", "Bullish Only", "Bearish Only", "Atak Only", "High Momentum Only"])
     sector_filter = st.selectbox("Sector", ["All"] + sorted(list(set(SECTOR_MAP.values()))))
+    board_mode = st.radio("Board", ["Cards", "Table"], horizontal=True, help="Cards: a page of cards per category. Table: one selectable table per category; pick a row for details")
+    c1, c2 = st.columns(2)
+    sort_by = c1.selectbox("Sort by", list(vns.SORTS))
+    descending = c2.toggle("Descending", value=False)
     
     st.divider()
     force_scan = st.button("🔄 Force Refresh Now", type="primary", use_container_width=True)
 
-# --- CORE LOGIC ---
-def fetch_stock_data(symbol, start_date):
-    try:
-        yf_symbol = f"{symbol}.NS"
-        req_start = start_date - timedelta(days=5)
-        df = yf.download(yf_symbol, start=req_start, progress=False, auto_adjust=False)
-        if df.empty: return None
-        if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
-        df = df.reset_index()
-        df = df.rename(columns={'Date': 'Date', 'Open': 'Open', 'High': 'High', 'Low': 'Low', 'Close': 'Close'})
-        df['Date'] = pd.to_datetime(df['Date'])
-        return df.sort_values('Date').reset_index(drop=True)
-    except: return None
-    return None
-
-def classify_stock(df):
-    trend = "Neutral"; last_peak = df.iloc[0]['High']; last_trough = df.iloc[0]['Low']
-    reaction_support = df.iloc[0]['Low']; reaction_resist = df.iloc[0]['High']
-    last_peak_idx=0; last_trough_idx=0
-    signal_desc = "Neutral"; category = "Neutral"; history_records = []
-    
-    for i in range(1, len(df)):
-        curr = df.iloc[i]; c_h, c_l = curr['High'], curr['Low']
-        bu, be, signal, signal_type = None, None, "", ""
-        
-        # VNS Logic (Same as Home.py)
-        if trend == "Teji":
-            if c_h > last_peak:
-                bu = f"T (Teji)\n{c_h:.2f}"; signal_type="bull_dark"; signal="New High"
-                swing = df.iloc[last_peak_idx:i+1]; reaction_support = swing['Low'].min()
-                be = f"R (Sup)\n{reaction_support:.2f}"
-                last_peak = c_h; last_peak_idx = i
-            elif c_l < reaction_support:
-                bu = f"ATAK (Top)\n{last_peak:.2f}"; be = f"M (Mandi)\n{c_l:.2f}"; signal_type="bear_dark"; signal="Reversal"
-                trend = "Mandi"; last_trough = c_l; last_trough_idx = i; reaction_resist = c_h
-
-        elif trend == "Mandi":
-            if c_l < last_trough:
-                be = f"M (Mandi)\n{c_l:.2f}"; signal_type="bear_dark"; signal="New Low"
-                swing = df.iloc[last_trough_idx:i+1]; reaction_resist = swing['High'].max()
-                bu = f"R (Resist)\n{reaction_resist:.2f}"
-                last_trough = c_l; last_trough_idx = i
-            elif c_h > reaction_resist:
-                be = f"ATAK (Bot)\n{last_trough:.2f}"; bu = f"T (Teji)\n{c_h:.2f}"; signal_type="bull_dark"; signal="Reversal"
-                trend = "Teji"; last_peak = c_h; last_peak_idx = i; reaction_support = c_l
-        else:
-            if c_h > last_peak: trend="Teji"; bu="Start Teji"; signal_type="bull_dark"; last_peak=c_h; last_peak_idx=i
-            elif c_l < last_trough: trend="Mandi"; be="Start Mandi"; signal_type="bear_dark"; last_trough=c_l; last_trough_idx=i
-
-        # Note: We don't store "Type" here for coloring whole rows anymore, 
-        # we will color cells individually in the display function.
-        
-        history_records.append({
-            'Date': curr['Date'].strftime('%d-%b-%Y'), 'Open': curr['Open'], 'High': curr['High'],
-            'Low': curr['Low'], 'Close': curr['Close'], 'BU': bu, 'BE': be, 'Signal': signal
-        })
-        
-        if i == len(df) - 1:
-            signal_desc = signal
-            if "Reversal" in signal and trend == "Teji": category = "Highly Bullish"
-            elif "Reversal" in signal and trend == "Mandi": category = "Highly Bearish"
-            elif trend == "Teji": category = "Bullish"
-            elif trend == "Mandi": category = "Bearish"
-            
-            if "ATAK (Top)" in str(bu): category = "Atak (Teji Side)"
-            if "ATAK (Bot)" in str(be): category = "Atak (Mandi Side)"
-
-    last_row = df.iloc[-1]
-    pct_change = ((last_row['Close'] - df.iloc[-2]['Close']) / df.iloc[-2]['Close']) * 100
-    
-    return category, signal_desc, last_row['Close'], pct_change, history_records, last_bu, last_be, trend
-
-def run_full_scan():
-    results = []; bar = st.progress(0); status = st.empty()
-    start_date = st.session_state.class_start_date; duration_used = st.session_state.class_duration_label
-    
-    for i, stock in enumerate(FNO_STOCKS_LIST):
-        status.caption(f"Scanning {stock}...")
-        df = fetch_stock_data(stock, start_date)
-        if df is not None:
-            cat, sig, close, chg, history, fin_bu, fin_be, fin_trend = classify_stock(df)
-            if close > 0: 
-                sec = SECTOR_MAP.get(stock, "Other")
-                results.append({ "Symbol": stock, "Sector": sec, "Price": close, "Change": chg, "Category": cat, "Signal": sig, "History": history, "BU": fin_bu, "BE": fin_be, "Trend": fin_trend })
-        bar.progress((i + 1) / len(FNO_STOCKS_LIST)); time.sleep(0.05) 
-        
-    bar.empty(); status.empty()
-    save_payload = { "date": datetime.now().strftime("%Y-%m-%d"), "last_updated": datetime.now().strftime("%H:%M:%S"), "duration_label": duration_used, "stocks": results }
-    with open(CLASS_FILE, 'w') as f: json.dump(save_payload, f)
-    return save_payload
-
-def check_auto_scan():
-    now = datetime.now(); today_str = now.strftime("%Y-%m-%d")
-    if not os.path.exists(CLASS_FILE): return True, "Initial Setup"
-    try:
-        with open(CLASS_FILE, 'r') as f: data = json.load(f)
-        if data.get("date") != today_str and now.hour >= 18: return True, "Daily Update"
-        if data.get("duration_label") != st.session_state.class_duration_label: return True, "Duration Change"
-        if data.get('stocks') and len(data['stocks']) > 0:
-             if 'Trend' not in data['stocks'][0]: return True, "Schema Update"
-        return False, data
-    except: return True, "Error"
-
-should_scan, payload = check_auto_scan()
-if force_scan: st.toast("Scanning..."); current_data = run_full_scan(); st.rerun()
-elif should_scan is True: st.info(f"Auto-Scan... {payload}"); current_data = run_full_scan(); st.rerun()
-else: current_data = payload
+# --- SNAPSHOT ---
+dur = st.session_state.class_duration_label
+start = st.session_state.class_start_date.strftime("%Y-%m-%d") if dur == "Custom" else None
+job = ("universe", f"Custom-{start}" if start else dur)
+if force_scan: vns.request_scan(*job, start=start); st.toast("Refresh queued, results update when it finishes")
+sched = vns.scan_status(); running = sched.get("running")
+busy = bool(running) and running["kind"] == job[0] and job[1] in running.get("labels", [running["label"]])
+failed_scan = sched.get("errors", {}).get(f"universe/{job[1]}")
+queued = job in vns.pending_requests()
+current_data = vns.read_snapshot(*job)    # after the status: a scan that finished since then has its snapshot here
+if current_data is None and not (busy or queued or failed_scan): vns.request_scan(*job, start=start); queued = True
+if busy: st.progress(running["done"] / running["total"] if running["total"] else 0.0, text=f"Background {dur} scan: {running['done']}/{running['total']} stocks · {running['fetch']}")
+elif failed_scan:
+    with st.expander("⚠️ Last background scan failed"): st.code(failed_scan)
+if current_data is None: st.info(f"The {dur} classification is running in the background; this page refreshes when it is done.")
 
 # --- POPUP DIALOG ---
 @st.dialog("Stock Analysis", width="large")
 def show_details(item):
-    st.subheader(f"{item['Symbol']} : ₹{item['Price']:.2f} ({item['Change']:.2f}%)")
+    st.subheader(f"{item['Symbol']} : ₹{item['Close']:.2f} ({item['Change']:.2f}%)")
     
     c1, c2, c3 = st.columns(3)
     def card(label, value): return f"""<div class="metric-card"><div class="metric-label">{label}</div><div class="metric-value">{value}</div></div>"""
@@ -276,33 +171,14 @@ def show_details(item):
     
     st.divider()
     
-    def color_rows(row):
-        # CELL-BASED COLORING (MATCHING HOME.PY)
-        styles = ['background-color: white; color: black; white-space: pre-wrap;'] * len(row)
-        
-        # BU Column (Index 4 in displayed df)
-        bu_txt = str(row['BU'])
-        if "T (Teji)" in bu_txt or "Start Teji" in bu_txt: 
-            styles[4] = 'background-color: #28a745; color: white; font-weight: bold; white-space: pre-wrap;' # Dark Green
-        elif "R (" in bu_txt or "ATAK" in bu_txt:
-            styles[4] = 'background-color: #f8d7da; color: #721c24; font-weight: bold; white-space: pre-wrap;' # Light Red
-            
-        # BE Column (Index 5 in displayed df)
-        be_txt = str(row['BE'])
-        if "M (Mandi)" in be_txt or "Start Mandi" in be_txt:
-            styles[5] = 'background-color: #dc3545; color: white; font-weight: bold; white-space: pre-wrap;' # Dark Red
-        elif "R (" in be_txt or "ATAK" in be_txt:
-             styles[5] = 'background-color: #d4edda; color: #155724; font-weight: bold; white-space: pre-wrap;' # Light Green
-             
-        return styles
-
-    hist_df = pd.DataFrame(item['History'])
-    if not hist_df.empty:
-        # Cast numeric cols
-        for c in ["Open", "High", "Low", "Close"]: hist_df[c] = pd.to_numeric(hist_df[c])
-        
+    # Cell colours by event kind (BU / BE code of the bar), built from the stored bars on first open: the Classifier's
+    # own engine run from its warm-up start, with label text for this stock only
+    since = vns.classifier_start(datetime.strptime(current_data['start'], "%Y-%m-%d"))
+    build = lambda: classifier_history(vns.read_history(*job, item['Symbol'])[0], since)
+    hist = render.table(("classifier", *job, item['Symbol'], item.get('Fingerprint', current_data['date'] + current_data['last_updated'])), build, render.CLASSIFIER_PALETTE)
+    if not hist.data.empty:
         st.dataframe(
-            hist_df.style.apply(color_rows, axis=1).format({"Open": "{:.2f}", "High": "{:.2f}", "Low": "{:.2f}", "Close": "{:.2f}"}),
+            hist,
             column_config={
                 "Signal": None, "Type": None, # Hide helpers
                 "BU": st.column_config.TextColumn("BU (Resist)", width="medium"),
@@ -317,12 +193,15 @@ def show_details(item):
 # --- DISPLAY ---
 if current_data:
     data_dur = current_data.get('duration_label', 'Unknown')
-    st.caption(f"Last Scanned: {current_data['date']} {current_data['last_updated']} | Duration: {data_dur}")
+    st.caption(f"Last Scanned: {current_data['date']} {current_data['last_updated']} | Duration: {data_dur}" + (f" | {current_data['recomputed']} recomputed, {current_data['reused']} reused" if 'reused' in current_data else ""))
+    if current_data.get('failed'):
+        with st.expander(f"⚠️ {len(current_data['failed'])} symbols failed to download"):
+            st.write(dict(current_data['failed']))
     st.divider()
     
     search_query = st.text_input("🔍 Search Stock", placeholder="e.g. RELIANCE").upper()
-    data = current_data['stocks']
-    data = [d for d in data if view_min <= d['Price'] <= view_max]
+    data = vns.classifier_stocks(current_data)
+    data = [d for d in data if view_min <= d['Close'] <= view_max]
     
     if sector_filter != "All": data = [d for d in data if d.get('Sector') == sector_filter]
     if search_query: data = [d for d in data if search_query in d['Symbol']]
@@ -342,22 +221,51 @@ if current_data:
     elif category_filter == "High Momentum Only": cats_to_show = [("🚀 Highly Bullish", high_bull, "b-high-bull"), ("🩸 Highly Bearish", high_bear, "b-high-bear")]
     elif category_filter == "Atak Only": cats_to_show = [("⚠️ Atak on Teji", atak_teji, "b-atak-top"), ("🛡️ Atak on Mandi", atak_mandi, "b-atak-bot")]
 
+    def turn_page(key, page): st.session_state[key] = page
+
+    # Sorted and paged here: a rerun draws one page of cards per category (or one table), not the whole universe
     def render_category(title, items, border_class):
         st.markdown("""<style>.streamlit-expanderHeader {color: black !important; font-weight: bold;}</style>""", unsafe_allow_html=True)
         with st.expander(f"{title} ({len(items)})", expanded=True):
-            if not items: st.caption("No stocks.")
-            for item in items:
+            if not items: st.caption("No stocks."); return
+            if board_mode == "Table":
+                rows = vns.sort_rows(items, sort_by, descending)
+                key = f"table_{title}_{sort_by}_{descending}"
+                ev = st.dataframe(pd.DataFrame(rows, columns=["Symbol", "Close", "Change", "Signal"]), key=key, on_select="rerun", selection_mode="single-row", hide_index=True, use_container_width=True,
+                                  column_config={"Close": st.column_config.NumberColumn("Price", format="%.2f"), "Change": st.column_config.NumberColumn("Chg %", format="%+.2f")})
+                picked = rows[ev.selection.rows[0]]['Symbol'] if ev.selection.rows else None
+                if picked != st.session_state.get(f"{key}_shown"):   # a kept selection doesn't reopen the dialog on every rerun
+                    st.session_state[f"{key}_shown"] = picked
+                    if picked: show_details(rows[ev.selection.rows[0]])
+                return
+            pk = f"page_{title}"
+            pg = vns.board_page(items, sort_by, descending, st.session_state.get(pk, 0))
+            for item in pg.rows:
                 chg_color = "chg-green" if item['Change'] >= 0 else "chg-red"
                 sign = "+" if item['Change'] >= 0 else ""
                 tv_link = f"https://in.tradingview.com/chart/?symbol=NSE:{item['Symbol']}"
                 st.markdown(f"""
-                <div class="class-card {border_class}"><div style="display:flex; justify-content:space-between; align-items:center;"><span class="stock-title">{item['Symbol']} <span style='font-size:0.8em; color:#999; font-weight:normal;'>({item['Sector']})</span></span><span class="stock-price">₹{item['Price']:.2f}</span></div><div style="display:flex; justify-content:space-between; align-items:center; margin-top:4px;"><span class="{chg_color}">{sign}{item['Change']:.2f}%</span><a href="{tv_link}" target="_blank" class="chart-link">📈 Chart</a></div><div class="signal-text">Signal: {item['Signal']}</div></div>""", unsafe_allow_html=True)
+                <div class="class-card {border_class}"><div style="display:flex; justify-content:space-between; align-items:center;"><span class="stock-title">{item['Symbol']} <span style='font-size:0.8em; color:#999; font-weight:normal;'>({item['Sector']})</span></span><span class="stock-price">₹{item['Close']:.2f}</span></div><div style="display:flex; justify-content:space-between; align-items:center; margin-top:4px;"><span class="{chg_color}">{sign}{item['Change']:.2f}%</span><a href="{tv_link}" target="_blank" class="chart-link">📈 Chart</a></div><div class="signal-text">Signal: {item['Signal']}</div></div>""", unsafe_allow_html=True)
                 if st.button(f"🔍 View {item['Symbol']}", key=f"btn_{item['Symbol']}", use_container_width=True): show_details(item)
+            if pg.pages > 1:
+                p1, p2, p3 = st.columns([1, 2, 1])
+                p1.button("◀", key=f"{pk}_prev", disabled=pg.page == 0, on_click=turn_page, args=(pk, pg.page - 1), use_container_width=True)
+                p2.caption(f"Page {pg.page + 1} / {pg.pages}")
+                p3.button("▶", key=f"{pk}_next", disabled=pg.page == pg.pages - 1, on_click=turn_page, args=(pk, pg.page + 1), use_container_width=True)
 
-    if category_filter == "All":
-        c1, c2, c3 = st.columns(3)
-        with c1: render_category(cats_to_show[0][0], cats_to_show[0][1], cats_to_show[0][2]); render_category(cats_to_show[3][0], cats_to_show[3][1], cats_to_show[3][2])
-        with c2: render_category(cats_to_show[1][0], cats_to_show[1][1], cats_to_show[1][2]); render_category(cats_to_show[4][0], cats_to_show[4][1], cats_to_show[4][2])
-        with c3: render_category(cats_to_show[2][0], cats_to_show[2][1], cats_to_show[2][2]); render_category(cats_to_show[5][0], cats_to_show[5][1], cats_to_show[5][2])
-    else:
-        for cat in cats_to_show: render_category(cat[0], cat[1], cat[2])
+    # A fragment: "View", page turns and table picks rerun only the board (and the dialog is a fragment of its
+    # own), with the categories from the last full run -- the snapshot is not re-read or re-filtered for them
+    @st.fragment
+    def board(cats_to_show):
+        if category_filter == "All":
+            c1, c2, c3 = st.columns(3)
+            with c1: render_category(cats_to_show[0][0], cats_to_show[0][1], cats_to_show[0][2]); render_category(cats_to_show[3][0], cats_to_show[3][1], cats_to_show[3][2])
+            with c2: render_category(cats_to_show[1][0], cats_to_show[1][1], cats_to_show[1][2]); render_category(cats_to_show[4][0], cats_to_show[4][1], cats_to_show[4][2])
+            with c3: render_category(cats_to_show[2][0], cats_to_show[2][1], cats_to_show[2][2]); render_category(cats_to_show[5][0], cats_to_show[5][1], cats_to_show[5][2])
+        else:
+            for cat in cats_to_show: render_category(cat[0], cat[1], cat[2])
+
+    board(cats_to_show)
+
+# Keep polling while a scan this page is waiting on runs in the background
+if busy or queued: time.sleep(2); st.rerun()
@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
+from vns.analyzers import compute_vns_signals
+from vns.store import get_ohlc
 from datetime import date, timedelta
 
 # -------------------------------------------------
@@ -46,32 +47,14 @@ def fetch_yahoo_ohlc(symbol: str, start: date, end: date) -> pd.DataFrame:
     """
     Fetch daily OHLC data from Yahoo Finance for an NSE stock.
     """
-    ticker = symbol.upper().strip() + ".NS"
-    data = yf.download(ticker, start=start, end=end + timedelta(days=1))
+    # Local OHLC store; adjusted prices, as yf.download(auto_adjust=True) returned
+    # A provider or store error shows as no data, like an empty yf.download did
+    try: data = get_ohlc(symbol.upper().strip(), start, end, adjusted=True)
+    except Exception: return pd.DataFrame()
 
     if data is None or data.empty:
         return pd.DataFrame()
 
-    # Make sure Date is a column
-    if "Date" not in data.columns:
-        data = data.reset_index()
-
-    # After reset, if still no 'Date', but an index-like datetime column exists, rename it
-    if "Date" not in data.columns:
-        for col in data.columns:
-            if pd.api.types.is_datetime64_any_dtype(data[col]):
-                data = data.rename(columns={col: "Date"})
-                break
-
-    # Final check
-    if "Date" not in data.columns:
-        # Can't identify date column => return empty
-        return pd.DataFrame()
-
-    # Must have High & Low
-    if "High" not in data.columns or "Low" not in data.columns:
-        return pd.DataFrame()
-
     out = data[["Date", "High", "Low"]].copy()
     return out
 
@@ -79,209 +62,7 @@ def fetch_yahoo_ohlc(symbol: str, start: date, end: date) -> pd.DataFrame:
 # -------------------------------------------------
 # 3) VNS Logic using only High & Low (robust)
 # -------------------------------------------------
-
-def compute_vns_signals(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Apply VNS Teji/Mandi/Atak/Reaction/Breakout/Breakdown logic
-    based ONLY on High & Low.
-    """
-
-    # --- Defensive: empty or None ---
-    if df is None or df.empty:
-        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
-
-    df = df.copy()
-
-    # ---------- FIND DATE COLUMN SAFELY ----------
-    date_col = None
-
-    # First: look for a column literally named 'Date' or 'date'
-    for col in df.columns:
-        if str(col).lower() == "date":
-            date_col = col
-            break
-
-    # Second: look for any datetime-like column
-    if date_col is None:
-        for col in df.columns:
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
-                date_col = col
-                break
-
-    # Third: if index is datetime, reset and use index column
-    if date_col is None:
-        if isinstance(df.index, pd.DatetimeIndex):
-            df = df.reset_index()
-            date_col = df.columns[0]
-
-    # If still nothing, give up gracefully
-    if date_col is None:
-        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
-
-    # Rename chosen date column to 'Date' for internal use
-    if date_col != "Date":
-        df = df.rename(columns={date_col: "Date"})
-
-    # ---------- Clean Date / High / Low ----------
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    df = df.dropna(subset=["Date"])
-    if df.empty:
-        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
-
-    if "High" not in df.columns or "Low" not in df.columns:
-        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
-
-    df["High"] = pd.to_numeric(df["High"], errors="coerce")
-    df["Low"] = pd.to_numeric(df["Low"], errors="coerce")
-    df = df.dropna(subset=["High", "Low"])
-    if df.empty or len(df) < 2:
-        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
-
-    df = df.sort_values("Date").reset_index(drop=True)
-
-    # ---------- VNS State ----------
-    last_teji_high = None
-    last_mandi_low = None
-    signals = []
-
-    # ---------- 1st pass: Teji / Mandi / Atak / Reaction ----------
-    for i in range(1, len(df)):
-        y = df.iloc[i - 1]
-        t = df.iloc[i]
-
-        y_high = float(y["High"])
-        y_low = float(y["Low"])
-        t_high = float(t["High"])
-        t_low = float(t["Low"])
-
-        # A) Today's low breaks yesterday's low → yesterday's high = pivot high
-        if t_low < y_low:
-            pivot_price = y_high
-            pivot_date = y["Date"]
-
-            if last_teji_high is None:
-                signal_type = "Teji (BU)"
-                info = "First Teji: low break after this high."
-                last_teji_high = pivot_price
-            else:
-                if pivot_price > last_teji_high:
-                    signal_type = "Teji (BU)"
-                    info = "New higher Teji high."
-                    last_teji_high = pivot_price
-                elif pivot_price < last_teji_high:
-                    signal_type = "Atak (Double Top)"
-                    info = f"Lower high vs previous Teji {last_teji_high:.2f}."
-                else:
-                    signal_type = "Reaction"
-                    info = "Low break equal to previous Teji high."
-
-            signals.append(
-                {"Date": pivot_date, "Price": pivot_price, "Type": signal_type, "Info": info}
-            )
-
-        # B) Today's high breaks yesterday's high → yesterday's low = pivot low
-        if t_high > y_high:
-            pivot_price = y_low
-            pivot_date = y["Date"]
-
-            if last_mandi_low is None:
-                signal_type = "Mandi (BE)"
-                info = "First Mandi: high break after this low."
-                last_mandi_low = pivot_price
-            else:
-                if pivot_price < last_mandi_low:
-                    signal_type = "Mandi (BE)"
-                    info = "New lower Mandi low."
-                    last_mandi_low = pivot_price
-                elif pivot_price > last_mandi_low:
-                    signal_type = "Atak (Double Bottom)"
-                    info = f"Higher low vs previous Mandi {last_mandi_low:.2f}."
-                else:
-                    signal_type = "Reaction"
-                    info = "High break equal to previous Mandi low."
-
-            signals.append(
-                {"Date": pivot_date, "Price": pivot_price, "Type": signal_type, "Info": info}
-            )
-
-    if not signals:
-        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
-
-    sig_df = pd.DataFrame(signals)
-
-    # ---------- Clean signals / sort ----------
-    if "Date" not in sig_df.columns:
-        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
-
-    sig_df["Date"] = pd.to_datetime(sig_df["Date"], errors="coerce")
-    sig_df = sig_df.dropna(subset=["Date"])
-    if sig_df.empty:
-        return sig_df
-
-    sig_df = sig_df.sort_values("Date").reset_index(drop=True)
-
-    # ---------- 2nd pass: Breakout / Breakdown ----------
-    extra_rows = []
-    last_teji_idx = None
-    last_mandi_idx = None
-
-    for i, row in sig_df.iterrows():
-        stype = str(row["Type"])
-
-        if stype.startswith("Teji"):
-            last_teji_idx = i
-        if stype.startswith("Mandi"):
-            last_mandi_idx = i
-
-        if last_teji_idx is not None and last_mandi_idx is not None:
-            teji_date = sig_df.loc[last_teji_idx, "Date"]
-            mandi_date = sig_df.loc[last_mandi_idx, "Date"]
-
-            # Teji older → Mandi newer → Breakout above Teji
-            if teji_date < mandi_date:
-                teji_price = sig_df.loc[last_teji_idx, "Price"]
-                post = df[df["Date"] > mandi_date]
-                crossed = post[post["High"] >= teji_price]
-                if not crossed.empty:
-                    brk_row = crossed.iloc[0]
-                    extra_rows.append(
-                        {
-                            "Date": brk_row["Date"],
-                            "Price": teji_price,
-                            "Type": "Breakout",
-                            "Info": f"Price High crossed Teji level {teji_price:.2f} after Mandi.",
-                        }
-                    )
-                    last_teji_idx = None
-                    last_mandi_idx = None
-
-            # Mandi older → Teji newer → Breakdown below Mandi
-            elif mandi_date < teji_date:
-                mandi_price = sig_df.loc[last_mandi_idx, "Price"]
-                post = df[df["Date"] > teji_date]
-                crossed = post[post["Low"] <= mandi_price]
-                if not crossed.empty:
-                    brk_row = crossed.iloc[0]
-                    extra_rows.append(
-                        {
-                            "Date": brk_row["Date"],
-                            "Price": mandi_price,
-                            "Type": "Breakdown",
-                            "Info": f"Price Low broke Mandi level {mandi_price:.2f} after Teji.",
-                        }
-                    )
-                    last_teji_idx = None
-                    last_mandi_idx = None
-
-    if extra_rows:
-        extra_df = pd.DataFrame(extra_rows)
-        extra_df["Date"] = pd.to_datetime(extra_df["Date"], errors="coerce")
-        sig_df = pd.concat([sig_df, extra_df], ignore_index=True)
-        sig_df = sig_df.dropna(subset=["Date"])
-        sig_df = sig_df.sort_values("Date").reset_index(drop=True)
-
-    return sig_df
-
+# compute_vns_signals() lives in vns.analyzers, shared with the benchmarks.
 
 # -------------------------------------------------
 # 4) Streamlit UI
@@ -0,0 +1,20 @@
+"""Shared test setup: the store, checkpoints and snapshots go to a scratch directory.
+
+Set before anything imports :mod:`vns.config`, so no test writes under the
+working tree's ``vns_data``.
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_DATA_DIR = tempfile.mkdtemp(prefix="vns-tests-")
+os.environ["VNS_DATA_DIR"] = _DATA_DIR
+os.environ.setdefault("VNS_SCHEDULER", "off")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _scratch_data_dir():
+    yield
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
@@ -0,0 +1,39 @@
+"""Board sorting and paging."""
+from vns.board import PAGE_SIZE, board_page, sort_rows
+
+ROWS = [{"Symbol": s, "Close": c, "Change": ch} for s, c, ch in
+        [("B", 20.0, 1.0), ("A", 20.0, -2.0), ("D", 5.0, None), ("C", 50.0, 3.0)]]
+
+
+def symbols(rows): return [r["Symbol"] for r in rows]
+
+
+def test_sort_by_field_ties_by_symbol():
+    assert symbols(sort_rows(ROWS, "Price")) == ["D", "A", "B", "C"]
+    assert symbols(sort_rows(ROWS, "Price", descending=True)) == ["C", "A", "B", "D"]
+
+
+def test_sort_missing_values_last_either_way():
+    assert symbols(sort_rows(ROWS, "Change %")) == ["A", "B", "C", "D"]
+    assert symbols(sort_rows(ROWS, "Change %", descending=True)) == ["C", "B", "A", "D"]
+
+
+def test_sort_by_row_key_not_in_sorts():
+    assert symbols(sort_rows(ROWS, "Close")) == symbols(sort_rows(ROWS, "Price"))
+
+
+def test_pages_cover_every_row_once():
+    rows = [{"Symbol": f"S{i:03d}"} for i in range(2 * PAGE_SIZE + 3)]
+    pages = [board_page(rows, page=p) for p in range(3)]
+    assert [p.pages for p in pages] == [3, 3, 3] and all(p.total == len(rows) for p in pages)
+    assert sum((symbols(p.rows) for p in pages), []) == symbols(rows)
+
+
+def test_page_is_clamped():
+    rows = [{"Symbol": f"S{i}"} for i in range(PAGE_SIZE + 1)]
+    assert board_page(rows, page=9).page == 1 and board_page(rows, page=-1).page == 0
+
+
+def test_empty_column_has_one_page():
+    pg = board_page([], page=3)
+    assert (pg.rows, pg.page, pg.pages, pg.total) == ([], 0, 1, 0)
@@ -0,0 +1,27 @@
+"""The page analyzers through the shared engine match the original pandas code on the bundled corpus."""
+import pytest
+
+import vns
+from benchmarks.corpus import load_corpus
+from benchmarks.differential import CASES, same
+
+CORPUS = load_corpus()
+
+
+def test_corpus_is_bundled():
+    assert CORPUS, "benchmarks/data is empty: run `python -m benchmarks.corpus --synthesize`"
+
+
+def test_every_variant_has_a_case():
+    assert set(vns.variant_names()) <= {c.variant for c in CASES.values()}
+
+
+@pytest.mark.parametrize("symbol", sorted(CORPUS))
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_outputs_identical(name, symbol):
+    case = CASES[name]
+    df = CORPUS[symbol][list(case.columns)]
+    vns.clear_variant_cache()
+    want = case.reference(df.copy())
+    got = case.optimized(df.copy())
+    assert same(want, got), f"{name} ({case.variant}) differs on {symbol}"
@@ -0,0 +1,75 @@
+"""Rate limiting: the token bucket and the AIMD backoff on a fake clock."""
+from vns.fetch import Backoff, TokenBucket, looks_throttled
+
+
+class Clock:
+    def __init__(self): self.t = 0.0
+    def __call__(self): return self.t
+    def sleep(self, s): self.t += s
+
+
+def bucket(rate, burst=None):
+    clock = Clock()
+    return TokenBucket(rate, burst, clock=clock, sleep=clock.sleep), clock
+
+
+def test_bucket_spends_its_burst_then_waits_at_the_rate():
+    b, clock = bucket(2, burst=4)
+    for _ in range(4): b.acquire()
+    assert clock.t == 0
+    b.acquire(); assert clock.t == 0.5
+    b.acquire(2); assert clock.t == 1.5
+
+
+def test_bucket_caps_a_request_at_the_burst():
+    b, clock = bucket(1, burst=2)
+    assert b.acquire(10) and clock.t == 0 and b.tokens == 0
+
+
+def test_bucket_acquire_gives_up_when_cancelled():
+    b, clock = bucket(1, burst=1)
+    b.acquire()
+    assert b.acquire(cancel=lambda: True) is False
+
+
+def test_backoff_halves_the_rate_down_to_the_floor():
+    b, clock = bucket(8)
+    off = Backoff(b, floor=1.5, base=1.0, clock=clock)
+    for want in (4, 2, 1.5, 1.5):
+        off.throttled(0); clock.t += 1.0
+        assert b.rate == want
+
+
+def test_backoff_counts_workers_throttled_together_as_one_cut():
+    b, clock = bucket(8)
+    off = Backoff(b, base=1.0, clock=clock)
+    off.throttled(0); off.throttled(0); clock.t += 0.5; off.throttled(0)
+    assert b.rate == 4 and off.streak == 3
+
+
+def test_backoff_wait_grows_exponentially_up_to_the_cap():
+    b, clock = bucket(8)
+    off = Backoff(b, base=1.0, cap=5.0, clock=clock)
+    assert [off.throttled(a) for a in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_backoff_recovers_step_by_step_to_the_target():
+    b, clock = bucket(8)
+    off = Backoff(b, step=3.0, clock=clock)
+    off.throttled(0)
+    off.ok(); assert b.rate == 7
+    off.ok(); assert b.rate == 8
+
+
+def test_backoff_exhausted_after_patience_without_success():
+    b, clock = bucket(8)
+    off = Backoff(b, patience=3, clock=clock)
+    off.throttled(0); off.throttled(0); assert not off.exhausted
+    off.ok(); off.throttled(0); off.throttled(0); assert not off.exhausted
+    off.throttled(0); assert off.exhausted
+
+
+def test_looks_throttled():
+    assert looks_throttled(RuntimeError("429 Client Error: Too Many Requests"))
+    assert looks_throttled(type("YFRateLimitError", (Exception,), {})("slow down"))
+    assert not looks_throttled(OSError("connection reset"))
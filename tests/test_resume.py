@@ -0,0 +1,15 @@
+"""A scan resumed from checkpoints gives exactly the rows and histories of a scan from scratch."""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_warm_and_cold_scans_identical(tmp_path):
+    # Its own process and data directory: the check wipes checkpoints and sets the provider for the whole process
+    env = {**os.environ, "VNS_DATA_DIR": str(tmp_path / "data")}
+    args = ["--symbols", "60", "--bars", "300", "--seed", "0", "--new", "5", "--shift", "0", "3"]
+    run = subprocess.run([sys.executable, "-m", "benchmarks.resume_check", *args], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert run.returncode == 0, run.stdout + run.stderr
+    assert "warm and cold scans identical" in run.stdout
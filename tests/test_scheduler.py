@@ -0,0 +1,39 @@
+"""Scheduler: requested preset durations merge into one job; requests stay pending until their job is done."""
+import os
+
+from vns.scheduler import Scheduler, pending_requests, request_scan
+
+
+class Recording(Scheduler):
+    """Runs no scans: records each job and what was pending while it ran."""
+
+    def __init__(self, directory):
+        super().__init__(directory); self.ran = []
+
+    def run_job(self, kind, label, start=None, fetch=None):
+        self.ran.append(((kind, label, start, fetch), pending_requests(self.directory)))
+
+
+def test_preset_requests_merge_into_one_job(tmp_path):
+    request_scan("universe", "1M", directory=tmp_path)
+    request_scan("universe", "3M", directory=tmp_path, rate=5)
+    request_scan("universe", "Custom-2024-01-01", start="2024-01-01", directory=tmp_path)
+    jobs = Scheduler(tmp_path).due()
+    assert jobs == [("universe", "1M", None, {"rate": 5}), ("universe", "Custom-2024-01-01", "2024-01-01", {})]
+
+
+def test_requests_stay_pending_until_their_job_finishes(tmp_path):
+    request_scan("universe", "1M", directory=tmp_path)
+    request_scan("universe", "Custom-2024-01-01", start="2024-01-01", directory=tmp_path)
+    s = Recording(tmp_path)
+    assert s.run_pending() == 2
+    assert [pending for _, pending in s.ran] == [{("universe", "1M"), ("universe", "Custom-2024-01-01")},
+                                                 {("universe", "Custom-2024-01-01")}]
+    assert pending_requests(tmp_path) == set() and os.listdir(tmp_path / "requests") == []
+
+
+def test_claims_of_a_stopped_scheduler_are_requeued(tmp_path):
+    request_scan("universe", "3M", directory=tmp_path)
+    Scheduler(tmp_path).due()                       # claimed, then the scheduler goes away mid-scan
+    assert pending_requests(tmp_path) == {("universe", "3M")}
+    assert Scheduler(tmp_path).due()[0][:2] == ("universe", "3M")
@@ -0,0 +1,19 @@
+"""When a snapshot is due for the post-close refresh."""
+from datetime import datetime
+
+import pytest
+
+from vns.snapshots import is_stale
+
+
+@pytest.mark.parametrize("written, now, stale", [
+    (None, datetime(2024, 3, 5, 9), True),
+    (datetime(2024, 3, 5, 10), datetime(2024, 3, 5, 17, 59), False),       # before today's refresh
+    (datetime(2024, 3, 5, 10), datetime(2024, 3, 5, 18), True),            # written before the close, now after it
+    (datetime(2024, 3, 5, 18, 5), datetime(2024, 3, 5, 23), False),        # the post-close scan itself
+    (datetime(2024, 3, 4, 17), datetime(2024, 3, 5, 9), True),             # yesterday's refresh was missed
+    (datetime(2024, 3, 4, 18, 30), datetime(2024, 3, 5, 9), False),        # yesterday's refresh ran
+    (datetime(2024, 3, 4, 18, 30), datetime(2024, 3, 5, 18, 1), True),
+])
+def test_is_stale(written, now, stale):
+    assert is_stale(written, now) is stale
@@ -0,0 +1,89 @@
+"""Store planning and refresh: which downloads a request needs, gap-fill of older bars, and rescale detection."""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from vns import store
+from vns.providers import COLUMNS
+from vns.store import IST
+
+FRIDAY_CLOSE = datetime(2024, 3, 29, 18, 0, tzinfo=IST)     # after the 29th's bar is final
+MONDAY_CLOSE = datetime(2024, 4, 1, 17, 0, tzinfo=IST)      # the next bar is due
+
+
+def bars(end="2024-03-29", scale=1.0):
+    dates = pd.bdate_range("2024-01-01", end)
+    close = (100.0 + pd.Series(range(len(dates)), dtype=float)) * scale
+    return pd.DataFrame({"Date": dates, "Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Adj Close": close, "Volume": 0.0})[COLUMNS]
+
+
+class Source:
+    """A download function over a fixed history that records the ranges asked for."""
+
+    def __init__(self, df):
+        self.df, self.calls = df, []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((pd.Timestamp(start), None if end is None else pd.Timestamp(end)))
+        d = self.df['Date']
+        return self.df[(d >= start) & ((d <= end) if end is not None else True)].reset_index(drop=True)
+
+
+@pytest.fixture
+def stored(tmp_path):
+    """A symbol stored from 1 Feb at Friday's close; returns its directory."""
+    store.refresh("ABC", "2024-02-01", directory=tmp_path, download=Source(bars()), now=FRIDAY_CLOSE)
+    return tmp_path
+
+
+def test_plan_unstored_downloads_everything(tmp_path):
+    assert store.plan("ABC", "2024-02-01 10:30", directory=tmp_path, now=FRIDAY_CLOSE) == [(pd.Timestamp("2024-02-01"), None)]
+
+
+def test_plan_nothing_when_covered_and_fresh(stored):
+    assert store.plan("ABC", "2024-02-01", directory=stored, now=FRIDAY_CLOSE) == []
+
+
+def test_plan_fills_the_gap_before_the_stored_bars(stored):
+    assert store.plan("ABC", "2024-01-15", directory=stored, now=FRIDAY_CLOSE) == [(pd.Timestamp("2024-01-15"), pd.Timestamp("2024-02-01"))]
+
+
+def test_plan_refreshes_the_tail_after_the_next_close(stored):
+    assert store.plan("ABC", "2024-02-01", directory=stored, now=MONDAY_CLOSE) == [(pd.Timestamp("2024-03-29"), None)]
+
+
+def test_plan_skips_the_tail_for_a_settled_range(stored):
+    assert store.plan("ABC", "2024-02-01", "2024-03-01", directory=stored, now=MONDAY_CLOSE) == []
+
+
+def test_refresh_gap_fill_merges_older_bars(stored):
+    src = Source(bars())
+    df = store.refresh("ABC", "2024-01-15", directory=stored, download=src, now=FRIDAY_CLOSE)
+    assert src.calls == [(pd.Timestamp("2024-01-15"), pd.Timestamp("2024-02-01"))]
+    assert df['Date'].iloc[0] == pd.Timestamp("2024-01-15") and df['Date'].is_unique and df['Date'].is_monotonic_increasing
+    assert store.load_stored("ABC", stored)[1]["covered_from"] == "2024-01-15"
+
+
+def test_refresh_appends_new_bars(stored):
+    src = Source(bars("2024-04-01"))
+    df = store.refresh("ABC", "2024-02-01", directory=stored, download=src, now=MONDAY_CLOSE)
+    assert src.calls == [(pd.Timestamp("2024-03-29"), None)]
+    assert df['Date'].iloc[-1] == pd.Timestamp("2024-04-01") and df['Date'].is_unique
+
+
+def test_refresh_reloads_a_rescaled_history(stored):
+    # A split re-adjusts every close: the overlapping final bar moved, so the whole range is downloaded again
+    src = Source(bars("2024-04-01", scale=0.5))
+    df = store.refresh("ABC", "2024-02-01", directory=stored, download=src, now=MONDAY_CLOSE)
+    assert src.calls == [(pd.Timestamp("2024-03-29"), None), (pd.Timestamp("2024-02-01"), None)]
+    want = src.df[src.df['Date'] >= "2024-02-01"].reset_index(drop=True)
+    assert df['Close'].tolist() == want['Close'].tolist()
+
+
+def test_refresh_keeps_stored_bars_when_the_download_fails(stored):
+    def fail(symbol, start, end): raise OSError("offline")
+    df = store.refresh("ABC", "2024-01-15", directory=stored, download=fail, now=MONDAY_CLOSE)
+    assert df['Date'].iloc[0] == pd.Timestamp("2024-02-01")
+    assert store.plan("ABC", "2024-01-15", directory=stored, now=MONDAY_CLOSE)[0] == (pd.Timestamp("2024-01-15"), pd.Timestamp("2024-02-01"))
@@ -0,0 +1,34 @@
+"""Shared VNS (Teji / Mandi / Atak) analysis engine used by the dashboard pages.
+
+Pages pick a variant by name::
+
+    res = vns.run_variant("reaction_breakdown", df)
+    res.events, res.trend, res.resist, res.support
+"""
+from vns.engine import (
+    ENGINE_VERSION, Event,
+    START_TEJI, START_MANDI, NEW_HIGH, NEW_LOW, REACTION_SUP, REACTION_RES,
+    ATAK_TOP, ATAK_BOT, BREAKDOWN, BREAKOUT, EVENT_DTYPE, SIGNALS,
+    ReactionState, analyze_pivot, analyze_reaction, analyze_retro, analyze_swing, resume_reaction,
+    event_codes, events_since, history_records, label_columns, ohlc_arrays,
+)
+from vns.rangeindex import SparseTable
+from vns.providers import (
+    LatencyProvider, Provider, ReplayProvider, YFinanceProvider, get_provider, normalize_ohlc, set_provider,
+)
+from vns.singleflight import FETCHES, SCANS, SingleFlight, counters as coalescing_counters
+from vns.store import get_ohlc, load_stored
+from vns.fetch import (
+    BATCH_SIZE, RATE, WORKERS, Backoff, FetchStats, Landed, TokenBucket, UniverseFetch, fetch_universe, iter_universe,
+)
+from vns.checkpoint import analyze_incremental, checkpoint_anchor, load_checkpoint, save_checkpoint
+from vns.panel import TREND_NAMES, PanelResult, analyze_frames, analyze_panel, panel_from_frames
+from vns.registry import (
+    Variant, VariantResult, clear_variant_cache, get_variant, register_variant, run_variant, run_variant_batch, variant_names,
+)
+from vns.config import SCAN_PROCESSES
+from vns.parallel import Analyzer, get_pool, shutdown_pool
+from vns.scans import DURATIONS, classifier_start, classifier_stocks, scan_universe, scan_windows, scanner_stocks
+from vns.board import PAGE_SIZE, SORTS, BoardPage, board_page, sort_rows
+from vns.snapshots import is_stale, read_history, read_snapshot, snapshot_time
+from vns.scheduler import Scheduler, pending_requests, request_scan, scan_status, start_scheduler
@@ -0,0 +1,291 @@
+"""Page-level analyzers: a variant run plus each page's own labels.
+
+Every dashboard page shows the same engine output in its own words, so the
+label tables and the small glue that turns events into the page's columns
+live here.  Pages import their analyzer; the benchmark harness imports the
+same functions without running any Streamlit code.
+"""
+import pandas as pd
+
+from vns.engine import (START_TEJI, START_MANDI, NEW_HIGH, NEW_LOW, REACTION_SUP, REACTION_RES,
+    ATAK_TOP, ATAK_BOT, BREAKDOWN, BREAKOUT, SIGNALS, event_codes, events_since, history_records, label_columns)
+from vns.registry import run_variant
+
+# --- HOME (reaction_breakdown) ---
+HOME_VARIANT = "reaction_breakdown"
+HOME_LABELS = {
+    START_TEJI: ("BU", "Start Teji", "bull_dark"),
+    START_MANDI: ("BE", "Start Mandi", "bear_dark"),
+    NEW_HIGH: ("BU", "BU(T) {DATE}\n{price:.2f}", "bull_dark"),
+    NEW_LOW: ("BE", "BE(M) {DATE}\n{price:.2f}", "bear_dark"),
+    REACTION_SUP: ("BE", "R (Teji)\n{price:.2f}", None),
+    REACTION_RES: ("BU", "R (Mandi)\n{price:.2f}", None),
+    ATAK_TOP: ("BU", "ATAK (Top)\n{price:.2f}", None),
+    ATAK_BOT: ("BE", "ATAK (Bot)\n{price:.2f}", None),
+    BREAKDOWN: ("BE", "BE(M) {DATE}\n{price:.2f}", "bear_dark"),
+    BREAKOUT: ("BU", "BU(T) {DATE}\n{price:.2f}", "bull_dark"),
+}
+
+def analyze_vns(df):
+    res = run_variant(HOME_VARIANT, df)
+    cols = label_columns(df['Date'].array, res.events, HOME_LABELS)
+    df['BU'], df['BE'], df['Type'] = cols['BU'], cols['BE'], cols['Type']
+    return df, res.trend, res.resist, res.support
+
+# --- APP (swing_confirmation) ---
+SWING_VARIANT = "swing_confirmation"
+SWING_LABELS = {
+    START_TEJI: ("BU", "Start Teji\n{price:.2f}", "bull_dark"),
+    START_MANDI: ("BE", "Start Mandi\n{price:.2f}", "bear_dark"),
+    NEW_HIGH: ("BU", "BU(T) {DATE}\n{price:.2f}", "bull_dark"),   # Higher High -> Continuation
+    NEW_LOW: ("BE", "BE(M) {DATE}\n{price:.2f}", "bear_dark"),    # Lower Low -> Continuation
+    ATAK_TOP: ("BU", "ATAK (Top) {DATE}\n{price:.2f}", "bear_light"),
+    ATAK_BOT: ("BE", "ATAK (Bot) {DATE}\n{price:.2f}", "bull_light"),
+    REACTION_RES: ("BU", "R(Mandi) {DATE}\n{price:.2f}", "bear_light"),
+    REACTION_SUP: ("BE", "R(Teji) {DATE}\n{price:.2f}", "bull_light"),
+}
+
+def analyze_vns_swing(df):
+    res = run_variant(SWING_VARIANT, df)
+    cols = label_columns(df['Date'].array, res.events, SWING_LABELS)
+    df['BU'], df['BE'], df['Type'] = cols['BU'], cols['BE'], cols['Type']
+
+    # Active Levels for Header
+    fin_res = res.resist if res.trend == "Mandi" else "-"
+    fin_sup = res.support if res.trend == "Teji" else "-"
+    return df, res.trend, fin_res, fin_sup
+
+# --- SCANNER (reaction_breakdown, unseeded) ---
+SCANNER_VARIANT = "reaction_breakdown"
+SCANNER_LABELS = {
+    START_TEJI: ("BU", "Start Teji", "bull_dark"),
+    START_MANDI: ("BE", "Start Mandi", "bear_dark"),
+    NEW_HIGH: ("BU", "T (Teji) {price:.2f}", "bull_dark"),
+    NEW_LOW: ("BE", "M (Mandi) {price:.2f}", "bear_dark"),
+    REACTION_SUP: ("BE", "R (Sup) {price:.2f}", None),
+    REACTION_RES: ("BU", "R (Resist) {price:.2f}", None),
+    ATAK_TOP: ("BU", "ATAK (Top) {price:.2f}", None),
+    ATAK_BOT: ("BE", "ATAK (Bot) {price:.2f}", None),
+    BREAKDOWN: ("BE", "M (Mandi) {price:.2f}", "bear_dark"),
+    BREAKOUT: ("BU", "T (Teji) {price:.2f}", "bull_dark"),
+}
+
+def analyze_vns_full(df, res=None, since=None):
+    # res: this symbol's result from the universe-wide batch pass; None runs the engine on df alone
+    if res is None: res = run_variant(SCANNER_VARIANT, df, seed_reaction=False)
+    cols = label_columns(df['Date'].array, res.events, SCANNER_LABELS, fill=None)
+    first = 1 if since is None else max(1, int(df['Date'].searchsorted(since)))
+    return res.trend, res.resist, res.support, df.iloc[-1]['Close'], history_records(df, cols, first=first)
+
+# --- CLASSIFIER (reaction_breakdown, unseeded) ---
+CLASSIFIER_VARIANT = "reaction_breakdown"
+CLASSIFIER_LABELS = {
+    START_TEJI: ("BU", "Start Teji", None),
+    START_MANDI: ("BE", "Start Mandi", None),
+    NEW_HIGH: ("BU", "T (Teji)\n{price:.2f}", None),
+    NEW_LOW: ("BE", "M (Mandi)\n{price:.2f}", None),
+    REACTION_SUP: ("BE", "R (Sup)\n{price:.2f}", None),
+    REACTION_RES: ("BU", "R (Resist)\n{price:.2f}", None),
+    ATAK_TOP: ("BU", "ATAK (Top)\n{price:.2f}", None),
+    ATAK_BOT: ("BE", "ATAK (Bot)\n{price:.2f}", None),
+    BREAKDOWN: ("BE", "M (Mandi)\n{price:.2f}", None),
+    BREAKOUT: ("BU", "T (Teji)\n{price:.2f}", None),
+}
+
+def categorize(trend, events, n):
+    """``(category, signal)``: decided by the last bar's events only (VNS Logic same as Home.py)."""
+    if n < 2: return "Neutral", "Neutral"
+    side, signal = {}, ""
+    for bar, code, _, _ in events[events["bar"] == n - 1].tolist():
+        side[CLASSIFIER_LABELS[code][0]] = code
+        if code in SIGNALS: signal = SIGNALS[code]
+    category = "Neutral"
+    if "Reversal" in signal and trend == "Teji": category = "Highly Bullish"
+    elif "Reversal" in signal and trend == "Mandi": category = "Highly Bearish"
+    elif trend == "Teji": category = "Bullish"
+    elif trend == "Mandi": category = "Bearish"
+
+    if side.get("BU") == ATAK_TOP: category = "Atak (Teji Side)"
+    if side.get("BE") == ATAK_BOT: category = "Atak (Mandi Side)"
+    return category, signal
+
+def classify_stock(df, res=None):
+    # res: this symbol's result from the universe-wide batch pass; None runs the engine on df alone
+    if res is None: res = run_variant(CLASSIFIER_VARIANT, df, seed_reaction=False)
+    trend, reaction_resist, reaction_support = res.trend, res.resist, res.support
+    cols = label_columns(df['Date'].array, res.events, CLASSIFIER_LABELS, fill=None)
+    records = history_records(df, cols, fields=("BU", "BE", "Signal"))
+    category, signal_desc = categorize(trend, res.events, len(df))
+
+    last_row = df.iloc[-1]
+    pct_change = ((last_row['Close'] - df.iloc[-2]['Close']) / df.iloc[-2]['Close']) * 100
+    return category, signal_desc, last_row['Close'], pct_change, records, reaction_resist, reaction_support, trend
+
+# --- UNIVERSE SCAN (Scanner + Classifier boards from one fetch) ---
+def analyze_scan(df, res=None, since=None):
+    """One stock's Scanner fields: trend/levels, close, % change and the event history.
+
+    ``History`` keeps the bars from ``since`` and their events as arrays; no
+    label text is built here, :func:`history_frame` formats it when a dialog
+    shows it.
+    """
+    if res is None: res = run_variant(SCANNER_VARIANT, df, seed_reaction=False)
+    first = 1 if since is None else max(1, int(df['Date'].searchsorted(since)))
+    close = df['Close'].to_numpy()
+    change = (close[-1] - close[-2]) / close[-2] * 100 if len(close) > 1 else 0.0
+    bars = df[['Date', 'Open', 'High', 'Low', 'Close']].iloc[first:].reset_index(drop=True)
+    return {"Trend": res.trend, "Close": float(close[-1]), "BU": res.resist, "BE": res.support, "Change": float(change),
+            "History": {"bars": bars, "events": events_since(res.events, first)}}
+
+
+def classify_scan(df, res=None):
+    """One stock's Classifier fields from its own (shorter) window: category, signal and the Class_* trend/levels.
+
+    ``df`` empty (no bars in the Classifier's window) gives all None.
+    """
+    if df.empty: return dict.fromkeys(("Class_Trend", "Class_BU", "Class_BE", "Category", "Signal"))
+    if res is None: res = run_variant(CLASSIFIER_VARIANT, df, seed_reaction=False)
+    category, signal = categorize(res.trend, res.events, len(df))
+    return {"Class_Trend": res.trend, "Class_BU": res.resist, "Class_BE": res.support, "Category": category, "Signal": signal}
+
+
+def history_frame(bars, events, labels=SCANNER_LABELS):
+    """A stored scan history as the dialog table: Date text, OHLC, BU/BE labels, Signal, Type and the BU/BE event codes."""
+    cols = label_columns(bars['Date'].array, events, labels, fill=None)
+    codes = event_codes(events, labels, len(bars))
+    return bars.assign(Date=bars['Date'].dt.strftime('%d-%b-%Y'), BU=cols['BU'], BE=cols['BE'], Signal=cols['Signal'],
+                       Type=cols['Type'], BU_code=codes['BU'], BE_code=codes['BE'])
+
+
+def classifier_history(bars, since):
+    """The Classifier dialog's table from a stored scan's bars: its own unseeded run over the bars from ``since``."""
+    df = bars.iloc[int(bars['Date'].searchsorted(since)):].reset_index(drop=True)
+    res = run_variant(CLASSIFIER_VARIANT, df, seed_reaction=False)
+    return history_frame(df.iloc[1:].reset_index(drop=True), events_since(res.events, 1), CLASSIFIER_LABELS)
+
+
+def with_codes(df, variant, labels):
+    """``df`` plus the BU_code / BE_code event columns of ``variant`` over it (a cached run after the page's analyzer)."""
+    codes = event_codes(run_variant(variant, df).events, labels, len(df))
+    return df.assign(BU_code=codes['BU'], BE_code=codes['BE'])
+
+# --- NEW LOGIC TEST (retroactive_marking) ---
+RETRO_VARIANT = "retroactive_marking"
+RETRO_LABELS = {
+    START_TEJI: ("BU", "Start Teji", "bull_dark"),
+    START_MANDI: ("BE", "Start Mandi", "bear_dark"),
+    NEW_HIGH: ("BU", "BU(T) {DATE}\n{price:.2f}", "bull_dark"),
+    NEW_LOW: ("BE", "BE(M) {DATE}\n{price:.2f}", "bear_dark"),
+    # Marked retroactively once the reaction breaks
+    REACTION_SUP: ("BE", "R(Teji) {date:%d-%b}\n{price:.2f}", "bull_light"),
+    REACTION_RES: ("BU", "R(Mandi) {date:%d-%b}\n{price:.2f}", "bear_light"),
+    ATAK_TOP: ("BU", "ATAK (Top) {date:%d-%b}\n{price:.2f}", "bear_light"),
+    ATAK_BOT: ("BE", "ATAK (Bot) {date:%d-%b}\n{price:.2f}", "bull_light"),
+    BREAKDOWN: ("BE", "BE(M) {DATE}\n{price:.2f}", "bear_dark"),
+    BREAKOUT: ("BU", "BU(T) {DATE}\n{price:.2f}", "bull_dark"),
+}
+
+def analyze_new_logic(df):
+    res = run_variant(RETRO_VARIANT, df)
+    cols = label_columns(df['Date'].array, res.events, RETRO_LABELS)
+    df['BU'], df['BE'], df['Type'] = cols['BU'], cols['BE'], cols['Type']
+    return df
+
+# --- CHATGPTTEST (high_low_pivot) ---
+PIVOT_VARIANT = "high_low_pivot"
+PIVOT_TYPES = {
+    START_TEJI: "Teji (BU)", NEW_HIGH: "Teji (BU)",
+    ATAK_TOP: "Atak (Double Top)", REACTION_RES: "Reaction",
+    START_MANDI: "Mandi (BE)", NEW_LOW: "Mandi (BE)",
+    ATAK_BOT: "Atak (Double Bottom)", REACTION_SUP: "Reaction",
+    BREAKOUT: "Breakout", BREAKDOWN: "Breakdown",
+}
+PIVOT_INFO = {
+    START_TEJI: "First Teji: low break after this high.",
+    NEW_HIGH: "New higher Teji high.",
+    REACTION_RES: "Low break equal to previous Teji high.",
+    START_MANDI: "First Mandi: high break after this low.",
+    NEW_LOW: "New lower Mandi low.",
+    REACTION_SUP: "High break equal to previous Mandi low.",
+}
+
+def compute_vns_signals(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply VNS Teji/Mandi/Atak/Reaction/Breakout/Breakdown logic
+    based ONLY on High & Low.
+    """
+
+    # --- Defensive: empty or None ---
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    df = df.copy()
+
+    # ---------- FIND DATE COLUMN SAFELY ----------
+    date_col = None
+
+    # First: look for a column literally named 'Date' or 'date'
+    for col in df.columns:
+        if str(col).lower() == "date":
+            date_col = col
+            break
+
+    # Second: look for any datetime-like column
+    if date_col is None:
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                date_col = col
+                break
+
+    # Third: if index is datetime, reset and use index column
+    if date_col is None:
+        if isinstance(df.index, pd.DatetimeIndex):
+            df = df.reset_index()
+            date_col = df.columns[0]
+
+    # If still nothing, give up gracefully
+    if date_col is None:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    # Rename chosen date column to 'Date' for internal use
+    if date_col != "Date":
+        df = df.rename(columns={date_col: "Date"})
+
+    # ---------- Clean Date / High / Low ----------
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df = df.dropna(subset=["Date"])
+    if df.empty:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    if "High" not in df.columns or "Low" not in df.columns:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    df["High"] = pd.to_numeric(df["High"], errors="coerce")
+    df["Low"] = pd.to_numeric(df["Low"], errors="coerce")
+    df = df.dropna(subset=["High", "Low"])
+    if df.empty or len(df) < 2:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    df = df.sort_values("Date").reset_index(drop=True)
+
+    # ---------- VNS pivots (shared engine) ----------
+    events = run_variant(PIVOT_VARIANT, df).events
+    if len(events) == 0:
+        return pd.DataFrame(columns=["Date", "Price", "Type", "Info"])
+
+    highs, lows = df["High"].tolist(), df["Low"].tolist()
+    sig_types, infos = [], []
+    for bar, code, price, ref in events.tolist():
+        sig_types.append(PIVOT_TYPES[code])
+        if code == ATAK_TOP: infos.append(f"Lower high vs previous Teji {highs[ref]:.2f}.")
+        elif code == ATAK_BOT: infos.append(f"Higher low vs previous Mandi {lows[ref]:.2f}.")
+        elif code == BREAKOUT: infos.append(f"Price High crossed Teji level {price:.2f} after Mandi.")
+        elif code == BREAKDOWN: infos.append(f"Price Low broke Mandi level {price:.2f} after Teji.")
+        else: infos.append(PIVOT_INFO[code])
+
+    return pd.DataFrame({
+        "Date": df["Date"].to_numpy()[events["bar"]],
+        "Price": events["price"],
+        "Type": sig_types,
+        "Info": infos,
+    })
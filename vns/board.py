@@ -0,0 +1,42 @@
+"""Board paging: sort a board column's rows on the server and hand the page one screenful.
+
+The Scanner and Classifier boards used to draw a card and a button for every
+stock in every column on every rerun, so a click re-rendered hundreds of
+widgets and time-to-interactive grew with the universe.  A page now sorts
+and slices each column here and draws only :data:`PAGE_SIZE` cards of it
+(or one selectable table per column)::
+
+    pg = vns.board_page(bulls, sort="Change", descending=True, page=2)
+    pg.rows, pg.page, pg.pages, pg.total
+"""
+from dataclasses import dataclass
+
+PAGE_SIZE = 10      # cards per board column
+
+# Sort choices a board offers: label -> row field
+SORTS = {"Symbol": "Symbol", "Price": "Close", "Change %": "Change", "Resistance": "BU", "Support": "BE"}
+
+
+@dataclass
+class BoardPage:
+    rows: list          # this page's rows, sorted
+    page: int           # 0-based, clamped to the last page
+    pages: int          # at least 1, so an empty column still has page 0
+    total: int          # rows in the whole column
+
+
+def sort_rows(rows, sort="Symbol", descending=False):
+    """``rows`` ordered by the :data:`SORTS` field (or row key) ``sort``; missing values last, ties by symbol."""
+    key = SORTS.get(sort, sort)
+    have = [r for r in rows if r.get(key) is not None]
+    have.sort(key=lambda r: r["Symbol"])                    # stable sorts: ties stay in symbol order
+    have.sort(key=lambda r: r[key], reverse=descending)
+    return have + [r for r in rows if r.get(key) is None]
+
+
+def board_page(rows, sort="Symbol", descending=False, page=0, size=PAGE_SIZE):
+    """Page ``page`` of ``rows`` sorted by ``sort``; a page past the end shows the last one."""
+    pages = max(1, -(-len(rows) // size))
+    page = min(max(0, page), pages - 1)
+    ordered = sort_rows(rows, sort, descending)
+    return BoardPage(ordered[page * size:(page + 1) * size], page, pages, len(rows))
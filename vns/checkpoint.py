@@ -0,0 +1,96 @@
+"""Per-symbol checkpoints of the reaction engine state.
+
+After a scan the engine state and the events so far are written next to the
+date range they cover.  The next scan feeds only the bars after that range
+into :func:`vns.engine.resume_reaction`, so a daily run costs O(new bars) per
+symbol.  A checkpoint is used only if the bars it saw are still the first
+bars of the new frame; otherwise the symbol is analysed from scratch.
+"""
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from vns.config import CHECKPOINT_DIR
+from vns.engine import ENGINE_VERSION, EVENT_DTYPE, ReactionState, resume_reaction
+
+
+def checkpoint_path(symbol, key, directory=CHECKPOINT_DIR):
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{symbol}__{key}")
+    return os.path.join(directory, f"{safe}.json")
+
+
+def load_checkpoint(symbol, key, directory=CHECKPOINT_DIR):
+    """The stored checkpoint dict, or None if missing, unreadable or from another engine version."""
+    try:
+        with open(checkpoint_path(symbol, key, directory), 'r') as f: ck = json.load(f)
+    except (OSError, ValueError): return None
+    if ck.get("engine_version") != ENGINE_VERSION: return None
+    return ck
+
+
+def save_checkpoint(symbol, key, df, events, state, directory=CHECKPOINT_DIR):
+    os.makedirs(directory, exist_ok=True)
+    last = df.iloc[-1]
+    ck = {
+        "engine_version": ENGINE_VERSION,
+        "anchor": df['Date'].iloc[0].strftime("%Y-%m-%d"),
+        "last_date": last['Date'].strftime("%Y-%m-%d"),
+        "last_bar": [float(last['High']), float(last['Low'])],
+        "state": state.to_dict(),
+        "events": {f: events[f].tolist() for f in EVENT_DTYPE.names},
+    }
+    path = checkpoint_path(symbol, key, directory)
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f: json.dump(ck, f)
+    os.replace(tmp, path)
+
+
+def checkpoint_anchor(symbol, key, directory=CHECKPOINT_DIR):
+    """First bar date the symbol's checkpoint was built from, or None."""
+    ck = load_checkpoint(symbol, key, directory)
+    return None if ck is None else pd.Timestamp(ck["anchor"])
+
+
+def _resume_offset(ck, df):
+    """Number of leading bars of ``df`` already covered by ``ck`` (0 if it doesn't line up)."""
+    if ck is None: return 0
+    k = ck["state"]["bars"]
+    if k == 0 or k > len(df): return 0
+    dates = df['Date']
+    if dates.iloc[0].strftime("%Y-%m-%d") != ck["anchor"]: return 0
+    if dates.iloc[k - 1].strftime("%Y-%m-%d") != ck["last_date"]: return 0
+    # A revised last bar (e.g. a checkpoint taken intraday) invalidates the state.
+    if [float(df['High'].iloc[k - 1]), float(df['Low'].iloc[k - 1])] != ck["last_bar"]: return 0
+    return k
+
+
+def resume_point(symbol, key, df, seed_reaction=True, directory=CHECKPOINT_DIR):
+    """``(k, events, state)``: bars of ``df`` the checkpoint already covers, with its events and state.
+
+    ``k`` is 0 (and the state fresh) when there is no usable checkpoint.
+    """
+    ck = load_checkpoint(symbol, key, directory)
+    if ck is not None and ck["state"]["seed_reaction"] != seed_reaction: ck = None
+    k = _resume_offset(ck, df)
+    if not k: return 0, np.empty(0, dtype=EVENT_DTYPE), ReactionState(seed_reaction=seed_reaction)
+    events = np.empty(len(ck["events"]["bar"]), dtype=EVENT_DTYPE)
+    for f in EVENT_DTYPE.names: events[f] = ck["events"][f]
+    return k, events, ReactionState.from_dict(ck["state"])
+
+
+def analyze_incremental(symbol, key, df, seed_reaction=True, directory=CHECKPOINT_DIR):
+    """Reaction engine over all of ``df``, resuming from the symbol's checkpoint when possible.
+
+    Returns ``(events, state, resumed_bars)`` exactly as a from-scratch run
+    over ``df`` would (``resumed_bars`` is how many bars were skipped) and
+    writes the new checkpoint.
+    """
+    k, old, state = resume_point(symbol, key, df, seed_reaction, directory)
+    high, low = (df[c].to_numpy(dtype=np.float64)[k:] for c in ('High', 'Low'))
+    new, state = resume_reaction(state, high, low)
+    events = np.concatenate([old, new])
+    save_checkpoint(symbol, key, df, events, state, directory)
+    return events, state, k
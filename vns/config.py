@@ -0,0 +1,20 @@
+"""Filesystem locations for data the engine persists between runs."""
+import os
+
+# Everything lives under one directory so a deployment can point it at a volume.
+DATA_DIR = os.environ.get("VNS_DATA_DIR", "vns_data")
+CHECKPOINT_DIR = os.path.join(DATA_DIR, "checkpoints")
+STORE_DIR = os.path.join(DATA_DIR, "ohlc")
+
+# Market-data source for the store: "yfinance" (live) or "replay" (recorded files in REPLAY_DIR).
+PROVIDER = os.environ.get("VNS_PROVIDER", "yfinance")
+REPLAY_DIR = os.environ.get("VNS_REPLAY_DIR", os.path.join(DATA_DIR, "replay"))
+LATENCY = float(os.environ.get("VNS_LATENCY", "0"))   # seconds injected per provider request (benchmarks)
+
+# Worker processes for a scan's analysis (vns.parallel); 0 or 1 analyses in the scan's own thread.
+SCAN_PROCESSES = int(os.environ.get("VNS_SCAN_PROCESSES", "0"))
+
+# Completed scan results the pages read, and the background scheduler that writes them:
+# "thread" runs it inside the Streamlit server, "off" leaves it to `python -m vns.worker`.
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshots")
+SCHEDULER = os.environ.get("VNS_SCHEDULER", "thread")
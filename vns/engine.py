@@ -0,0 +1,439 @@
+"""Array-backed VNS engine.
+
+High/Low are pulled out of the DataFrame once and the Teji/Mandi/Atak state
+machine runs over plain floats.  Instead of writing label strings back into
+the frame on every bar, the engine returns a compact event array
+(bar index, event code, price, reference bar); pages turn that into BU/BE
+columns only when they render.
+"""
+from dataclasses import asdict, dataclass, replace
+from enum import IntEnum
+
+import numpy as np
+
+from vns.rangeindex import SparseTable
+
+# Bump whenever a change alters engine output; stored checkpoints from an
+# older version are discarded instead of resumed.
+ENGINE_VERSION = 1
+
+# --- EVENT CODES ---
+class Event(IntEnum):
+    """Kind of an engine event; stored as its int8 value in the ``code`` field of :data:`EVENT_DTYPE`."""
+    START_TEJI = 1      # Neutral -> Teji on a new high
+    START_MANDI = 2     # Neutral -> Mandi on a new low
+    NEW_HIGH = 3        # Teji continuation (BU)
+    NEW_LOW = 4         # Mandi continuation (BE)
+    REACTION_SUP = 5    # reaction low of the Teji swing (BE side)
+    REACTION_RES = 6    # reaction high of the Mandi swing (BU side)
+    ATAK_TOP = 7        # last Teji peak, printed on the breakdown bar
+    ATAK_BOT = 8        # last Mandi trough, printed on the breakout bar
+    BREAKDOWN = 9       # Teji -> Mandi reversal (BE)
+    BREAKOUT = 10       # Mandi -> Teji reversal (BU)
+
+
+# Plain ints for the per-bar loops; ``Event(code)`` turns a stored code back into its kind.
+(START_TEJI, START_MANDI, NEW_HIGH, NEW_LOW, REACTION_SUP, REACTION_RES,
+ ATAK_TOP, ATAK_BOT, BREAKDOWN, BREAKOUT) = (int(e) for e in Event)
+
+# Scanner / Classifier "Signal" text of the bar carrying the event
+SIGNALS = {NEW_HIGH: "New High", NEW_LOW: "New Low", BREAKOUT: "Reversal", BREAKDOWN: "Reversal"}
+
+# ``bar`` is the row the label lands on; ``ref`` is the bar whose date the
+# label prints (the confirming bar for swing confirmation, else ``bar``).
+EVENT_DTYPE = np.dtype([("bar", np.int32), ("code", np.int8), ("price", np.float64), ("ref", np.int32)])
+
+
+def _events(bars, codes, prices, refs=None):
+    ev = np.empty(len(bars), dtype=EVENT_DTYPE)
+    ev["bar"], ev["code"], ev["price"] = bars, codes, prices
+    ev["ref"] = bars if refs is None else refs
+    return ev
+
+
+def ohlc_arrays(df, cols=("High", "Low")):
+    """Columns of ``df`` as float64 NumPy arrays, in the order asked for."""
+    return tuple(df[c].to_numpy(dtype=np.float64) for c in cols)
+
+
+@dataclass
+class ReactionState:
+    """Everything the reaction-breakdown engine carries from one bar to the next.
+
+    ``bars`` counts the bars consumed so far, so event indices of a resumed
+    run continue where the previous run stopped.  Round-trips through
+    :meth:`to_dict` / :meth:`from_dict` (plain JSON types).
+    """
+    seed_reaction: bool = True
+    bars: int = 0
+    trend: str = "Neutral"
+    last_peak: float = np.nan
+    last_trough: float = np.nan
+    last_peak_idx: int = 0
+    last_trough_idx: int = 0
+    reaction_support: float = np.nan
+    reaction_resist: float = np.nan
+    swing_low: float = np.nan    # lowest low since last_peak
+    swing_high: float = np.nan   # highest high since last_trough
+    prev_high: float = np.nan
+    prev_low: float = np.nan
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+
+def resume_reaction(state, high, low):
+    """Feed new High/Low bars into a copy of ``state``.
+
+    Returns ``(events, state)``; event bar indices are absolute (they count
+    from the first bar the state ever saw).  Running the bars in one go or
+    across several resumes gives identical events and final state.
+    """
+    s = replace(state)
+    h = np.asarray(high, dtype=np.float64).tolist(); l = np.asarray(low, dtype=np.float64).tolist()
+    bars, codes, prices = [], [], []
+    if not h: return _events(bars, codes, prices), s
+
+    seed_reaction = s.seed_reaction
+    start, off = 0, s.bars
+    if off == 0:
+        s.last_peak, s.last_trough = h[0], l[0]
+        s.reaction_support, s.reaction_resist = l[0], h[0]
+        s.swing_low, s.swing_high = l[0], h[0]
+        s.prev_high, s.prev_low = h[0], l[0]
+        start = 1
+    trend = s.trend
+    last_peak, last_trough = s.last_peak, s.last_trough
+    last_peak_idx, last_trough_idx = s.last_peak_idx, s.last_trough_idx
+    reaction_support, reaction_resist = s.reaction_support, s.reaction_resist
+    swing_low, swing_high = s.swing_low, s.swing_high
+    prev_high, prev_low = s.prev_high, s.prev_low
+
+    for j in range(start, len(h)):
+        c_high, c_low = h[j], l[j]
+        i = off + j
+        if c_low < swing_low: swing_low = c_low
+        if c_high > swing_high: swing_high = c_high
+
+        if trend == "Teji":
+            if c_high > last_peak:
+                reaction_support = swing_low
+                bars += (i, i); codes += (NEW_HIGH, REACTION_SUP); prices += (c_high, reaction_support)
+                last_peak = c_high; last_peak_idx = i; swing_low = c_low
+            elif c_low < reaction_support:
+                bars += (i, i); codes += (ATAK_TOP, BREAKDOWN); prices += (last_peak, c_low)
+                trend = "Mandi"
+                last_trough = c_low; last_trough_idx = i; swing_high = c_high
+                reaction_resist = c_high
+
+        elif trend == "Mandi":
+            if c_low < last_trough:
+                reaction_resist = swing_high
+                bars += (i, i); codes += (NEW_LOW, REACTION_RES); prices += (c_low, reaction_resist)
+                last_trough = c_low; last_trough_idx = i; swing_high = c_high
+            elif c_high > reaction_resist:
+                bars += (i, i); codes += (ATAK_BOT, BREAKOUT); prices += (last_trough, c_high)
+                trend = "Teji"
+                last_peak = c_high; last_peak_idx = i; swing_low = c_low
+                reaction_support = c_low
+
+        else:
+            if c_high > last_peak:
+                trend = "Teji"; bars.append(i); codes.append(START_TEJI); prices.append(c_high)
+                last_peak = c_high; last_peak_idx = i; swing_low = c_low
+                if seed_reaction: reaction_support = prev_low
+            elif c_low < last_trough:
+                trend = "Mandi"; bars.append(i); codes.append(START_MANDI); prices.append(c_low)
+                last_trough = c_low; last_trough_idx = i; swing_high = c_high
+                if seed_reaction: reaction_resist = prev_high
+
+        prev_high, prev_low = c_high, c_low
+
+    s.bars = off + len(h); s.trend = trend
+    s.last_peak, s.last_trough = last_peak, last_trough
+    s.last_peak_idx, s.last_trough_idx = last_peak_idx, last_trough_idx
+    s.reaction_support, s.reaction_resist = reaction_support, reaction_resist
+    s.swing_low, s.swing_high = swing_low, swing_high
+    s.prev_high, s.prev_low = prev_high, prev_low
+    return _events(bars, codes, prices), s
+
+
+def analyze_reaction(high, low, seed_reaction=True):
+    """Run the reaction-breakdown state machine over High/Low arrays.
+
+    ``seed_reaction`` reproduces Home.py, which seeds the opposite reaction
+    level from the previous bar when leaving Neutral; the Scanner and the
+    Classifier leave it at the first bar's value.
+
+    The lowest low since the last peak and the highest high since the last
+    trough are kept as running extremes, so a new high or low costs O(1) no
+    matter how long the swing has lasted.
+
+    Returns ``(events, trend, reaction_resist, reaction_support)``.
+    """
+    events, s = resume_reaction(ReactionState(seed_reaction=seed_reaction), high, low)
+    return events, s.trend, s.reaction_resist, s.reaction_support
+
+
+def analyze_swing(high, low, close):
+    """Swing-confirmation state machine (app.py).
+
+    A top is confirmed when a bar breaks the previous bar's low; the highest
+    high since the last confirmed bottom is then labelled (and vice versa for
+    bottoms).  Those look-backs are O(1) queries on a sparse table built once.
+    The trend flips immediately when the close crosses the active reaction
+    level.
+
+    Returns ``(events, trend, reaction_high, reaction_low)``; each event's
+    ``ref`` is the confirming bar.
+    """
+    n = len(high)
+    bars, codes, prices, refs = [], [], [], []
+    if n == 0: return _events(bars, codes, prices, refs), "Neutral", np.nan, np.nan
+
+    h = np.asarray(high, dtype=np.float64).tolist(); l = np.asarray(low, dtype=np.float64).tolist()
+    c = np.asarray(close, dtype=np.float64).tolist()
+    tops, bottoms = SparseTable(h, "max"), SparseTable(l, "min")
+    trend = "Neutral"
+    last_major_high, last_major_low = h[0], l[0]
+    reaction_low, reaction_high = l[0], h[0]
+    last_bottom_idx = last_top_idx = 0
+
+    def emit(bar, code, price, ref):
+        bars.append(bar); codes.append(code); prices.append(price); refs.append(ref)
+
+    for i in range(1, n):
+        c_h, c_l, c_c = h[i], l[i], c[i]
+
+        # --- 1. CONFIRM A TOP: low broken, label the highest high since the last bottom ---
+        if c_l < l[i - 1]:
+            peak_idx = tops.query(min(last_bottom_idx, i - 1), i); peak_val = h[peak_idx]
+            if trend == "Teji":
+                if peak_val >= last_major_high:
+                    emit(peak_idx, NEW_HIGH, peak_val, i); last_major_high = peak_val
+                else:
+                    emit(peak_idx, ATAK_TOP, peak_val, i)
+                last_top_idx = peak_idx
+            elif trend == "Mandi":
+                emit(peak_idx, REACTION_RES, peak_val, i)
+                reaction_high = peak_val; last_top_idx = peak_idx
+            elif peak_val > last_major_high:
+                trend = "Teji"; emit(peak_idx, START_TEJI, peak_val, i)
+                last_major_high = peak_val; last_top_idx = peak_idx
+
+        # --- 2. CONFIRM A BOTTOM: high crossed, label the lowest low since the last top ---
+        if c_h > h[i - 1]:
+            trough_idx = bottoms.query(min(last_top_idx, i - 1), i); trough_val = l[trough_idx]
+            if trend == "Mandi":
+                if trough_val <= last_major_low:
+                    emit(trough_idx, NEW_LOW, trough_val, i); last_major_low = trough_val
+                else:
+                    emit(trough_idx, ATAK_BOT, trough_val, i)
+                last_bottom_idx = trough_idx
+            elif trend == "Teji":
+                emit(trough_idx, REACTION_SUP, trough_val, i)
+                reaction_low = trough_val; last_bottom_idx = trough_idx
+            elif trough_val < last_major_low:
+                trend = "Mandi"; emit(trough_idx, START_MANDI, trough_val, i)
+                last_major_low = trough_val; last_bottom_idx = trough_idx
+
+        # --- 3. TREND SWITCHING (immediate on close cross) ---
+        if trend == "Teji" and c_c < reaction_low:
+            trend = "Mandi"; last_major_low = c_l
+        if trend == "Mandi" and c_c > reaction_high:
+            trend = "Teji"; last_major_high = c_h
+
+    return _events(bars, codes, prices, refs), trend, reaction_high, reaction_low
+
+
+def analyze_retro(high, low):
+    """Retroactive-marking state machine (New Logic Test page).
+
+    On a reaction breakdown (breakout) the reaction bar and the Atak bar
+    between it and today are marked after the fact; the Atak bar is an O(1)
+    sparse-table query.  As on the page, the reaction index is advanced to
+    the current bar before the breakdown test, so only the continuation and
+    Start labels fire in practice.
+
+    Returns ``(events, trend)``.
+    """
+    n = len(high)
+    bars, codes, prices = [], [], []
+    if n == 0: return _events(bars, codes, prices), "Neutral"
+
+    h = np.asarray(high, dtype=np.float64).tolist(); l = np.asarray(low, dtype=np.float64).tolist()
+    tops, bottoms = SparseTable(h, "max"), SparseTable(l, "min")
+    trend = "Neutral"
+    last_peak, last_trough = h[0], l[0]
+    reaction_low_idx = reaction_high_idx = 0
+
+    def emit(bar, code, price):
+        bars.append(bar); codes.append(code); prices.append(price)
+
+    for i in range(1, n):
+        c_h, c_l = h[i], l[i]
+
+        if trend == "Teji":
+            if c_h > last_peak:
+                emit(i, NEW_HIGH, c_h)
+                last_peak = c_h; reaction_low_idx = i
+            else:
+                if c_l < l[reaction_low_idx]: reaction_low_idx = i
+                reaction_val = l[reaction_low_idx]
+                if c_l < reaction_val:
+                    emit(reaction_low_idx, REACTION_SUP, reaction_val)
+                    if i > reaction_low_idx + 1:
+                        atak_idx = tops.query(reaction_low_idx + 1, i)
+                        emit(atak_idx, ATAK_TOP, h[atak_idx])
+                    emit(i, BREAKDOWN, c_l)
+                    trend = "Mandi"; last_trough = c_l; reaction_high_idx = i
+
+        elif trend == "Mandi":
+            if c_l < last_trough:
+                emit(i, NEW_LOW, c_l)
+                last_trough = c_l; reaction_high_idx = i
+            else:
+                if c_h > h[reaction_high_idx]: reaction_high_idx = i
+                reaction_val = h[reaction_high_idx]
+                if c_h > reaction_val:
+                    emit(reaction_high_idx, REACTION_RES, reaction_val)
+                    if i > reaction_high_idx + 1:
+                        atak_idx = bottoms.query(reaction_high_idx + 1, i)
+                        emit(atak_idx, ATAK_BOT, l[atak_idx])
+                    emit(i, BREAKOUT, c_h)
+                    trend = "Teji"; last_peak = c_h; reaction_low_idx = i
+
+        else:
+            if c_h > last_peak:
+                trend = "Teji"; emit(i, START_TEJI, c_h)
+                last_peak = c_h; reaction_low_idx = i
+            elif c_l < last_trough:
+                trend = "Mandi"; emit(i, START_MANDI, c_l)
+                last_trough = c_l; reaction_high_idx = i
+
+    return _events(bars, codes, prices), trend
+
+
+def analyze_pivot(high, low):
+    """High/Low pivot signals (chatgpttest page).
+
+    A bar whose low breaks the previous low makes the previous high a pivot
+    high (Teji / Atak double top / Reaction when equal), and vice versa for
+    pivot lows.  A second pass adds a Breakout (Breakdown) on the first bar
+    after a newer Mandi (Teji) pivot that reaches the older Teji (Mandi)
+    level; that search is an O(log n) sparse-table lookup.
+
+    Returns the events in display order.  ``ref`` of an Atak / Reaction is
+    the bar of the pivot it was compared with; of a Breakout / Breakdown,
+    the pivot whose level was crossed.
+    """
+    n = len(high)
+    bars, codes, prices, refs = [], [], [], []
+    h = np.asarray(high, dtype=np.float64).tolist(); l = np.asarray(low, dtype=np.float64).tolist()
+    last_teji = last_mandi = None  # bar of the last Teji high / Mandi low pivot
+
+    def emit(bar, code, price, ref):
+        bars.append(bar); codes.append(code); prices.append(price); refs.append(ref)
+
+    # ---------- 1st pass: Teji / Mandi / Atak / Reaction ----------
+    for i in range(1, n):
+        y = i - 1
+        if l[i] < l[y]:
+            p = h[y]
+            if last_teji is None: emit(y, START_TEJI, p, y); last_teji = y
+            elif p > h[last_teji]: emit(y, NEW_HIGH, p, last_teji); last_teji = y
+            elif p < h[last_teji]: emit(y, ATAK_TOP, p, last_teji)
+            else: emit(y, REACTION_RES, p, last_teji)
+        if h[i] > h[y]:
+            p = l[y]
+            if last_mandi is None: emit(y, START_MANDI, p, y); last_mandi = y
+            elif p < l[last_mandi]: emit(y, NEW_LOW, p, last_mandi); last_mandi = y
+            elif p > l[last_mandi]: emit(y, ATAK_BOT, p, last_mandi)
+            else: emit(y, REACTION_SUP, p, last_mandi)
+    if not bars: return _events(bars, codes, prices, refs)
+
+    # The page sorted signals by date with pandas' default (unstable)
+    # quicksort; running the bar numbers through the same datetime64 sort
+    # kernel keeps same-day signals in the order the page always showed.
+    ev = _events(bars, codes, prices, refs)
+    ev = ev[_date_order(ev["bar"])]
+
+    # ---------- 2nd pass: Breakout / Breakdown ----------
+    tops, bottoms = SparseTable(h, "max"), SparseTable(l, "min")
+    extra = []
+    teji_k = mandi_k = None
+    ev_list = ev.tolist()
+    for k, (bar, code, price, ref) in enumerate(ev_list):
+        if code in (START_TEJI, NEW_HIGH): teji_k = k
+        if code in (START_MANDI, NEW_LOW): mandi_k = k
+        if teji_k is None or mandi_k is None: continue
+        t_bar, t_price = ev_list[teji_k][0], ev_list[teji_k][2]
+        m_bar, m_price = ev_list[mandi_k][0], ev_list[mandi_k][2]
+        if t_bar < m_bar:
+            j = tops.find_first(m_bar + 1, t_price)
+            if j is not None: extra.append((j, BREAKOUT, t_price, t_bar)); teji_k = mandi_k = None
+        elif m_bar < t_bar:
+            j = bottoms.find_first(t_bar + 1, m_price)
+            if j is not None: extra.append((j, BREAKDOWN, m_price, m_bar)); teji_k = mandi_k = None
+
+    if extra:
+        ev = np.concatenate([ev, _events(*zip(*extra))])
+        ev = ev[_date_order(ev["bar"])]
+    return ev
+
+
+def _date_order(bars):
+    return np.argsort(bars.astype("datetime64[D]"), kind="quicksort")
+
+
+def label_columns(dates, events, labels, n=None, fill=""):
+    """Replay ``events`` into BU / BE / Type / Signal string columns.
+
+    ``labels`` maps an event code to ``(column, template, type)`` where column
+    is ``"BU"`` or ``"BE"`` and type is the row colour key or ``None`` to leave
+    it untouched.  Templates may use ``{price}``, ``{DATE}`` (upper-case
+    ``DD-MON`` of the event's reference bar) and ``{date}`` (its Timestamp,
+    e.g. ``{date:%d-%b}``).  Later events win, exactly like the old ``df.at``
+    writes did.  Bars without a label hold ``fill``.
+    """
+    n = len(dates) if n is None else n
+    cols = {"BU": [fill] * n, "BE": [fill] * n, "Type": [""] * n, "Signal": [""] * n}
+    for bar, code, price, ref in events.tolist():
+        col, tmpl, typ = labels[code]
+        if "DATE" in tmpl or "date" in tmpl:
+            d = dates[ref]; text = tmpl.format(date=d, DATE=d.strftime('%d-%b').upper(), price=price)
+        else:
+            text = tmpl.format(price=price)
+        cols[col][bar] = text
+        if typ: cols["Type"][bar] = typ
+        if code in SIGNALS: cols["Signal"][bar] = SIGNALS[code]
+    return cols
+
+
+def event_codes(events, labels, n):
+    """Per-bar ``{"BU": codes, "BE": codes}`` int8 arrays (0 = no event), later events winning like :func:`label_columns`."""
+    out = {"BU": np.zeros(n, np.int8), "BE": np.zeros(n, np.int8)}
+    for bar, code, _, _ in events.tolist(): out[labels[code][0]][bar] = code
+    return out
+
+
+def events_since(events, first):
+    """The events from bar ``first`` on, with ``bar`` and ``ref`` counted from there."""
+    ev = events[events["bar"] >= first].copy()
+    ev["bar"] -= first; ev["ref"] -= first
+    return ev
+
+
+def history_records(df, cols, fields=("BU", "BE", "Signal", "Type"), first=1):
+    """Per-bar dicts from bar ``first`` on, in the shape the scan JSON files store."""
+    dates = df['Date'].iloc[first:].dt.strftime('%d-%b-%Y').tolist()
+    o, h, l, c = (df[k].iloc[first:].tolist() for k in ('Open', 'High', 'Low', 'Close'))
+    extra = [cols[f][first:] for f in fields]
+    return [
+        {'Date': dates[i], 'Open': o[i], 'High': h[i], 'Low': l[i], 'Close': c[i], **{f: x[i] for f, x in zip(fields, extra)}}
+        for i in range(len(dates))
+    ]
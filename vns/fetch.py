@@ -0,0 +1,267 @@
+"""Universe fetch: bring many symbols' stored OHLC up to date in batched downloads.
+
+The scans used to call ``yf.download`` once per symbol with a sleep in between.
+Here every symbol first asks the store what it is missing
+(:func:`vns.store.plan`).  Symbols missing the same range -- on a daily scan
+that is nearly all of them -- share one ``download_many`` request to the
+active provider (:mod:`vns.providers`) per ``batch_size`` tickers, and each
+symbol's frame is handed to the store.  A failed batch or an empty symbol is reported in
+``failed`` without stopping the rest.
+
+Batches run on a small thread pool behind a token-bucket rate limit that backs
+off when Yahoo starts throttling, and land one by one (:func:`iter_universe`)
+so the scans can analyse each batch while the next ones download.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from vns import store
+from vns.config import STORE_DIR
+from vns.providers import get_provider, normalize_ohlc
+from vns.singleflight import FETCHES
+
+BATCH_SIZE = 20     # tickers per download; a batch is also the unit that lands for analysis
+WORKERS = 8         # batches downloading at once
+RATE = 30.0         # ticker requests per second, before backoff
+RETRIES = 2         # re-sends of a throttled or all-empty batch
+
+
+@dataclass
+class UniverseFetch:
+    frames: dict = field(default_factory=dict)    # symbol -> OHLC frame for the requested range
+    failed: dict = field(default_factory=dict)    # symbol -> reason; stored bars, if any, are still in frames
+    requests: int = 0                             # network round trips made
+
+
+# --- RATE LIMIT ---
+class TokenBucket:
+    """``rate`` tokens a second, up to ``burst`` saved up; :meth:`acquire` blocks until enough are free.
+
+    One token is one ticker request to Yahoo.  Thread-safe; the rate can be
+    changed while workers are waiting (see :class:`Backoff`).
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate, self.burst = float(rate), float(burst or max(1.0, rate))
+        self.tokens, self._clock, self._sleep = self.burst, clock, sleep
+        self._last = clock(); self._lock = threading.Lock()
+
+    def _refill(self):
+        t = self._clock()
+        self.tokens = min(self.burst, self.tokens + (t - self._last) * self.rate); self._last = t
+
+    def set_rate(self, rate):
+        with self._lock: self._refill(); self.rate = float(rate)
+
+    def acquire(self, n=1, cancel=None):
+        """Take ``n`` tokens; False if ``cancel()`` turned true while waiting for them."""
+        n = min(float(n), self.burst)          # a batch bigger than the burst drains the bucket and goes
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= n: self.tokens -= n; return True
+                short = (n - self.tokens) / self.rate
+            if cancel is not None and cancel(): return False
+            self._sleep(min(short, 0.5))       # the rate may change meanwhile
+
+
+class Throttled(Exception):
+    """Yahoo kept throttling, so the fetch stopped sending requests; stored bars, if any, are served."""
+
+
+class Backoff:
+    """Adaptive rate: halve the bucket on throttling, win it back step by step on success (AIMD).
+
+    After ``patience`` throttled batches in a row with no success in between,
+    Yahoo is treated as down and the rest of the fetch gives up at once.
+    """
+
+    def __init__(self, bucket, floor=0.5, step=1.0, base=1.0, cap=30.0, patience=4, clock=time.monotonic):
+        self.bucket, self.target = bucket, bucket.rate
+        self.floor, self.step, self.base, self.cap, self.patience = floor, step, base, cap, patience
+        self.streak = 0; self._cut = -float("inf"); self._clock = clock; self._lock = threading.Lock()
+
+    @property
+    def exhausted(self):
+        return self.streak >= self.patience
+
+    def throttled(self, attempt):
+        """Slow every worker down; returns how long the throttled one should wait before retrying."""
+        with self._lock:
+            self.streak += 1
+            if self._clock() - self._cut >= self.base:     # workers throttled together count as one cut
+                self._cut = self._clock(); self.bucket.set_rate(max(self.floor, self.bucket.rate / 2))
+        return min(self.cap, self.base * 2 ** attempt)
+
+    def ok(self):
+        with self._lock:
+            self.streak = 0
+            if self.bucket.rate < self.target: self.bucket.set_rate(min(self.target, self.bucket.rate + self.step))
+
+
+def looks_throttled(exc):
+    """Whether a download error is Yahoo pushing back (HTTP 429 / rate limit) rather than a hard failure."""
+    text = f"{type(exc).__name__} {exc}".lower()
+    return "ratelimit" in text or "rate limit" in text or "too many requests" in text or "429" in text
+
+
+@dataclass
+class FetchStats:
+    """Live counters of a running fetch, safe to read from the page while workers update them."""
+    workers: int = 0
+    in_flight: int = 0           # downloads running right now
+    calls: int = 0               # download_many calls (batches, retries included)
+    tickers: int = 0             # ticker requests sent to Yahoo
+    throttled: int = 0           # batches re-sent after a rate-limit error or an all-empty result
+    rate: float = 0.0            # current token-bucket rate (tickers/s)
+    window: float = 5.0
+    _done: deque = field(default_factory=deque, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def begin(self, n):
+        with self._lock: self.in_flight += 1; self.calls += 1; self.tickers += n
+
+    def end(self, n):
+        t = time.monotonic()
+        with self._lock: self.in_flight -= 1; self._done.append((t, n))
+
+    def backoff(self, rate):
+        with self._lock: self.throttled += 1; self.rate = rate
+
+    def requests_per_s(self):
+        """Ticker requests completed per second over the last ``window`` seconds."""
+        t = time.monotonic()
+        with self._lock:
+            while self._done and self._done[0][0] < t - self.window: self._done.popleft()
+            return sum(n for _, n in self._done) / self.window
+
+    def summary(self):
+        return (f"⚡ {self.in_flight}/{self.workers} fetching · {self.requests_per_s():.1f} req/s"
+                f" (limit {self.rate:.1f}) · {self.tickers} requests" + (f" · {self.throttled} throttled" if self.throttled else ""))
+
+
+# --- EXECUTOR ---
+@dataclass
+class Landed:
+    """One finished fetch job: frames ready for analysis and the symbols that failed."""
+    frames: dict
+    failed: dict
+    requests: int = 0
+
+
+def _jobs(symbols, starts, end, batch_size, directory, now):
+    # Symbols missing the same ranges share a job; up-to-date symbols need no download at all.
+    fresh, wanted = [], defaultdict(list)
+    for sym in symbols:
+        reqs = tuple(store.plan(sym, starts[sym], end, directory, now=now))
+        if reqs: wanted[reqs].append(sym)
+        else: fresh.append(sym)
+    jobs = [(reqs, syms[i:i + batch_size]) for reqs, syms in wanted.items() for i in range(0, len(syms), batch_size)]
+    return fresh, jobs
+
+
+def iter_universe(symbols, start, end=None, batch_size=BATCH_SIZE, workers=WORKERS, rate=RATE, burst=None,
+                  retries=RETRIES, directory=STORE_DIR, download_many=None, stats=None, progress=None,
+                  tick=0.5, now=None, sleep=time.sleep):
+    """Refresh ``symbols`` in the store on a thread pool and yield a :class:`Landed` per finished job.
+
+    ``start`` is one date or a ``{symbol: date}`` dict.  Symbols already up to
+    date land first, then each batch as soon as its download and store update
+    finish, so the caller can analyse while the rest is still in flight.
+    Batches share a :class:`TokenBucket` of ``rate`` ticker requests/s; a
+    rate-limit error or an all-empty batch halves the rate and retries after
+    an exponential wait, up to ``retries`` times; see :class:`Backoff` for
+    when it gives up.  ``progress(done, total)`` is
+    called from the caller's thread on every landing and every ``tick`` seconds.
+    """
+    now = now or datetime.now(timezone.utc)
+    download_many = download_many or get_provider().download_many
+    starts = start if isinstance(start, dict) else dict.fromkeys(symbols, start)
+    bucket = TokenBucket(rate, burst or batch_size)
+    backoff = Backoff(bucket, floor=rate / 8)
+    stats = stats if stats is not None else FetchStats()
+    stats.workers, stats.rate = workers, bucket.rate
+
+    def request(chunk, a, b):
+        for attempt in range(retries + 1):
+            if backoff.exhausted or not bucket.acquire(len(chunk), cancel=lambda: backoff.exhausted):
+                raise Throttled("Yahoo is throttling; not requested this scan")
+            stats.begin(len(chunk))
+            try: frames = download_many(chunk, a, b)
+            except Exception as e:
+                if not looks_throttled(e) or attempt == retries: raise
+                frames = None
+            finally: stats.end(len(chunk))
+            # The tail request re-reads the last stored bar, so an all-empty batch is Yahoo failing, not a holiday.
+            if frames is not None and any(not df.empty for df in frames.values()):
+                backoff.ok(); stats.rate = bucket.rate
+                return frames
+            if attempt == retries: return frames
+            pause = backoff.throttled(attempt); stats.backoff(bucket.rate)
+            sleep(pause)
+
+    def shared(chunk, a, b):
+        # Another session fetching the same batch (same universe, same plan) shares this one's download
+        return FETCHES.do(("batch", tuple(chunk), a, b, download_many), request, chunk, a, b)
+
+    def run(reqs, chunk):
+        got, failed, calls = {}, {}, 0
+        for a, b in reqs:
+            calls += 1
+            try: frames = shared(chunk, a, b)
+            except Exception as e:
+                frames = dict.fromkeys(chunk, e)
+                failed.update(dict.fromkeys(chunk, f"{type(e).__name__}: {e}"))
+            for sym in chunk: got[(sym, a, b)] = frames.get(sym, normalize_ohlc(None))
+
+        def download(sym, a, b):
+            nonlocal calls
+            res = got.pop((sym, a, b), None)
+            if res is None:   # not planned (e.g. a full re-download after a split): fetch it alone
+                calls += 1
+                res = request([sym], a, b)[sym]
+            if isinstance(res, Exception): raise res
+            return res
+
+        out = {}
+        for sym in chunk:
+            try: df = store.get_ohlc(sym, starts[sym], end, directory, download=download, now=now)
+            except Exception as e: failed[sym] = f"{type(e).__name__}: {e}"; continue
+            if df is None: failed.setdefault(sym, "no data")
+            else: out[sym] = df
+        return Landed(out, failed, calls)
+
+    fresh, jobs = _jobs(symbols, starts, end, batch_size, directory, now)
+    total, done = len(symbols), 0
+    if fresh:
+        landed = run((), fresh); done += len(fresh)
+        if progress: progress(done, total)
+        yield landed
+    if not jobs: return
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vns-fetch")
+    try:
+        pending = {pool.submit(run, reqs, chunk): chunk for reqs, chunk in jobs}
+        while pending:
+            finished, _ = wait(pending, timeout=tick, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                done += len(pending.pop(fut))
+                if progress: progress(done, total)
+                yield fut.result()
+            if not finished and progress: progress(done, total)
+    finally: pool.shutdown(wait=True, cancel_futures=True)
+
+
+def fetch_universe(symbols, start, end=None, batch_size=BATCH_SIZE, directory=STORE_DIR,
+                   download_many=None, progress=None, now=None, **executor):
+    """Refresh ``symbols`` in the store and return all their frames at once (see :func:`iter_universe`)."""
+    out = UniverseFetch()
+    for landed in iter_universe(symbols, start, end, batch_size, directory=directory, download_many=download_many,
+                                progress=progress, now=now, **executor):
+        out.frames.update(landed.frames); out.failed.update(landed.failed); out.requests += landed.requests
+    out.frames = {sym: out.frames[sym] for sym in symbols if sym in out.frames}
+    return out
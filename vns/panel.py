@@ -0,0 +1,185 @@
+"""Panel (symbols x days) batch engine for whole-universe scans.
+
+Instead of running the reaction-breakdown state machine once per symbol, all
+symbols advance together one trading day at a time: the state lives in
+per-symbol arrays and the Teji / Mandi / Neutral branches are vectorized
+masks.  Results are identical to :func:`vns.engine.resume_reaction` run on
+each symbol's own frame.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from vns.checkpoint import CHECKPOINT_DIR, resume_point, save_checkpoint
+from vns.engine import (
+    ATAK_BOT, ATAK_TOP, BREAKDOWN, BREAKOUT, EVENT_DTYPE, NEW_HIGH, NEW_LOW,
+    REACTION_RES, REACTION_SUP, START_MANDI, START_TEJI, ReactionState,
+)
+
+TREND_NAMES = ("Neutral", "Teji", "Mandi")
+_NEUTRAL, _TEJI, _MANDI = range(3)
+_FLOAT_FIELDS = (
+    "last_peak", "last_trough", "reaction_support", "reaction_resist",
+    "swing_low", "swing_high", "prev_high", "prev_low",
+)
+_INT_FIELDS = ("bars", "last_peak_idx", "last_trough_idx")
+
+
+@dataclass
+class PanelResult:
+    """Final per-symbol state arrays plus each symbol's event array."""
+    events: list
+    trend: np.ndarray           # codes into TREND_NAMES
+    reaction_resist: np.ndarray
+    reaction_support: np.ndarray
+    _state: dict
+
+    def trend_name(self, k):
+        return TREND_NAMES[self.trend[k]]
+
+    def state(self, k):
+        """Symbol ``k``'s final state as a :class:`ReactionState`, ready to resume."""
+        st = self._state
+        return ReactionState(
+            seed_reaction=bool(st["seed_reaction"][k]), trend=TREND_NAMES[self.trend[k]],
+            **{f: float(st[f][k]) for f in _FLOAT_FIELDS}, **{f: int(st[f][k]) for f in _INT_FIELDS},
+        )
+
+
+def analyze_panel(high, low, present=None, states=None, seed_reaction=True):
+    """Advance every symbol's reaction engine over aligned ``(symbols, days)`` arrays.
+
+    ``present`` marks which cells are real bars of that symbol (default: not
+    NaN); absent cells are skipped and don't count as bars.  ``states``
+    optionally gives each symbol's starting :class:`ReactionState`.
+    Event bar indices count the symbol's own bars, as in the single engine.
+    """
+    high = np.asarray(high, dtype=np.float64); low = np.asarray(low, dtype=np.float64)
+    n_sym, n_days = high.shape
+    if present is None: present = ~(np.isnan(high) | np.isnan(low))
+    if states is None: states = [ReactionState(seed_reaction=seed_reaction)] * n_sym
+
+    st = {f: np.array([getattr(s, f) for s in states], dtype=np.float64) for f in _FLOAT_FIELDS}
+    st.update({f: np.array([getattr(s, f) for s in states], dtype=np.int64) for f in _INT_FIELDS})
+    st["seed_reaction"] = np.array([s.seed_reaction for s in states], dtype=bool)
+    trend = np.array([TREND_NAMES.index(s.trend) for s in states], dtype=np.int8)
+    last_peak, last_trough = st["last_peak"], st["last_trough"]
+    peak_idx, trough_idx, count = st["last_peak_idx"], st["last_trough_idx"], st["bars"]
+    rsup, rres = st["reaction_support"], st["reaction_resist"]
+    swing_low, swing_high = st["swing_low"], st["swing_high"]
+    prev_high, prev_low, seed = st["prev_high"], st["prev_low"], st["seed_reaction"]
+
+    ev_sym, ev_bar, ev_code, ev_price = [], [], [], []
+
+    def emit(mask, code, price):
+        where = np.flatnonzero(mask)
+        if where.size:
+            ev_sym.append(where); ev_bar.append(count[where])
+            ev_code.append(np.full(where.size, code, dtype=np.int8)); ev_price.append(price[where])
+
+    for t in range(n_days):
+        ch, cl, valid = high[:, t], low[:, t], present[:, t]
+
+        first = valid & (count == 0)
+        if first.any():
+            last_peak[first] = rres[first] = swing_high[first] = ch[first]
+            last_trough[first] = rsup[first] = swing_low[first] = cl[first]
+
+        act = valid & (count > 0)
+        m = act & (cl < swing_low); swing_low[m] = cl[m]
+        m = act & (ch > swing_high); swing_high[m] = ch[m]
+
+        teji, mandi, neut = act & (trend == _TEJI), act & (trend == _MANDI), act & (trend == _NEUTRAL)
+        t_hi = teji & (ch > last_peak); t_bd = teji & ~t_hi & (cl < rsup)
+        m_lo = mandi & (cl < last_trough); m_bo = mandi & ~m_lo & (ch > rres)
+        n_up = neut & (ch > last_peak); n_dn = neut & ~n_up & (cl < last_trough)
+
+        # TEJI: continuation / breakdown
+        if t_hi.any():
+            rsup[t_hi] = swing_low[t_hi]
+            emit(t_hi, NEW_HIGH, ch); emit(t_hi, REACTION_SUP, rsup)
+            last_peak[t_hi] = ch[t_hi]; peak_idx[t_hi] = count[t_hi]; swing_low[t_hi] = cl[t_hi]
+        if t_bd.any():
+            emit(t_bd, ATAK_TOP, last_peak); emit(t_bd, BREAKDOWN, cl)
+            trend[t_bd] = _MANDI
+            last_trough[t_bd] = cl[t_bd]; trough_idx[t_bd] = count[t_bd]; swing_high[t_bd] = rres[t_bd] = ch[t_bd]
+
+        # MANDI: continuation / breakout
+        if m_lo.any():
+            rres[m_lo] = swing_high[m_lo]
+            emit(m_lo, NEW_LOW, cl); emit(m_lo, REACTION_RES, rres)
+            last_trough[m_lo] = cl[m_lo]; trough_idx[m_lo] = count[m_lo]; swing_high[m_lo] = ch[m_lo]
+        if m_bo.any():
+            emit(m_bo, ATAK_BOT, last_trough); emit(m_bo, BREAKOUT, ch)
+            trend[m_bo] = _TEJI
+            last_peak[m_bo] = ch[m_bo]; peak_idx[m_bo] = count[m_bo]; swing_low[m_bo] = rsup[m_bo] = cl[m_bo]
+
+        # NEUTRAL: first trend
+        if n_up.any():
+            trend[n_up] = _TEJI; emit(n_up, START_TEJI, ch)
+            last_peak[n_up] = ch[n_up]; peak_idx[n_up] = count[n_up]; swing_low[n_up] = cl[n_up]
+            m = n_up & seed; rsup[m] = prev_low[m]
+        if n_dn.any():
+            trend[n_dn] = _MANDI; emit(n_dn, START_MANDI, cl)
+            last_trough[n_dn] = cl[n_dn]; trough_idx[n_dn] = count[n_dn]; swing_high[n_dn] = ch[n_dn]
+            m = n_dn & seed; rres[m] = prev_high[m]
+
+        prev_high[valid] = ch[valid]; prev_low[valid] = cl[valid]
+        count[valid] += 1
+
+    if ev_sym:
+        sym = np.concatenate(ev_sym)
+        order = np.argsort(sym, kind="stable")  # per symbol, keeps time / emission order
+        ev = np.empty(sym.size, dtype=EVENT_DTYPE)
+        ev["bar"] = np.concatenate(ev_bar)[order]; ev["code"] = np.concatenate(ev_code)[order]
+        ev["price"] = np.concatenate(ev_price)[order]; ev["ref"] = ev["bar"]
+        events = np.split(ev, np.cumsum(np.bincount(sym, minlength=n_sym))[:-1])
+    else:
+        events = [np.empty(0, dtype=EVENT_DTYPE) for _ in range(n_sym)]
+    return PanelResult(events, trend, rres, rsup, st)
+
+
+def panel_from_frames(frames):
+    """Align per-symbol OHLC frames on the union of their dates.
+
+    Returns ``(symbols, dates, high, low, present)`` with ``(symbols, days)``
+    arrays; ``present`` marks the rows each symbol's frame actually has.
+    """
+    symbols = list(frames)
+    if not symbols: return symbols, pd.DatetimeIndex([]), np.empty((0, 0)), np.empty((0, 0)), np.empty((0, 0), bool)
+    stamps = [f['Date'].to_numpy(dtype="datetime64[ns]") for f in frames.values()]
+    days = np.unique(np.concatenate(stamps))
+    shape = (len(symbols), len(days))
+    high, low = np.full(shape, np.nan), np.full(shape, np.nan)
+    present = np.zeros(shape, dtype=bool)
+    for k, (f, ts) in enumerate(zip(frames.values(), stamps)):
+        pos = np.searchsorted(days, ts)
+        high[k, pos] = f['High'].to_numpy(dtype=np.float64); low[k, pos] = f['Low'].to_numpy(dtype=np.float64)
+        present[k, pos] = True
+    dates = pd.DatetimeIndex(days)
+    return symbols, dates, high, low, present
+
+
+def analyze_frames(frames, seed_reaction=True, checkpoint_key=None, directory=CHECKPOINT_DIR):
+    """Reaction engine for a whole universe ``{symbol: df}`` in one panel pass.
+
+    With ``checkpoint_key`` each symbol resumes from its checkpoint (see
+    :mod:`vns.checkpoint`) and only its new bars enter the panel; the
+    checkpoints are rewritten afterwards.  Returns ``{symbol: (events, state)}``.
+    """
+    resumed = {}
+    for sym, df in frames.items():
+        if checkpoint_key is None: resumed[sym] = (0, np.empty(0, dtype=EVENT_DTYPE), ReactionState(seed_reaction=seed_reaction))
+        else: resumed[sym] = resume_point(sym, checkpoint_key, df, seed_reaction, directory)
+
+    new_bars = {sym: df.iloc[resumed[sym][0]:] for sym, df in frames.items()}
+    symbols, _, high, low, present = panel_from_frames(new_bars)
+    res = analyze_panel(high, low, present, states=[resumed[s][2] for s in symbols])
+
+    out = {}
+    for k, sym in enumerate(symbols):
+        events, state = np.concatenate([resumed[sym][1], res.events[k]]), res.state(k)
+        if checkpoint_key is not None and len(frames[sym]): save_checkpoint(sym, checkpoint_key, frames[sym], events, state, directory)
+        out[sym] = (events, state)
+    return out
@@ -0,0 +1,134 @@
+"""Process-pool analysis: spread a scan's engine passes across CPU cores.
+
+The batch engine and the row building behind the boards run in the scan's own
+thread, so a scan uses one core however many the server has.  With
+``processes`` > 1 each landed batch is split into chunks that a pool of worker
+processes analyses while the next batches download.
+
+Chunks travel as a few flat NumPy arrays (:func:`pack`) -- dates as
+datetime64 in the frames' own unit, Open/High/Low/Close as one float64 block,
+plus each symbol's offset -- rather than pickled DataFrames, and come back as the rows the
+snapshot stores.  The scan merges them in universe order, so the result is
+the same whichever worker finishes first.
+"""
+import importlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from vns.config import SCAN_PROCESSES
+
+CHUNK = 32          # fewest symbols per task, so the batch engine still gets a panel to vectorise over
+PRICES = ["Open", "High", "Low", "Close"]
+
+
+def pack(frames):
+    """``{symbol: df}`` as ``(symbols, offsets, dates, prices)`` flat arrays; :func:`unpack` reverses it."""
+    symbols = list(frames)
+    sizes = [len(frames[s]) for s in symbols]
+    offsets = np.zeros(len(symbols) + 1, dtype=np.int64); np.cumsum(sizes, out=offsets[1:])
+    if not symbols: return symbols, offsets, np.empty(0, "datetime64[ns]"), np.empty((0, 4))
+    # Dates keep their unit, so the history bars a worker stores match an in-thread scan's
+    dates = np.concatenate([frames[s]['Date'].to_numpy() for s in symbols])
+    prices = np.concatenate([frames[s][PRICES].to_numpy(dtype=np.float64) for s in symbols])
+    return symbols, offsets, dates, prices
+
+
+def unpack(symbols, offsets, dates, prices):
+    out = {}
+    for k, sym in enumerate(symbols):
+        a, b = offsets[k], offsets[k + 1]
+        df = pd.DataFrame(prices[a:b], columns=PRICES)
+        df.insert(0, 'Date', dates[a:b])
+        out[sym] = df
+    return out
+
+
+def _run_packed(fn, packed, args):
+    # Worker side: rebuild the frames and run the scan's analysis on them
+    return fn(unpack(*packed), *args)
+
+
+# --- POOL ---
+# One pool per server process, kept between scans so workers start once.  "spawn" because
+# Streamlit runs scans in threads, and forking a threaded process can copy held locks.
+# A scan holds the pool it started on (:func:`_acquire`) until its results are in, so a
+# new size replaces the pool without cancelling anyone's work: the old one shuts down
+# once its last scan lets go.
+_pool = None
+_pool_size = 0
+_pool_users = {}            # pool -> scans still using it
+_pool_lock = threading.Lock()
+
+
+def _retire(pool):
+    # Caller holds _pool_lock
+    if pool is not None and pool is not _pool and not _pool_users.get(pool): pool.shutdown(wait=False)
+
+
+def get_pool(processes=SCAN_PROCESSES):
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != processes:
+            old = _pool
+            _pool = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=importlib.import_module, initargs=("vns.scans",))
+            _pool_size = processes
+            _retire(old)
+        return _pool
+
+
+def _acquire(processes):
+    pool = get_pool(processes)
+    with _pool_lock: _pool_users[pool] = _pool_users.get(pool, 0) + 1
+    return pool
+
+
+def _release(pool):
+    with _pool_lock:
+        _pool_users[pool] -= 1
+        if not _pool_users[pool]: del _pool_users[pool]; _retire(pool)
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock: pool, _pool = _pool, None
+    if pool is not None: pool.shutdown(wait=True)
+
+
+class Analyzer:
+    """Runs ``fn(frames, *args) -> {key: [rows]}`` on landed batches, in-thread or on the pool.
+
+    :meth:`submit` returns at once in pool mode; :meth:`results` waits for
+    every chunk and merges the row lists per key.  ``fn`` must be a
+    module-level function so workers can import it.  Use it in a ``with``
+    block: leaving it lets go of the pool.
+    """
+
+    def __init__(self, fn, processes=SCAN_PROCESSES, chunk=CHUNK):
+        self.fn, self.chunk, self.processes = fn, chunk, processes
+        self.pool = _acquire(processes) if processes > 1 else None
+        self._futures, self._done = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.pool is not None: _release(self.pool); self.pool = None
+
+    def submit(self, frames, *args):
+        if self.pool is None: self._done.append(self.fn(frames, *args)); return
+        symbols = list(frames)
+        size = max(self.chunk, -(-len(symbols) // self.processes))    # one task per process for a big landing
+        for i in range(0, len(symbols), size):
+            part = {s: frames[s] for s in symbols[i:i + size]}
+            self._futures.append(self.pool.submit(_run_packed, self.fn, pack(part), args))
+
+    def results(self):
+        merged = {}
+        for out in self._done + [f.result() for f in self._futures]:
+            for key, rows in out.items(): merged.setdefault(key, []).extend(rows)
+        return merged
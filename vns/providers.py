@@ -0,0 +1,187 @@
+"""Market-data providers: where the store gets daily bars from.
+
+The store (:mod:`vns.store`) and the universe fetch (:mod:`vns.fetch`) never
+call Yahoo themselves; they ask the active provider::
+
+    vns.get_provider().download_many(["TCS", "INFY"], start, end)
+
+* :class:`YFinanceProvider` -- live Yahoo Finance (the default);
+* :class:`ReplayProvider` -- recorded OHLC files from a directory, no network;
+* :class:`LatencyProvider` -- wraps another provider and sleeps a
+  deterministic, seeded delay per request, to measure fetch concurrency.
+
+The pages pick one up from the environment (``VNS_PROVIDER=replay``,
+``VNS_REPLAY_DIR``, ``VNS_LATENCY``; see :mod:`vns.config`), so a scan can
+be replayed on a machine without network access.
+"""
+import os
+import random
+import re
+import threading
+import time
+
+import pandas as pd
+
+from vns.config import LATENCY, PROVIDER, REPLAY_DIR
+
+COLUMNS = ["Date", "Open", "High", "Low", "Close", "Adj Close", "Volume"]
+PRICES = ["Open", "High", "Low", "Close"]
+
+
+def normalize_ohlc(raw):
+    """A yfinance frame as ``COLUMNS``: flat columns, naive ``Date``, float prices, sorted, one row per day."""
+    if raw is None or raw.empty: return pd.DataFrame(columns=COLUMNS)
+    df = raw.copy()
+    if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
+    if 'Date' not in df.columns: df = df.reset_index().rename(columns={df.index.name or 'index': 'Date'})
+    df['Date'] = pd.to_datetime(df['Date'])
+    if df['Date'].dt.tz is not None: df['Date'] = df['Date'].dt.tz_localize(None)
+    df['Date'] = df['Date'].dt.normalize()
+    if 'Adj Close' not in df.columns: df['Adj Close'] = df['Close']
+    if 'Volume' not in df.columns: df['Volume'] = 0
+    df = df[COLUMNS].astype({c: float for c in COLUMNS[1:]}).rename_axis(columns=None)
+    return df.dropna(subset=PRICES).drop_duplicates('Date', keep='last').sort_values('Date').reset_index(drop=True)
+
+
+def _between(df, start, end):
+    # Yahoo semantics: [start, end), end None = latest
+    lo = df['Date'].searchsorted(pd.Timestamp(start))
+    hi = len(df) if end is None else df['Date'].searchsorted(pd.Timestamp(end))
+    return df.iloc[lo:hi].reset_index(drop=True)
+
+
+# --- PROVIDERS ---
+class Provider:
+    """Daily NSE bars for ``[start, end)`` as :func:`normalize_ohlc` frames (empty if none).
+
+    Subclasses implement :meth:`download_many`; :meth:`download` is its
+    one-symbol case.  Both may be called from several threads at once.
+    """
+    name = "provider"
+
+    def download(self, symbol, start, end=None):
+        return self.download_many([symbol], start, end)[symbol]
+
+    def download_many(self, symbols, start, end=None):
+        """``{symbol: frame}`` for every symbol asked for."""
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class YFinanceProvider(Provider):
+    """Live Yahoo Finance, ``<SYMBOL>.NS`` tickers, unadjusted prices plus Adj Close."""
+    name = "yfinance"
+
+    def download(self, symbol, start, end=None):
+        import yfinance as yf
+        return normalize_ohlc(yf.download(f"{symbol}.NS", start=start, end=end, progress=False, auto_adjust=False))
+
+    def download_many(self, symbols, start, end=None):
+        """One multi-ticker request, split back per symbol."""
+        import yfinance as yf
+        raw = yf.download([f"{s}.NS" for s in symbols], start=start, end=end, group_by="ticker",
+                          progress=False, auto_adjust=False, threads=False)   # concurrency comes from the fetch worker pool
+        return split_download(raw, symbols)
+
+
+def split_download(raw, symbols):
+    """``{symbol: frame}`` from a ``group_by="ticker"`` multi-ticker download (empty frame if absent)."""
+    out = {}
+    multi = raw is not None and isinstance(raw.columns, pd.MultiIndex)
+    tickers = set(raw.columns.get_level_values(0)) if multi else set()
+    for sym in symbols:
+        t = f"{sym}.NS"
+        if t in tickers: out[sym] = normalize_ohlc(raw[t])
+        elif raw is not None and not multi and len(symbols) == 1: out[sym] = normalize_ohlc(raw)
+        else: out[sym] = normalize_ohlc(None)
+    return out
+
+
+class ReplayProvider(Provider):
+    """Recorded bars from ``<SYMBOL>.csv`` or ``<SYMBOL>.parquet`` files in ``directory``.
+
+    CSVs need Date/Open/High/Low/Close (the :mod:`benchmarks.corpus` layout);
+    a copy of a store directory works too.  Unknown symbols come back empty,
+    like a delisted ticker on Yahoo.  Files are read once and kept in memory.
+    """
+    name = "replay"
+
+    def __init__(self, directory=REPLAY_DIR):
+        self.directory = directory
+        self._frames = {}; self._lock = threading.Lock()
+
+    def _path(self, symbol):
+        base = os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_.&-]", "_", symbol))
+        for ext in (".parquet", ".csv"):
+            if os.path.exists(base + ext): return base + ext
+        return None
+
+    def frame(self, symbol):
+        """Every recorded bar of ``symbol`` (empty if it has no file)."""
+        with self._lock:
+            if symbol not in self._frames:
+                path = self._path(symbol)
+                if path is None: df = None
+                elif path.endswith(".csv"): df = pd.read_csv(path, parse_dates=["Date"])
+                else: df = pd.read_parquet(path)
+                self._frames[symbol] = normalize_ohlc(df)
+            return self._frames[symbol]
+
+    def download_many(self, symbols, start, end=None):
+        return {sym: _between(self.frame(sym), start, end) for sym in symbols}
+
+    def __repr__(self):
+        return f"ReplayProvider({self.directory!r})"
+
+
+class LatencyProvider(Provider):
+    """``inner`` with an injected delay of ``latency + per_ticker * len(symbols)`` seconds per request.
+
+    ``jitter`` adds up to that many seconds more, drawn from a RNG seeded by
+    ``seed`` and the request itself, so a request always waits the same time
+    whichever thread sends it and in whatever order.
+    """
+
+    def __init__(self, inner, latency=LATENCY, per_ticker=0.0, jitter=0.0, seed=0, sleep=time.sleep):
+        self.inner, self.latency, self.per_ticker, self.jitter, self.seed = inner, latency, per_ticker, jitter, seed
+        self._sleep = sleep
+        self.name = f"{inner.name}+latency"
+
+    def delay(self, symbols, start, end=None):
+        d = self.latency + self.per_ticker * len(symbols)
+        if self.jitter: d += self.jitter * random.Random(f"{self.seed}|{','.join(symbols)}|{start}|{end}").random()
+        return d
+
+    def download_many(self, symbols, start, end=None):
+        self._sleep(self.delay(symbols, start, end))
+        return self.inner.download_many(symbols, start, end)
+
+    def __repr__(self):
+        return f"LatencyProvider({self.inner!r}, latency={self.latency}, per_ticker={self.per_ticker}, jitter={self.jitter})"
+
+
+# --- ACTIVE PROVIDER ---
+PROVIDERS = {"yfinance": YFinanceProvider, "replay": ReplayProvider}
+_active = None
+
+
+def provider_from_env(name=PROVIDER, latency=LATENCY):
+    """The provider ``VNS_PROVIDER`` / ``VNS_LATENCY`` ask for."""
+    if name not in PROVIDERS: raise ValueError(f"unknown provider {name!r}; known: {', '.join(PROVIDERS)}")
+    p = PROVIDERS[name]()
+    return LatencyProvider(p, latency) if latency else p
+
+
+def get_provider():
+    global _active
+    if _active is None: _active = provider_from_env()
+    return _active
+
+
+def set_provider(provider):
+    """Make ``provider`` the source of every later download; returns the previous one."""
+    global _active
+    prev, _active = _active, provider
+    return prev
@@ -0,0 +1,59 @@
+"""Sparse-table range-extreme index.
+
+Built once per symbol in O(n log n); afterwards the position of the highest
+(or lowest) value between any two bars is an O(1) lookup, so engines that
+look back over a swing don't pay for its length.
+"""
+import numpy as np
+
+
+class SparseTable:
+    """Leftmost argmax (``mode="max"``) or argmin (``mode="min"``) over ``values[lo:hi]``.
+
+    Ties resolve to the earliest bar, matching ``Series.idxmax`` / ``idxmin``.
+    """
+
+    def __init__(self, values, mode="max"):
+        vals = np.asarray(values, dtype=np.float64)
+        better = np.greater_equal if mode == "max" else np.less_equal
+        idx = np.arange(len(vals))
+        levels = [idx]
+        span = 1
+        while 2 * span <= len(vals):
+            left, right = idx[:-span], idx[span:]
+            idx = np.where(better(vals[left], vals[right]), left, right)
+            levels.append(idx)
+            span *= 2
+        # Plain lists: the engines query from Python loops, where list
+        # indexing is much cheaper than NumPy scalar access.
+        self._vals = vals.tolist()
+        self._levels = [lvl.tolist() for lvl in levels]
+        self._max = mode == "max"
+
+    def __len__(self):
+        return len(self._vals)
+
+    def query(self, lo, hi):
+        """Index of the extreme of ``values[lo:hi]`` (``lo < hi``)."""
+        k = (hi - lo).bit_length() - 1
+        lvl = self._levels[k]
+        a, b = lvl[lo], lvl[hi - (1 << k)]
+        va, vb = self._vals[a], self._vals[b]
+        if self._max: return a if va >= vb else b
+        return a if va <= vb else b
+
+    def find_first(self, start, bound):
+        """First index ``>= start`` whose value reaches ``bound`` (``>=`` for max, ``<=`` for min), or None.
+
+        Binary lifting over the table levels: O(log n).
+        """
+        n = len(self._vals)
+        if start >= n: return None
+        pos, vals = start, self._vals
+        for k in range(len(self._levels) - 1, -1, -1):
+            if pos + (1 << k) > n: continue
+            v = vals[self._levels[k][pos]]
+            if (v < bound) if self._max else (v > bound): pos += 1 << k
+        if pos >= n: return None
+        v = vals[pos]
+        return pos if ((v >= bound) if self._max else (v <= bound)) else None
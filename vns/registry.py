@@ -0,0 +1,139 @@
+"""Variant registry: every page picks its VNS flavour by name.
+
+Each variant is a function over the shared array core (it takes NumPy
+High/Low/Close arrays and returns an event array), registered here with the
+OHLC columns it needs.  :func:`run_variant` pulls those columns out of a
+frame once and memoizes results, so speed-ups and caching live in one place
+for every page.
+"""
+import dataclasses
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from vns import engine
+from vns.panel import analyze_frames
+
+
+@dataclass
+class VariantResult:
+    """Events plus whatever end-of-run levels the variant tracks (NaN when it doesn't)."""
+    events: np.ndarray
+    trend: str = "Neutral"
+    resist: float = np.nan
+    support: float = np.nan
+    state: object = None       # resumable engine state, if the variant has one
+
+
+@dataclass(frozen=True)
+class Variant:
+    name: str
+    run: object                # (*arrays, **options) -> VariantResult
+    columns: tuple = ("High", "Low")
+    description: str = ""
+    batch: object = None       # optional ({symbol: df}, **options) -> {symbol: VariantResult}
+    options: dict = field(default_factory=dict)
+
+
+_VARIANTS = {}
+
+
+def register_variant(name, columns=("High", "Low"), description="", batch=None, **options):
+    """Decorator registering ``fn(*arrays, **options) -> VariantResult`` under ``name``."""
+    def deco(fn):
+        if name in _VARIANTS: raise ValueError(f"VNS variant {name!r} is already registered")
+        _VARIANTS[name] = Variant(name, fn, tuple(columns), description, batch, options)
+        return fn
+    return deco
+
+
+def get_variant(name):
+    try: return _VARIANTS[name]
+    except KeyError: raise KeyError(f"Unknown VNS variant {name!r}; available: {', '.join(sorted(_VARIANTS))}") from None
+
+
+def variant_names():
+    return sorted(_VARIANTS)
+
+
+# --- RESULT CACHE ---
+# Streamlit reruns keep re-analysing the same frame; key on the input bytes.
+# Shared by every session thread and the scheduler, so reads and evictions hold the lock.
+_CACHE_SIZE = 256
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _key(name, arrays, options):
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays: h.update(a.tobytes())
+    return name, tuple(sorted(options.items())), h.digest()
+
+
+def _handout(res):
+    # Each caller gets its own result and engine state around the shared, read-only event array
+    return dataclasses.replace(res, state=None if res.state is None else dataclasses.replace(res.state))
+
+
+def run_variant(name, df, **options):
+    """Run variant ``name`` on an OHLC frame. Results are cached; callers get copies sharing a read-only event array."""
+    v = get_variant(name)
+    arrays = engine.ohlc_arrays(df, v.columns)
+    key = _key(name, arrays, options)
+    with _cache_lock:
+        res = _cache.get(key)
+        if res is not None: _cache.move_to_end(key)
+    if res is None:
+        res = v.run(*arrays, **{**v.options, **options})
+        res.events.flags.writeable = False
+        with _cache_lock:
+            _cache[key] = res
+            while len(_cache) > _CACHE_SIZE: _cache.popitem(last=False)
+    return _handout(res)
+
+
+def clear_variant_cache():
+    with _cache_lock: _cache.clear()
+
+
+def run_variant_batch(name, frames, **options):
+    """Run variant ``name`` over a ``{symbol: df}`` universe, in one batch pass when it has one."""
+    v = get_variant(name)
+    if v.batch is not None: return v.batch(frames, **{**v.options, **options})
+    return {sym: run_variant(name, df, **options) for sym, df in frames.items()}
+
+
+# --- BUILT-IN VARIANTS ---
+def _reaction_batch(frames, seed_reaction=True, checkpoint_key=None):
+    out = analyze_frames(frames, seed_reaction=seed_reaction, checkpoint_key=checkpoint_key)
+    return {sym: VariantResult(ev, st.trend, st.reaction_resist, st.reaction_support, st) for sym, (ev, st) in out.items()}
+
+
+@register_variant("reaction_breakdown", batch=_reaction_batch,
+                  description="Teji/Mandi on new highs/lows; reversal when the swing's reaction level breaks (Home, Scanner, Classifier).")
+def _reaction(high, low, seed_reaction=True):
+    events, st = engine.resume_reaction(engine.ReactionState(seed_reaction=seed_reaction), high, low)
+    return VariantResult(events, st.trend, st.reaction_resist, st.reaction_support, st)
+
+
+@register_variant("swing_confirmation", columns=("High", "Low", "Close"),
+                  description="Tops/bottoms confirmed by the next low/high break; trend flips on a close through the reaction level (app.py).")
+def _swing(high, low, close):
+    events, trend, reaction_high, reaction_low = engine.analyze_swing(high, low, close)
+    return VariantResult(events, trend, reaction_high, reaction_low)
+
+
+@register_variant("retroactive_marking",
+                  description="Reaction and Atak bars marked after the fact once the reaction breaks (New Logic Test).")
+def _retro(high, low):
+    events, trend = engine.analyze_retro(high, low)
+    return VariantResult(events, trend)
+
+
+@register_variant("high_low_pivot",
+                  description="Previous bar's high/low becomes a pivot when the next bar breaks its low/high, plus breakout/breakdown (chatgpttest).")
+def _pivot(high, low):
+    return VariantResult(engine.analyze_pivot(high, low))
@@ -0,0 +1,130 @@
+"""Bar-by-bar tables as the pages show them: one vectorised style pass, cached.
+
+The pages used to colour their tables with ``df.style.apply(fn, axis=1)``
+(a Python call and a Series per row, matching label text) and format dates
+with a ``strftime`` lambda per cell.  Here a page describes its colours as a
+:class:`Palette` keyed by event code and row Type, and :func:`table` builds
+the whole css matrix in one lookup over the BU / BE code columns, formats
+the dates once, and keeps the result per (page, symbol, range, ...) and
+engine version, so a rerun that shows the same table skips building it::
+
+    st.dataframe(vns.render.table(("home", sym, start, end), build, HOME_PALETTE), ...)
+
+Only the cells a palette colours get css; the rest stay as the grid draws them.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from vns.engine import ENGINE_VERSION, Event
+
+PRICES = ["Open", "High", "Low", "Close"]
+CODES = ["BU_code", "BE_code"]
+MEMORY_TABLES = 64      # rendered tables kept per process, shared by every session
+
+BOLD = "font-weight: bold"
+
+
+@dataclass(frozen=True)
+class Palette:
+    """A page's table colours: css per event code for the BU / BE cells, and per Type for whole rows.
+
+    ``cells`` names the columns the BU / BE css go on (by default the BU and BE cells themselves).
+    """
+    bu: dict = field(default_factory=dict)
+    be: dict = field(default_factory=dict)
+    rows: dict = field(default_factory=dict)
+    cells: tuple = ("BU", "BE")
+
+    def lookup(self, side):
+        """``side``'s styles as an array indexed by event code ("" where the palette leaves the cell alone)."""
+        out = np.full(max(Event) + 1, "", dtype=object)
+        for code, css in getattr(self, side).items(): out[code] = css
+        return out
+
+
+def _css(background, color):
+    return f"background-color: {background}; color: {color}; {BOLD}"
+
+
+# --- PAGE PALETTES ---
+HOME_PALETTE = Palette(
+    bu=dict.fromkeys([Event.NEW_HIGH, Event.BREAKOUT], _css("#228B22", "white")) | {Event.ATAK_TOP: _css("#FFC0CB", "black")},
+    be=dict.fromkeys([Event.NEW_LOW, Event.BREAKDOWN], _css("#8B0000", "white")) | {Event.ATAK_BOT: _css("#90EE90", "black")},
+)
+SWING_PALETTE = Palette(
+    bu=dict.fromkeys([Event.START_TEJI, Event.NEW_HIGH], _css("#228B22", "white")) |
+       dict.fromkeys([Event.REACTION_RES, Event.ATAK_TOP], _css("#f8d7da", "#721c24")),
+    be=dict.fromkeys([Event.START_MANDI, Event.NEW_LOW], _css("#8B0000", "white")) |
+       dict.fromkeys([Event.REACTION_SUP, Event.ATAK_BOT], _css("#d4edda", "#155724")),
+)
+SCANNER_PALETTE = Palette(rows={"bull_dark": _css("#228B22", "white"), "bear_dark": _css("#8B0000", "white"),
+                                "bull_light": _css("#90EE90", "black"), "bear_light": _css("#FFC0CB", "black")})
+CLASSIFIER_PALETTE = Palette(
+    bu=dict.fromkeys([Event.START_TEJI, Event.NEW_HIGH, Event.BREAKOUT], _css("#28a745", "white")) |
+       dict.fromkeys([Event.REACTION_RES, Event.ATAK_TOP], _css("#f8d7da", "#721c24")),
+    be=dict.fromkeys([Event.START_MANDI, Event.NEW_LOW, Event.BREAKDOWN], _css("#dc3545", "white")) |
+       dict.fromkeys([Event.REACTION_SUP, Event.ATAK_BOT], _css("#d4edda", "#155724")),
+)
+RETRO_PALETTE = Palette(rows={"bull_dark": _css("#228B22", "white"), "bear_dark": _css("#8B0000", "white"),
+                              "bull_light": _css("#d4edda", "black"), "bear_light": _css("#f8d7da", "black")})
+
+
+# --- STYLE ---
+def style_matrix(frame, palette):
+    """css for every cell of ``frame`` in one pass: rows by Type, then the palette's cells by the BU / BE event code."""
+    css = np.full(frame.shape, "", dtype=object)
+    if palette.rows and 'Type' in frame:
+        rows = frame['Type'].map(palette.rows).fillna("").to_numpy(dtype=object)
+        css[:] = rows[:, None]
+    for side, col, target in (("bu", "BU", palette.cells[0]), ("be", "BE", palette.cells[1])):
+        if not getattr(palette, side): continue
+        cell = palette.lookup(side)[frame[f"{col}_code"].to_numpy()]
+        hit = cell != ""
+        css[hit, frame.columns.get_loc(target)] = cell[hit]
+    return css
+
+
+# --- CACHE ---
+_tables = OrderedDict()     # key -> (display frame, css frame)
+_tables_lock = threading.Lock()
+
+
+def clear_tables():
+    with _tables_lock: _tables.clear()
+
+
+def render(frame, palette):
+    """``(display, css)``: ``frame`` without its code columns, dates as text, and its css frame."""
+    if pd.api.types.is_datetime64_any_dtype(frame['Date']): frame = frame.assign(Date=frame['Date'].dt.strftime('%d-%b-%Y'))
+    css = style_matrix(frame, palette)
+    keep = [i for i, c in enumerate(frame.columns) if c not in CODES]
+    display = frame.iloc[:, keep]
+    return display, pd.DataFrame(css[:, keep], index=display.index, columns=display.columns)
+
+
+def table(key, build, palette):
+    """The styled table for ``key``; ``build()`` makes its frame on a miss.
+
+    ``build`` returns Date, OHLC, BU, BE and any other columns, with the
+    BU_code / BE_code event codes if the palette colours BU / BE cells (see
+    :func:`vns.analyzers.with_codes`); code columns are not shown.  ``key``
+    should name the page, symbol and range, plus whatever changes the bars (a
+    live bar's close, a snapshot row's fingerprint); the engine version is
+    added here.  The cached
+    frames are shared: the returned Styler only reads them.
+    """
+    key = (*key, ENGINE_VERSION)
+    with _tables_lock:
+        hit = _tables.get(key)
+        if hit is not None: _tables.move_to_end(key)
+    if hit is None:
+        hit = render(build(), palette)
+        with _tables_lock:
+            _tables[key] = hit
+            while len(_tables) > MEMORY_TABLES: _tables.popitem(last=False)
+    display, css = hit
+    return display.style.apply(lambda _: css, axis=None).format(precision=2, subset=[c for c in PRICES if c in display])
@@ -0,0 +1,166 @@
+"""The full-universe scan behind the Scanner and Classifier pages.
+
+Plain functions of durations and start dates, returning the JSON payloads
+both pages display, so the background scheduler (:mod:`vns.scheduler`) can
+run them outside any Streamlit session.  The two boards used to download the
+universe and run the engine separately; now one fetch per stock fills a row
+with both boards' fields (the Scanner's engine pass and the Classifier's own
+shorter one over the same frame), and each page picks its rows
+(:func:`scanner_stocks`, :func:`classifier_stocks`).  A scheduled scan
+covers every preset duration from one fetch of the longest one, so switching
+duration on a page finds its snapshot ready.
+"""
+import hashlib
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from vns.analyzers import CLASSIFIER_VARIANT, SCANNER_VARIANT, analyze_scan, classify_scan
+from vns.config import SCAN_PROCESSES
+from vns.engine import ENGINE_VERSION
+from vns.fetch import FetchStats, iter_universe
+from vns.parallel import Analyzer
+from vns.registry import run_variant_batch
+from vns.universe import FNO_STOCKS, SECTOR_MAP, UNIVERSE
+
+DURATIONS = {"1M": 30, "2M": 60, "3M": 90, "6M": 180, "1Y": 365}
+SCAN_VERSION = 3       # bump when the rows a scan stores change shape or wording: every symbol is recomputed
+FINGERPRINT_TAIL = 5   # last bars hashed into a symbol's fingerprint (a rescaled history changes them all)
+SCANNER_WARMUP = 30    # days of bars before a window the Scanner's engine pass starts from
+CLASSIFIER_WARMUP = 5  # ... and the Classifier's, its own shorter pass over the same frame
+
+
+def duration_start(label, now=None):
+    return (now or datetime.now()) - timedelta(days=DURATIONS[label])
+
+
+def _payload(label, start_date, stocks, failed):
+    now = datetime.now()
+    return {"date": now.strftime("%Y-%m-%d"), "last_updated": now.strftime("%H:%M:%S"), "duration_label": label,
+            "start": start_date.strftime("%Y-%m-%d"), "stocks": stocks, "failed": failed}
+
+
+# --- SCAN ---
+def _day(d):
+    return datetime.combine(d.date(), datetime.min.time())
+
+
+def request_start(start_date):
+    # Always the window's own warm-up start: a checkpoint resumes only if its first bar is this frame's first bar
+    # (vns.checkpoint), so a resumed scan analyses exactly the bars a cold scan of the window would.  Whole days,
+    # as the store cuts a fetch, so the start day's bar is in the slice
+    return _day(start_date - timedelta(days=SCANNER_WARMUP))
+
+
+def classifier_start(start_date):
+    """First day of the Classifier's own engine pass over a window starting ``start_date``."""
+    return _day(start_date - timedelta(days=CLASSIFIER_WARMUP))
+
+
+def checkpoint_key(label):
+    """Checkpoint key of a window: preset durations only, since every custom range would add a key per symbol for good."""
+    return f"scanner-{label}" if label in DURATIONS else None
+
+
+def fingerprint(df, since):
+    """Identity of one window's input: engine and row versions, the bar range, and a hash of the last bars."""
+    h = hashlib.blake2b(df[["Open", "High", "Low", "Close"]].iloc[-FINGERPRINT_TAIL:].to_numpy(dtype=np.float64).tobytes(), digest_size=8)
+    h.update(f"{ENGINE_VERSION}|{SCAN_VERSION}|{df['Date'].iloc[0]:%Y-%m-%d}|{df['Date'].iloc[-1]:%Y-%m-%d}|{len(df)}|{since:%Y-%m-%d}".encode())
+    return h.hexdigest()
+
+
+def analyze_windows(frames, windows, starts, previous=None):
+    """Rows for landed ``frames``: each window analyses its slice from ``starts[label][symbol]``.
+
+    Returns ``{label: [row]}`` for the symbols analysed and ``{("reused", label):
+    [symbol]}`` for those whose :func:`fingerprint` matches ``previous[label]``
+    (``{symbol: fingerprint}``) and so keep their previous row.  The Classifier
+    fields come from a second, unseeded and uncheckpointed pass over each
+    slice from :func:`classifier_start`.  Runs in the scan's thread or in a
+    :mod:`vns.parallel` worker process.
+    """
+    out = {}
+    for label, start_date in windows.items():
+        since, class_since = start_date - timedelta(days=SCANNER_WARMUP), classifier_start(start_date)
+        old = (previous or {}).get(label, {})
+        cuts, prints, reused = {}, {}, []
+        for stock, df in frames.items():
+            cut = df.iloc[int(df['Date'].searchsorted(starts[label][stock])):].reset_index(drop=True)
+            if cut.empty: continue
+            prints[stock] = fingerprint(cut, since)
+            if old.get(stock) == prints[stock]: reused.append(stock)
+            else: cuts[stock] = cut
+        analysed = run_variant_batch(SCANNER_VARIANT, cuts, seed_reaction=False, checkpoint_key=checkpoint_key(label))
+        class_cuts = {stock: df.iloc[int(df['Date'].searchsorted(class_since)):].reset_index(drop=True) for stock, df in cuts.items()}
+        classified = run_variant_batch(CLASSIFIER_VARIANT, {s: df for s, df in class_cuts.items() if len(df)}, seed_reaction=False)
+        out[label] = [{"Symbol": stock, "Sector": SECTOR_MAP.get(stock, "Other"), **analyze_scan(df, analysed[stock], since=since),
+                       **classify_scan(class_cuts[stock], classified.get(stock)), "Fingerprint": prints[stock]} for stock, df in cuts.items()]
+        out[("reused", label)] = reused
+    return out
+
+
+def scan_windows(windows, progress=None, stats=None, symbols=UNIVERSE, processes=SCAN_PROCESSES, previous=None, **fetch):
+    """``{label: payload}`` for several ``{label: start_date}`` windows from one fetch.
+
+    Each symbol is fetched once, from the earliest start any window needs;
+    every window then re-analyses its own slice of the frame in memory (a
+    preset duration from its own checkpoint), so a scan of all :data:`DURATIONS` costs one download.
+    Each batch is analysed as soon as it lands, on ``processes`` worker
+    processes when more than one (:mod:`vns.parallel`); ``fetch`` options go
+    to :func:`vns.iter_universe`.
+
+    ``previous`` maps labels to earlier payloads (rows with ``History``).
+    Symbols whose input is unchanged since then keep their earlier row; each
+    payload counts ``recomputed`` and ``reused`` rows.
+    """
+    stats = stats if stats is not None else FetchStats()
+    starts = {label: dict.fromkeys(symbols, request_start(start_date)) for label, start_date in windows.items()}
+    before = {label: {r["Symbol"]: r for r in (previous or {}).get(label, {}).get("stocks", ()) if r.get("Fingerprint")} for label in windows}
+    failed = {}
+    with Analyzer(analyze_windows, processes) as analyzer:
+        for landed in iter_universe(symbols, {s: min(w[s] for w in starts.values()) for s in symbols}, stats=stats, progress=progress, **fetch):
+            failed.update(landed.failed)
+            if landed.frames:
+                analyzer.submit(landed.frames, windows, {label: {s: w[s] for s in landed.frames} for label, w in starts.items()},
+                                {label: {s: before[label][s]["Fingerprint"] for s in landed.frames if s in before[label]} for label in windows})
+        results = analyzer.results()
+    order = {s: k for k, s in enumerate(symbols)}
+    out = {}
+    for label, start_date in windows.items():
+        fresh, reused = results.get(label, []), results.get(("reused", label), [])
+        rows = sorted(fresh + [before[label][s] for s in reused], key=lambda r: order[r["Symbol"]])
+        out[label] = {**_payload(label, start_date, rows, failed), "recomputed": len(fresh), "reused": len(reused)}
+    return out
+
+
+def duration_windows(now=None):
+    """``{label: start_date}`` for every preset duration."""
+    return {label: duration_start(label, now) for label in DURATIONS}
+
+
+def scan_universe(label, start_date=None, progress=None, stats=None, symbols=UNIVERSE, **options):
+    """Both boards' rows for one window: trend, BU/BE and event history, plus category, signal and % change."""
+    start_date = start_date or duration_start(label)
+    return scan_windows({label: start_date}, progress, stats, symbols, **options)[label]
+
+
+# --- BOARDS ---
+_FNO = frozenset(FNO_STOCKS)
+
+
+def scanner_stocks(payload):
+    """Rows of the Scanner board: the F&O stocks."""
+    return [s for s in payload["stocks"] if s["Symbol"] in _FNO]
+
+
+def classifier_stocks(payload):
+    """Rows of the Classifier board: the sector-mapped stocks with a price, showing the Classifier's own trend and levels.
+
+    A snapshot from before the Class_* fields shows the Scanner's until its next scan.
+    """
+    return [{**s, **{k: s[f"Class_{k}"] for k in ("Trend", "BU", "BE") if f"Class_{k}" in s}} for s in payload["stocks"]
+            if s["Symbol"] in SECTOR_MAP and s["Close"] > 0 and s["Category"] is not None]
+
+
+SCAN_KINDS = {"universe": scan_windows}
+DEFAULT_LABELS = {"universe": ("1M", "3M")}   # the boards' default durations, kept fresh even before anyone opens a page
@@ -0,0 +1,204 @@
+"""Background scan scheduler: the post-close refresh runs outside every page request.
+
+A :class:`Scheduler` polls for work every few seconds and runs it itself:
+
+* scheduled: every scan label that has a snapshot (plus each kind's defaults)
+  once it goes stale after 18:00 (:func:`vns.snapshots.is_stale`); one job
+  refreshes every preset duration at once (:func:`vns.scans.scan_windows`);
+* requested: a page asking for a label it has no snapshot for, or Force
+  Refresh, drops a request file in the mailbox (:func:`request_scan`).  The
+  scheduler claims it when it takes the job and removes it when the job is
+  done, so a page sees it pending until its snapshot is written.
+
+Results go to :mod:`vns.snapshots`; progress to a status file the pages show.
+It runs as a daemon thread started once per Streamlit server
+(:func:`start_scheduler`), or as its own process (:mod:`vns.worker`) with
+``VNS_SCHEDULER=off`` on the server.
+"""
+import os
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from vns.config import SCHEDULER, SNAPSHOT_DIR
+from vns.fetch import FetchStats
+from vns.scans import DEFAULT_LABELS, DURATIONS, SCAN_KINDS, duration_windows
+from vns.singleflight import SCANS
+from vns.snapshots import (is_stale, read_json, read_snapshot, snapshot_labels, snapshot_name, snapshot_time, write_json,
+    write_snapshot)
+
+POLL = 2.0                  # seconds between looks for due work
+RETRY_AFTER = 15 * 60       # seconds before a failed scan is tried again
+PROGRESS_EVERY = 0.5        # seconds between status-file updates during a scan
+
+
+def _mailbox(directory):
+    return os.path.join(directory, "requests")
+
+
+def status_path(directory=SNAPSHOT_DIR):
+    return os.path.join(directory, "status.json")
+
+
+def request_scan(kind, label, start=None, directory=SNAPSHOT_DIR, **fetch):
+    """Ask the scheduler (thread or worker process) to run ``kind``/``label`` soon.
+
+    ``start`` is a ``YYYY-MM-DD`` string for custom ranges; ``fetch`` options
+    go to the scan.  Asking again before it runs replaces the request.
+    """
+    if kind not in SCAN_KINDS: raise ValueError(f"unknown scan {kind!r}")
+    write_json(os.path.join(_mailbox(directory), snapshot_name(kind, label) + ".json"),
+               {"kind": kind, "label": label, "start": start, "fetch": fetch, "requested_at": datetime.now().isoformat(timespec="seconds")})
+
+
+def pending_requests(directory=SNAPSHOT_DIR):
+    """``{(kind, label)}`` requested and not finished yet (waiting, or claimed by the scheduler)."""
+    box = _mailbox(directory)
+    try: names = os.listdir(box)
+    except OSError: return set()
+    out = set()
+    for n in names:
+        r = read_json(os.path.join(box, n)) if n.endswith((".json", ".claimed")) else None
+        if r: out.add((r["kind"], r["label"]))
+    return out
+
+
+def _job_key(kind, label, start):
+    # A job for any preset duration refreshes all of them
+    return (kind, "durations" if label in DURATIONS and start is None else label)
+
+
+def scan_status(directory=SNAPSHOT_DIR):
+    """``{"running": {...} | None, "last": {...}, "errors": {...}}`` as last written by the scheduler."""
+    return read_json(status_path(directory)) or {"running": None, "last": {}, "errors": {}}
+
+
+class Scheduler:
+    def __init__(self, directory=SNAPSHOT_DIR, poll=POLL, clock=datetime.now):
+        self.directory, self.poll, self.clock = directory, poll, clock
+        self.status = scan_status(directory); self.status["running"] = None
+        self._failed_at = {}; self._claims = {}
+        self._stop = threading.Event(); self.thread = None
+        self._requeue_claims()
+
+    # --- WORK ---
+    def _requeue_claims(self):
+        # Claims left by a scheduler that stopped mid-scan go back in the mailbox (unless asked again since)
+        box = _mailbox(self.directory)
+        try: names = os.listdir(box)
+        except OSError: return
+        for n in names:
+            if not n.endswith(".claimed"): continue
+            path = os.path.join(box, n); waiting = path[:-len(".claimed")] + ".json"
+            try: os.remove(path) if os.path.exists(waiting) else os.replace(path, waiting)
+            except OSError: pass
+
+    def _take_requests(self):
+        """``[(job, claim path)]``: each waiting request, renamed to ``.claimed`` until its job is done."""
+        box = _mailbox(self.directory); jobs = []
+        try: names = sorted(os.listdir(box))
+        except OSError: return jobs
+        for n in names:
+            if not n.endswith(".json"): continue
+            path = os.path.join(box, n); claimed = path[:-len(".json")] + ".claimed"
+            try: os.replace(path, claimed)
+            except OSError: continue          # another scheduler took it
+            r = read_json(claimed)
+            if r: jobs.append(((r["kind"], r["label"], r.get("start"), r.get("fetch") or {}), claimed))
+            else: self._release([claimed])
+        return jobs
+
+    def _release(self, claims):
+        for path in claims:
+            try: os.remove(path)
+            except OSError: pass
+
+    def due(self):
+        """Jobs to run now, ``[(kind, label, start, fetch)]``: requests first, then stale snapshots."""
+        # Requests for several preset durations run once (with every request's fetch options)
+        merged = {}
+        for (kind, label, start, fetch), claim in self._take_requests():
+            key = _job_key(kind, label, start); self._claims.setdefault(key, []).append(claim)
+            if key in merged: merged[key][3].update(fetch)
+            else: merged[key] = (kind, label, start, dict(fetch))
+        jobs, seen = list(merged.values()), set(merged)
+        now = self.clock()
+        for kind in SCAN_KINDS:
+            for label in sorted({*DEFAULT_LABELS[kind], *snapshot_labels(kind, self.directory)}):
+                if label not in DURATIONS or (kind, "durations") in seen: continue    # custom ranges only run on request
+                if time.time() - self._failed_at.get((kind, label), -RETRY_AFTER) < RETRY_AFTER: continue
+                if is_stale(snapshot_time(kind, label, self.directory), now): jobs.append((kind, label, None, {})); seen.add((kind, "durations"))
+        return jobs
+
+    def _write_status(self):
+        write_json(status_path(self.directory), self.status)
+
+    def run_job(self, kind, label, start=None, fetch=None):
+        """Run one scan and publish its snapshots; returns ``{label: payload}`` (None if it failed).
+
+        A preset duration runs every preset duration; a custom ``start`` runs just ``label``.
+        """
+        now = self.clock()
+        windows = {label: datetime.strptime(start, "%Y-%m-%d")} if start or label not in DURATIONS else duration_windows(now)
+        stats = FetchStats(); running = {"kind": kind, "label": label, "labels": list(windows), "started": now.isoformat(timespec="seconds"),
+                                         "done": 0, "total": 0, "fetch": ""}
+        self.status["running"] = running; self._write_status()
+        last = [0.0]
+
+        def progress(done, total):
+            running.update(done=done, total=total, fetch=stats.summary())
+            if time.monotonic() - last[0] >= PROGRESS_EVERY: last[0] = time.monotonic(); self._write_status()
+
+        try:
+            # Symbols whose bars haven't changed since the last snapshot keep its rows
+            previous = {l: p for l in windows if (p := read_snapshot(kind, l, self.directory, history=True))}
+            payloads = SCANS.do((kind, tuple(windows), start), SCAN_KINDS[kind], windows, progress=progress, stats=stats,
+                                previous=previous, **(fetch or {}))
+            for l, payload in payloads.items(): write_snapshot(kind, l, payload, self.directory)
+        except Exception:
+            error = traceback.format_exc(limit=5); payloads = None
+            for l in windows: self._failed_at[(kind, l)] = time.time(); self.status["errors"][f"{kind}/{l}"] = error
+        else:
+            for l, payload in payloads.items():
+                self._failed_at.pop((kind, l), None); self.status["errors"].pop(f"{kind}/{l}", None)
+                self.status["last"][f"{kind}/{l}"] = f"{payload['date']} {payload['last_updated']} ({payload['recomputed']} recomputed, {payload['reused']} reused)"
+        self.status["running"] = None; self._write_status()
+        return payloads
+
+    def run_pending(self):
+        """Run everything due now; returns how many scans ran."""
+        jobs = self.due()
+        for job in jobs:
+            # The requests behind a job stay pending (claimed) until its snapshots are written
+            try: self.run_job(*job)
+            finally: self._release(self._claims.pop(_job_key(*job[:3]), []))
+        return len(jobs)
+
+    # --- LOOP ---
+    def run_forever(self):
+        while not self._stop.is_set():
+            try: self.run_pending()
+            except Exception: traceback.print_exc()
+            self._stop.wait(self.poll)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run_forever, name="vns-scheduler", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler():
+    """The process's scheduler thread, started on first call (None when ``VNS_SCHEDULER=off``)."""
+    global _scheduler
+    if SCHEDULER == "off": return None
+    with _scheduler_lock:
+        if _scheduler is None: _scheduler = Scheduler().start()
+    return _scheduler
@@ -0,0 +1,65 @@
+"""Single-flight: concurrent identical requests share one execution.
+
+Streamlit runs every session in its own thread of one process.  When several
+sessions ask for the same thing at once -- a symbol's bars after the close, or
+the daily scan a stale results file triggers -- the first caller runs it and
+the rest wait for its result (or its exception) instead of repeating it::
+
+    df = vns.FETCHES.do(key, refresh, symbol, start)
+
+Each group counts calls made and calls coalesced (:func:`counters`).
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done, self.result, self.error = threading.Event(), None, None
+
+
+class SingleFlight:
+    """Runs ``fn`` once per key at a time; callers arriving meanwhile get the same outcome."""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0           # executions actually run
+        self.coalesced = 0       # callers served by someone else's execution
+        self._flights = {}; self._lock = threading.Lock()
+
+    def busy(self, key):
+        """Whether a call for ``key`` is running now (a new caller would wait for it)."""
+        with self._lock: return key in self._flights
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._flights.get(key)
+            leader = call is None
+            if leader: call = self._flights[key] = _Call(); self.calls += 1
+            else: self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None: raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e; raise
+        finally:
+            with self._lock: del self._flights[key]
+            call.done.set()
+
+    def counters(self):
+        with self._lock: return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._flights)}
+
+
+# Process-wide groups: per-symbol store refreshes and provider downloads, and whole scans.
+FETCHES = SingleFlight("fetches")
+SCANS = SingleFlight("scans")
+
+
+def counters():
+    """``{group: {"calls", "coalesced", "in_flight"}}`` for the process-wide groups."""
+    return {g.name: g.counters() for g in (FETCHES, SCANS)}
@@ -0,0 +1,209 @@
+"""Completed scan results on disk: one snapshot per (scan kind, label).
+
+A snapshot is three Parquet files.  The summary holds one row per stock
+(symbol, trend, close, levels, category...) with the scan's date, range and
+failures in its metadata; it is all a page reads to draw its boards.  Every
+stock's history goes to two more files, sorted by symbol in small row groups:
+its bars, and its engine events as typed arrays (bar, code, price, reference
+bar) rather than label text.  A dialog reads just its symbol's rows
+(:func:`read_history`) when it opens and formats only those, so page loads
+stay flat as the universe and lookback grow.
+
+Pages get the summary from a process-wide cache: one read-only copy per
+snapshot, shared by every session and reloaded only when the file changes.
+
+The scheduler writes them atomically (temp file + ``os.replace``), history
+first, so a page reading one never sees a half-written scan; pages only ever
+read.
+"""
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from vns.config import SNAPSHOT_DIR
+from vns.engine import EVENT_DTYPE
+from vns.singleflight import FETCHES
+
+REFRESH_HOUR = 18   # post-close scan: a snapshot from before today's 18:00 is stale after it
+HISTORY_ROW_GROUP = 4096   # history rows per row group: a symbol read touches one or two
+
+
+def snapshot_name(kind, label):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", f"{kind}__{label}")
+
+
+def snapshot_path(kind, label, directory=SNAPSHOT_DIR):
+    return os.path.join(directory, snapshot_name(kind, label) + ".parquet")
+
+
+def history_path(kind, label, directory=SNAPSHOT_DIR):
+    return os.path.join(directory, "history", snapshot_name(kind, label) + ".parquet")
+
+
+def events_path(kind, label, directory=SNAPSHOT_DIR):
+    return os.path.join(directory, "history", snapshot_name(kind, label) + ".events.parquet")
+
+
+BARS = ["Date", "Open", "High", "Low", "Close"]
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f: json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def read_json(path):
+    try:
+        with open(path, 'r') as f: return json.load(f)
+    except (OSError, ValueError): return None
+
+
+def _write_table(path, table, **options):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp, **options)
+    os.replace(tmp, path)
+
+
+def _history_tables(stocks):
+    # Every row's History ({"bars": frame, "events": EVENT_DTYPE array}) as two symbol-tagged tables
+    hist = [(r["Symbol"], r["History"]) for r in stocks if r.get("History") is not None]
+    syms = [s for s, _ in hist]
+    bars = {"Symbol": np.repeat(np.array(syms, dtype=object), [len(h["bars"]) for _, h in hist])}
+    for c in BARS: bars[c] = np.concatenate([h["bars"][c].to_numpy() for _, h in hist]) if hist else np.empty(0)
+    events = {"Symbol": np.repeat(np.array(syms, dtype=object), [len(h["events"]) for _, h in hist])}
+    for f in EVENT_DTYPE.names: events[f] = np.concatenate([h["events"][f] for _, h in hist]) if hist else np.empty(0, EVENT_DTYPE[f])
+    return pa.table(bars), pa.table(events)
+
+
+def _events(table):
+    ev = np.empty(table.num_rows, dtype=EVENT_DTYPE)
+    for f in EVENT_DTYPE.names: ev[f] = table.column(f).to_numpy()
+    return ev
+
+
+def write_snapshot(kind, label, payload, directory=SNAPSHOT_DIR):
+    """Store a scan payload (``stocks`` rows with their ``History``) as summary, bars and events files."""
+    stocks = payload["stocks"]
+    bars, events = _history_tables(stocks)
+    _write_table(history_path(kind, label, directory), bars, row_group_size=HISTORY_ROW_GROUP)
+    _write_table(events_path(kind, label, directory), events, row_group_size=HISTORY_ROW_GROUP)
+    summary = pa.Table.from_pylist([{k: v for k, v in r.items() if k != "History"} for r in stocks])
+    meta = {k: v for k, v in payload.items() if k != "stocks"}
+    _write_table(snapshot_path(kind, label, directory), summary.replace_schema_metadata({b"vns": json.dumps(meta).encode()}))
+
+
+def _spans(symbols):
+    # {symbol: slice} of a column written one symbol after another
+    syms, first = np.unique(symbols, return_index=True)
+    order = np.argsort(first); bounds = np.r_[first[order], len(symbols)]
+    return {syms[k]: slice(bounds[i], bounds[i + 1]) for i, k in enumerate(order)}
+
+
+def _read(path, kind, label, directory, history):
+    try: table = pq.read_table(path)
+    except (OSError, pa.ArrowException): return None
+    meta = json.loads((table.schema.metadata or {}).get(b"vns", b"{}"))
+    stocks = table.to_pylist()
+    if history:
+        try: bars, events = pq.read_table(history_path(kind, label, directory)), pq.read_table(events_path(kind, label, directory))
+        except (OSError, pa.ArrowException): return None
+        frame, ev = bars.drop_columns("Symbol").to_pandas(), _events(events)
+        b_at = _spans(bars.column("Symbol").to_numpy(zero_copy_only=False))
+        e_at = _spans(events.column("Symbol").to_numpy(zero_copy_only=False))
+        none = slice(0, 0)
+        for r in stocks:
+            r["History"] = {"bars": frame.iloc[b_at.get(r["Symbol"], none)].reset_index(drop=True), "events": ev[e_at.get(r["Symbol"], none)]}
+    return {**meta, "stocks": stocks}
+
+
+# --- SHARED SUMMARIES ---
+# Every full rerun of a board page, in every session, asks for its summary.  One frozen copy per
+# file stays in memory, keyed by its stat, so a rerun costs an os.stat; the scheduler's os.replace
+# of a new scan changes the stat and the next read loads that one (once, however many ask at once).
+_summaries = {}        # path -> (stat key, frozen payload)
+_summaries_lock = threading.Lock()
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _freeze(payload):
+    # Read-only views: a page can't change what the other sessions are showing
+    frozen = {k: MappingProxyType(v) if isinstance(v, dict) else tuple(v) if isinstance(v, list) else v for k, v in payload.items()}
+    frozen["stocks"] = tuple(MappingProxyType(r) for r in payload["stocks"])
+    return MappingProxyType(frozen)
+
+
+def clear_summaries():
+    with _summaries_lock: _summaries.clear()
+
+
+def read_snapshot(kind, label, directory=SNAPSHOT_DIR, history=False):
+    """The latest completed payload for ``(kind, label)``, or None if there is none yet.
+
+    Without ``history`` it is the shared read-only summary: rows are
+    mappings without their ``History``, ``stocks`` is a tuple.  With it (the
+    scheduler, carrying unchanged rows into the next scan) it is a fresh,
+    mutable payload read from disk.
+    """
+    path = snapshot_path(kind, label, directory)
+    if history: return _read(path, kind, label, directory, history)
+    try: key = _stat_key(path)
+    except OSError:
+        with _summaries_lock: _summaries.pop(path, None)
+        return None
+    with _summaries_lock:
+        hit = _summaries.get(path)
+        if hit is not None and hit[0] == key: return hit[1]
+    payload = FETCHES.do(("snapshot", path, key), _read, path, kind, label, directory, False)
+    if payload is None: return None
+    with _summaries_lock:
+        hit = _summaries.get(path)
+        if hit is None or hit[0] != key: hit = _summaries[path] = (key, _freeze(payload))
+    return hit[1]
+
+
+def read_history(kind, label, symbol, directory=SNAPSHOT_DIR):
+    """One stock's ``(bars, events)`` from the ``(kind, label)`` snapshot (empty if missing)."""
+    where = [("Symbol", "==", symbol)]
+    try: bars = pq.read_table(history_path(kind, label, directory), filters=where).drop_columns("Symbol").to_pandas()
+    except (OSError, pa.ArrowException, KeyError): bars = pd.DataFrame({c: pd.Series(dtype="datetime64[ns]" if c == "Date" else float) for c in BARS})
+    try: events = _events(pq.read_table(events_path(kind, label, directory), filters=where))
+    except (OSError, pa.ArrowException, KeyError): events = np.empty(0, dtype=EVENT_DTYPE)
+    return bars, events
+
+
+def snapshot_labels(kind, directory=SNAPSHOT_DIR):
+    """Labels of ``kind`` that have a snapshot on disk (labels are file-name safe)."""
+    prefix = snapshot_name(kind, "")
+    try: names = os.listdir(directory)
+    except OSError: return []
+    return sorted(n[len(prefix):-8] for n in names if n.startswith(prefix) and n.endswith(".parquet"))
+
+
+def snapshot_time(kind, label, directory=SNAPSHOT_DIR):
+    """When the snapshot was written (local time), or None; cheaper than reading it."""
+    try: return datetime.fromtimestamp(os.path.getmtime(snapshot_path(kind, label, directory)))
+    except OSError: return None
+
+
+def is_stale(written, now=None):
+    """Whether a snapshot written at ``written`` (None = missing) predates the latest post-close refresh."""
+    if written is None: return True
+    now = now or datetime.now()
+    boundary = now.replace(hour=REFRESH_HOUR, minute=0, second=0, microsecond=0)
+    if now < boundary: boundary -= timedelta(days=1)     # before today's refresh: yesterday's is the latest
+    return written < boundary
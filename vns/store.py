@@ -0,0 +1,233 @@
+"""Local per-symbol OHLC store (one Parquet file per symbol).
+
+Pages ask :func:`get_ohlc` for a date range instead of calling Yahoo.  The
+store keeps every bar it has ever fetched for a symbol and only goes to the
+market-data provider (:mod:`vns.providers`) for what it lacks:
+
+* head gap: bars before the earliest start ever requested;
+* tail gap: bars after the last stored one, once a session has closed since
+  the last check (or, for live pages, once ``max_age`` has passed in session).
+
+The tail request re-reads the last stored bar as well.  If that bar had
+already settled and Yahoo now reports a different close, a split or dividend
+rescaled the history and the symbol is re-downloaded in full.
+
+Files are written atomically, so concurrent scans never see a torn file.
+Loaded frames are kept in memory, so a page switching between ranges it has
+already loaded (1M -> 3M -> 1M) slices them without touching disk or network.
+"""
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, time, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from vns.config import STORE_DIR
+from vns.providers import COLUMNS, PRICES, get_provider
+from vns.singleflight import FETCHES
+
+# --- NSE SESSION CLOCK ---
+IST = timezone(timedelta(hours=5, minutes=30))
+SESSION_OPEN = time(9, 15)
+BAR_FINAL = time(16, 0)               # NSE closes 15:30; Yahoo's daily bar settles shortly after
+RETRY_AFTER = timedelta(minutes=15)   # an expected bar was missing: holiday, or Yahoo failed
+LIVE_MAX_AGE = timedelta(minutes=5)   # single-stock pages refresh the running bar this often
+
+
+def _weekday_on_or_before(d):
+    while d.weekday() >= 5: d -= timedelta(days=1)
+    return d
+
+
+def last_close(now):
+    """Latest weekday BAR_FINAL (IST) at or before ``now``: bars up to that date are final."""
+    t = now.astimezone(IST)
+    d = t.date() if t.time() >= BAR_FINAL else t.date() - timedelta(days=1)
+    return datetime.combine(_weekday_on_or_before(d), BAR_FINAL, IST)
+
+
+def next_close(now):
+    """First weekday BAR_FINAL (IST) strictly after ``now``."""
+    t = now.astimezone(IST)
+    d = t.date() if t.time() < BAR_FINAL else t.date() + timedelta(days=1)
+    while d.weekday() >= 5: d += timedelta(days=1)
+    return datetime.combine(d, BAR_FINAL, IST)
+
+
+def in_session(now):
+    t = now.astimezone(IST)
+    return t.weekday() < 5 and SESSION_OPEN <= t.time() < BAR_FINAL
+
+
+# --- FILES ---
+# Stored frames stay in memory (per process, shared by every session), keyed by file stat,
+# so a rerun slices the widest range already loaded instead of re-reading Parquet.
+# A write by another process changes the stat and the next read goes back to disk.
+MEMORY_SYMBOLS = 512
+_memory = OrderedDict()        # path -> (stat key, df, meta)
+_memory_lock = threading.Lock()
+
+
+def store_path(symbol, directory=STORE_DIR):
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9_.&-]", "_", symbol) + ".parquet")
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _remember(path, key, df, meta):
+    with _memory_lock:
+        _memory[path] = (key, df, meta); _memory.move_to_end(path)
+        while len(_memory) > MEMORY_SYMBOLS: _memory.popitem(last=False)
+
+
+def clear_memory():
+    with _memory_lock: _memory.clear()
+
+
+def load_stored(symbol, directory=STORE_DIR):
+    """``(df, meta)`` for the stored symbol, or ``(None, None)`` if missing or unreadable.
+
+    ``df`` may be shared with other callers: slice or copy it, don't modify it in place.
+    """
+    path = store_path(symbol, directory)
+    try: key = _stat_key(path)
+    except OSError: return None, None
+    with _memory_lock:
+        hit = _memory.get(path)
+        if hit is not None and hit[0] == key: _memory.move_to_end(path); return hit[1], dict(hit[2])
+    try: table = pq.read_table(path)
+    except (OSError, pa.ArrowException): return None, None
+    meta = json.loads((table.schema.metadata or {}).get(b"vns", b"{}"))
+    if not meta: return None, None
+    df = table.to_pandas()
+    _remember(path, key, df, meta)
+    return df, dict(meta)
+
+
+def save_stored(symbol, df, meta, directory=STORE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    table = pa.Table.from_pandas(df[COLUMNS], preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"vns": json.dumps(meta).encode()})
+    path = store_path(symbol, directory)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+    _remember(path, _stat_key(path), table.to_pandas(), dict(meta))
+
+
+# --- QUERY ---
+def _day(x):
+    ts = pd.Timestamp(x)
+    return (ts.tz_localize(None) if ts.tzinfo else ts).normalize()
+
+
+def _rescaled(old, new):
+    """True if the overlapping bar's close moved: Yahoo re-adjusted the history."""
+    if old.empty or new.empty: return False
+    a, b = old[['Close', 'Adj Close']].to_numpy(), new[['Close', 'Adj Close']].to_numpy()
+    return not np.allclose(a, b, rtol=1e-6, atol=0)
+
+
+def _fresh_until(df, now):
+    # Holding the last final bar: nothing new before the next close.  Missing it: retry soon.
+    have = df['Date'].iloc[-1] >= pd.Timestamp(last_close(now).date())
+    return next_close(now) if have else now + RETRY_AFTER
+
+
+def _merge(older, newer):
+    """Stored bars with ``newer`` taking over from its first date on (``newer`` wins on overlap)."""
+    if newer.empty: return older
+    cut = newer['Date'].iloc[0]
+    return pd.concat([older[older['Date'] < cut], newer, older[older['Date'] > newer['Date'].iloc[-1]]], ignore_index=True)
+
+
+def _tail_due(meta, end, max_age, now):
+    if end is not None and end <= pd.Timestamp(meta["final_through"]): return False   # range already settled
+    return now >= datetime.fromisoformat(meta["fresh_until"]) or (
+        max_age is not None and in_session(now) and now - datetime.fromisoformat(meta["checked_at"]) >= max_age)
+
+
+def plan(symbol, start, end=None, directory=STORE_DIR, max_age=None, now=None):
+    """The ``(start, end)`` downloads :func:`refresh` would make for this request, without making them."""
+    now = now or datetime.now(timezone.utc)
+    start = _day(start); end = None if end is None else _day(end)
+    df, meta = load_stored(symbol, directory)
+    if df is None: return [(start, None)]
+    reqs = []
+    covered = pd.Timestamp(meta["covered_from"])
+    if start < covered: reqs.append((start, covered))
+    if _tail_due(meta, end, max_age, now): reqs.append((df['Date'].iloc[-1], None))
+    return reqs
+
+
+def refresh(symbol, start, end=None, directory=STORE_DIR, download=None, max_age=None, now=None):
+    """Bring the stored symbol up to date for ``[start, end]`` and return the full stored frame (or None).
+
+    ``download(symbol, start, end)`` defaults to the active provider's.  A
+    failed download leaves the stored bars in place and is retried on the next call.
+    """
+    now = now or datetime.now(timezone.utc)
+    download = download or get_provider().download
+    start = _day(start); end = None if end is None else _day(end)
+    df, meta = load_stored(symbol, directory)
+
+    if df is None:
+        df = download(symbol, start, None)      # always to the latest bar, so the tail is settled
+        if df.empty: return None
+        meta = {"covered_from": str(start.date())}
+        checked = True
+    else:
+        changed = checked = False
+        covered = pd.Timestamp(meta["covered_from"])
+        if start < covered:
+            try: head = download(symbol, start, covered)
+            except Exception: return df
+            df = _merge(df, head); meta["covered_from"] = str(start.date()); changed = True
+
+        final_through = pd.Timestamp(meta["final_through"])
+        if _tail_due(meta, end, max_age, now):
+            last = df['Date'].iloc[-1]
+            try:
+                new = download(symbol, last, None)
+                if last <= final_through and _rescaled(df[df['Date'] == last], new[new['Date'] == last]):
+                    full = download(symbol, pd.Timestamp(meta["covered_from"]), None)
+                    if not full.empty: df, new = full, full.iloc[:0]
+            except Exception: pass
+            else: df = _merge(df, new); changed = checked = True
+        if not changed: return df
+
+    df = df.reset_index(drop=True)
+    if checked:
+        meta.update(checked_at=now.isoformat(), final_through=str(last_close(now).date()),
+                    fresh_until=_fresh_until(df, now).isoformat())
+    save_stored(symbol, df, meta, directory)
+    return df
+
+
+def get_ohlc(symbol, start, end=None, directory=STORE_DIR, download=None, max_age=None, adjusted=False, now=None):
+    """Daily bars for ``symbol`` from ``start`` to ``end`` (inclusive; None = latest), via the local store.
+
+    ``max_age`` re-checks the running bar during the session (live pages);
+    ``adjusted`` scales Open/High/Low/Close by Adj Close / Close like
+    ``yf.download(auto_adjust=True)``.  None when nothing is available.
+    """
+    # Sessions asking for the same range at once share one refresh (and download)
+    key = ("refresh", store_path(symbol, directory), _day(start), None if end is None else _day(end), max_age, download, now)
+    df = FETCHES.do(key, refresh, symbol, start, end, directory, download, max_age, now)
+    if df is None: return None
+    lo = df['Date'].searchsorted(_day(start))
+    hi = len(df) if end is None else df['Date'].searchsorted(_day(end), side='right')
+    out = df.iloc[lo:hi].reset_index(drop=True)
+    if adjusted:
+        ratio = out['Adj Close'] / out['Close']
+        out = out.assign(**{c: out[c] * ratio for c in PRICES}).drop(columns='Adj Close')
+    return out if not out.empty else None
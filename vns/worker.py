@@ -0,0 +1,28 @@
+"""Standalone scan worker: the background scheduler as its own process.
+
+Run it next to a Streamlit server started with ``VNS_SCHEDULER=off`` (same
+``VNS_DATA_DIR``), e.g. under systemd or cron::
+
+    python -m vns.worker            # loop forever
+    python -m vns.worker --once     # run whatever is due, then exit
+"""
+import argparse
+import sys
+
+from vns.scheduler import POLL, Scheduler
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--once", action="store_true", help="run whatever is due and exit")
+    ap.add_argument("--poll", type=float, default=POLL, help="seconds between checks")
+    args = ap.parse_args(argv)
+    sched = Scheduler(poll=args.poll)
+    if args.once: print(f"ran {sched.run_pending()} scan(s)"); return 0
+    try: sched.run_forever()
+    except KeyboardInterrupt: pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())